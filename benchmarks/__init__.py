@@ -0,0 +1,4 @@
+"""
+性能基准脚本集合
+使用 `python -m benchmarks.<脚本名>` 运行，无需真实设备或 API Key
+"""
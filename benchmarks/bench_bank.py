@@ -0,0 +1,161 @@
+"""
+只读题库基准
+用 N 道合成题（每题 4 个选项）分别生成 JSONL 题库、SQLite 答案库与 mmap 只读题库，
+每种方式在独立的子进程中测量：
+    - open_ms         打开到能回答第一道题的耗时（JSONL 为读入并建字典）
+    - anon_mb         打开并完成全部查询后私有常驻内存（RssAnon）的增量，每个进程各占一份
+    - file_mb         文件映射常驻内存（RssFile）的增量，是多个进程共享的同一份页缓存
+    - hit_us / miss_us  按题干查询候选记录的平均耗时（命中 / 未收录，不经过 normalize_key 缓存）
+
+用法:
+    python -m benchmarks.bench_bank
+    python -m benchmarks.bench_bank --records 500000 --lookups 20000 --json bank.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks.common import percentile
+from src.utils.answer_store import KEY_VERSION, AnswerStore, options_key
+from src.utils.question_bank import QuestionBank
+from src.utils.text_normalize import normalize_key
+
+MODES = ("mmap", "dict", "sqlite")
+
+_CHARS = "以下哪部作品的作者是曹雪芹光在真空中传播速度约为每秒多少千米进击巨人调查兵团团长最后是谁红楼梦水浒传西游记三国演义"
+
+
+def make_records(n: int, seed: int = 0) -> List[dict]:
+    rng = random.Random(seed)
+    records = []
+    for i in range(n):
+        question = "".join(rng.choice(_CHARS) for _ in range(rng.randint(12, 30))) + f"{i}？"
+        options = ["".join(rng.choice(_CHARS) for _ in range(rng.randint(2, 8))) + str(k) for k in range(4)]
+        records.append({"question": question, "options": options, "answer": rng.choice(options),
+                        "verified": rng.random() < 0.5, "updated_at": float(i)})
+    return records
+
+
+def write_sources(records: List[dict], directory: str) -> Dict[str, str]:
+    paths = {mode: os.path.join(directory, name)
+             for mode, name in (("dict", "questions.jsonl"), ("sqlite", "answers.db"), ("mmap", "bank.qbk"))}
+    with open(paths["dict"], "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    # 先由 AnswerStore 建表，再按同样的列批量写入（逐条 put 每次都要提交事务）
+    AnswerStore(paths["sqlite"]).close()
+    conn = sqlite3.connect(paths["sqlite"])
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO answers (question_key, options_key, question, options,"
+            " answer, source, verified, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(normalize_key(r["question"]), options_key(r["options"]), r["question"],
+              json.dumps(r["options"], ensure_ascii=False), r["answer"], "bench", int(r["verified"]),
+              r["updated_at"]) for r in records],
+        )
+        conn.execute(f"PRAGMA user_version = {KEY_VERSION}")
+    conn.close()
+    QuestionBank.build(records, paths["mmap"])
+    return paths
+
+
+def _open(mode: str, path: str):
+    """返回 (按题干查询函数, 关闭函数)"""
+    if mode == "mmap":
+        bank = QuestionBank(path)
+        return bank.lookup_question, bank.close
+    if mode == "sqlite":
+        store = AnswerStore(path)
+        return store.lookup_question, store.close
+    # 进程启动时把整个题库读入内存字典
+    table = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            r = json.loads(line)
+            table.setdefault(normalize_key(r["question"]), []).append(
+                (options_key(r["options"]), r["answer"], int(r["verified"])))
+    return (lambda question: table.get(normalize_key(question), [])), table.clear
+
+
+def _rss_split() -> Dict[str, float]:
+    """/proc/self/status 中的 RssAnon 与 RssFile（MB），不可用时为 0"""
+    values = {"anon_mb": 0.0, "file_mb": 0.0}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(("RssAnon:", "RssFile:")):
+                    key = "anon_mb" if line.startswith("RssAnon") else "file_mb"
+                    values[key] = int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return values
+
+
+def _child(mode: str, path: str, hits: List[str], misses: List[str], results):
+    base_rss = _rss_split()
+    start = time.perf_counter()
+    lookup, close = _open(mode, path)
+    lookup(hits[0])
+    open_s = time.perf_counter() - start
+
+    result = {"open_ms": round(open_s * 1000, 2)}
+    for name, questions in (("hit", hits), ("miss", misses)):
+        latencies = []
+        for question in questions:
+            normalize_key.cache_clear()
+            t0 = time.perf_counter()
+            lookup(question)
+            latencies.append(time.perf_counter() - t0)
+        result[f"{name}_us"] = round(sum(latencies) / len(latencies) * 1e6, 2)
+        result[f"{name}_p99_us"] = round(percentile(latencies, 99) * 1e6, 2)
+    rss = _rss_split()
+    result.update({key: round(rss[key] - base_rss[key], 1) for key in rss})
+    results.put(result)
+    close()
+
+
+def run(records: int = 200000, lookups: int = 10000, seed: int = 0) -> dict:
+    data = make_records(records, seed)
+    rng = random.Random(seed + 1)
+    hits = [r["question"] for r in rng.sample(data, min(lookups, len(data)))]
+    misses = [f"未收录的题目{i}？" for i in range(lookups)]
+    ctx = multiprocessing.get_context()
+    result = {}
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        paths = write_sources(data, directory)
+        result["build_s"] = round(time.perf_counter() - start, 2)
+        result["size_mb"] = {mode: round(os.path.getsize(path) / 1e6, 1) for mode, path in paths.items()}
+        for mode in MODES:
+            queue = ctx.Queue()
+            proc = ctx.Process(target=_child, args=(mode, paths[mode], hits, misses, queue))
+            proc.start()
+            result[mode] = queue.get()
+            proc.join()
+    result["open_speedup_vs_dict"] = round(result["dict"]["open_ms"] / max(result["mmap"]["open_ms"], 1e-3), 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="只读题库基准：mmap 题库、内存字典与 SQLite 答案库")
+    parser.add_argument("--records", type=int, default=200000, help="题库题数")
+    parser.add_argument("--lookups", type=int, default=10000, help="命中与未收录查询各多少次")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    result = run(args.records, args.lookups, args.seed)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+答案请求合并基准
+S 个会话线程共享一个生成器，每轮各答一道题（同一轮的题在 --stagger-ms 内先后到达，模拟多台设备
+同时出题），对比每题单独请求与 AnswerBroker 合并请求在本地模拟服务器上的：
+    - 每题延迟 p50/p95 与吞吐（题/秒）
+    - 服务器收到的请求数与输入字符数（系统提示词与示例对话只随每次请求发送一次）
+
+模拟服务器用 --concurrency 限制同时处理的请求数（服务商并发配额），
+多题请求每多一道题增加 --per-question 秒的生成时间。
+
+用法:
+    python -m benchmarks.bench_broker --sessions 8 --rounds 20
+    python -m benchmarks.bench_broker --sessions 16 --concurrency 4 --per-question 0.05 --json broker.json
+"""
+import argparse
+import json
+import random
+import threading
+import time
+
+from benchmarks.bench_llm import QUESTION_TEMPLATE
+from benchmarks.common import summarize
+from src.generators.answer_broker import AnswerBroker
+from src.generators.call_policy import DeadlineExceeded
+from src.generators.openai_generator import AnswerGenerator
+from tools.mock_llm_server import EndpointProfile, MockLLMServer
+
+MODES = ("unbatched", "broker")
+
+
+def run_sessions(generator, sessions: int, rounds: int, stagger: float, seed: int = 0) -> dict:
+    """每个会话一个线程，逐轮作答；返回延迟汇总、吞吐与失败数"""
+    barrier = threading.Barrier(sessions)
+    latencies, failures = [], []
+    lock = threading.Lock()
+
+    def session(index: int):
+        rng = random.Random(seed + index)
+        for r in range(rounds):
+            barrier.wait()
+            time.sleep(rng.uniform(0, stagger))
+            body = QUESTION_TEMPLATE.format(i=r * sessions + index)
+            start = time.perf_counter()
+            try:
+                answer = generator.get_answer(body)
+                ok = generator.extract_option_number(answer) == 1
+            except DeadlineExceeded:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                (latencies if ok else failures).append(elapsed)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+    return {
+        **summarize(latencies),
+        "failed": len(failures),
+        "wall_s": round(wall, 3),
+        "questions_per_s": round((len(latencies) + len(failures)) / wall, 2),
+    }
+
+
+def run_mode(mode: str, sessions: int, rounds: int, stagger: float, latency: str, per_question: float,
+             concurrency: int, max_batch: int, max_wait_ms: float, deadline: float) -> dict:
+    server = MockLLMServer(default_profile=EndpointProfile(latency, per_question=per_question),
+                           concurrency=concurrency)
+    base_url = server.start()
+    generator = AnswerGenerator(
+        model="mock", api_key="mock", base_url=base_url,
+        http_config={"max_connections": sessions, "max_keepalive": sessions, "keepalive_interval": 0,
+                     "prewarm_connections": min(sessions, 4)},
+        policy_config={"deadline": deadline},
+    )
+    if mode == "broker":
+        generator = AnswerBroker.from_config(generator, {"max_batch": max_batch, "max_wait_ms": max_wait_ms})
+    try:
+        result = run_sessions(generator, sessions, rounds, stagger)
+        if mode == "broker":
+            result["broker"] = generator.stats()
+    finally:
+        generator.close()
+        server.stop()
+    result["server_requests"] = server.requests
+    result["prompt_chars"] = server.prompt_chars
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="答案请求合并基准：每题单独请求与跨会话合并请求")
+    parser.add_argument("--sessions", type=int, default=8, help="并发会话数")
+    parser.add_argument("--rounds", type=int, default=20, help="每个会话作答的轮数")
+    parser.add_argument("--stagger-ms", type=float, default=50.0, help="同一轮各会话出题时间的随机错开范围")
+    parser.add_argument("--latency", default="lognormal:0.5,0.2", help="模拟服务器单次请求的延迟分布")
+    parser.add_argument("--per-question", type=float, default=0.03, help="多题请求中每多一道题增加的延迟（秒）")
+    parser.add_argument("--concurrency", type=int, default=4, help="模拟服务器同时处理的请求数，0 表示不限")
+    parser.add_argument("--max-batch", type=int, default=8, help="每次请求最多合并的题数")
+    parser.add_argument("--max-wait-ms", type=float, default=150.0, help="凑批的最长等待（毫秒）")
+    parser.add_argument("--deadline", type=float, default=10.0, help="每题答题预算（秒）")
+    parser.add_argument("--mode", choices=MODES, help="只运行一种方式")
+    parser.add_argument("--json", help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    result = {}
+    for mode in ((args.mode,) if args.mode else MODES):
+        result[mode] = run_mode(mode, args.sessions, args.rounds, args.stagger_ms / 1000, args.latency,
+                                args.per_question, args.concurrency or None, args.max_batch,
+                                args.max_wait_ms, args.deadline)
+    if len(result) == len(MODES):
+        result["throughput_ratio"] = round(result["broker"]["questions_per_s"]
+                                           / result["unbatched"]["questions_per_s"], 2)
+        result["prompt_chars_ratio"] = round(result["broker"]["prompt_chars"]
+                                             / result["unbatched"]["prompt_chars"], 2)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+集成投票基准
+用带延迟分布与正确率的本地模拟模型对比单模型与并发投票的准确率和延迟
+
+用法:
+    python -m benchmarks.bench_ensemble --questions 200 --deadline 3.0
+    # 通过本地模拟服务器走完整的 HTTP 调用路径
+    python -m benchmarks.bench_ensemble --http
+"""
+import argparse
+import random
+import threading
+import time
+from typing import Dict, Tuple
+
+from benchmarks.common import summarize
+from src.core.base import AnswerGeneratorBase
+from src.generators.ensemble_generator import EnsembleGenerator
+from src.generators.openai_generator import AnswerGenerator
+from tools.mock_llm_server import EndpointProfile, MockLLMServer
+
+
+# (名称, 延迟中位数秒, 对数正态 sigma, 正确率)
+DEFAULT_PROFILES = [
+    ("fast-weak", 0.30, 0.25, 0.70),
+    ("mid", 0.60, 0.35, 0.80),
+    ("slow-strong", 1.20, 0.40, 0.88),
+]
+
+
+class MockMember(AnswerGeneratorBase):
+    """模拟模型：按延迟分布休眠，按正确率返回正确或随机错误选项"""
+
+    def __init__(self, median: float, sigma: float, accuracy: float,
+                 answers: Dict[str, Tuple[int, int]], seed: int):
+        self.median = median
+        self.sigma = sigma
+        self.accuracy = accuracy
+        self.answers = answers
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def get_answer(self, question_body: str) -> str:
+        correct, n_options = self.answers[question_body]
+        with self._lock:
+            latency = self.median * self._rng.lognormvariate(0, self.sigma)
+            right = self._rng.random() < self.accuracy
+            wrong = self._rng.choice([i for i in range(1, n_options + 1) if i != correct])
+        time.sleep(latency)
+        return f"<Answer>{correct if right else wrong}"
+
+    def extract_option_number(self, answer: str) -> int:
+        return int(answer.replace("<Answer>", ""))
+
+
+def _make_questions(n: int, seed: int, first_correct: bool = False) -> Dict[str, Tuple[int, int]]:
+    """生成题目；模拟服务器约定第一个选项为正确答案，此时 first_correct=True"""
+    rng = random.Random(seed)
+    questions = {}
+    for i in range(n):
+        n_options = rng.randint(2, 4)
+        body = f"<Question>模拟题目 {i}" + "".join(f"\n<Option>{k}. 选项{k}" for k in range(1, n_options + 1))
+        questions[body] = (1 if first_correct else rng.randint(1, n_options), n_options)
+    return questions
+
+
+def _http_members(server: MockLLMServer) -> list:
+    """为每个延迟配置创建指向模拟服务器的真实 AnswerGenerator"""
+    members = []
+    for name, median, sigma, accuracy in DEFAULT_PROFILES:
+        server.model_profiles[name] = EndpointProfile(f"lognormal:{median},{sigma}", accuracy=accuracy)
+        generator = AnswerGenerator(model=name, api_key="mock", base_url=server.base_url,
+                                    http_config={"keepalive_interval": 0})
+        members.append((name, generator))
+    return members
+
+
+def _run(generator: AnswerGeneratorBase, questions: Dict[str, Tuple[int, int]],
+         learn: bool = False) -> dict:
+    latencies = []
+    correct = 0
+    for body, (answer, _) in questions.items():
+        start = time.perf_counter()
+        option = generator.extract_option_number(generator.get_answer(body))
+        latencies.append(time.perf_counter() - start)
+        correct += option == answer
+        if learn:
+            generator.record_outcome(body, answer)
+    return {"accuracy": correct / len(questions), **summarize(latencies)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="集成投票基准")
+    parser.add_argument("--questions", type=int, default=200, help="题目数量")
+    parser.add_argument("--deadline", type=float, default=3.0, help="投票截止时间（秒）")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--http", action="store_true", help="通过本地模拟服务器调用（含 HTTP 开销）")
+    args = parser.parse_args()
+
+    server = None
+    questions = _make_questions(args.questions, args.seed, first_correct=args.http)
+    if args.http:
+        server = MockLLMServer()
+        server.start()
+        members = _http_members(server)
+    else:
+        members = [
+            (name, MockMember(median, sigma, accuracy, questions, seed=args.seed + i))
+            for i, (name, median, sigma, accuracy) in enumerate(DEFAULT_PROFILES)
+        ]
+
+    rows = []
+    for name, member in members:
+        rows.append((f"single:{name}", _run(member, questions)))
+
+    # 第一遍在线学习权重，第二遍使用学到的权重
+    ensemble = EnsembleGenerator(members, deadline=args.deadline)
+    rows.append(("ensemble (learning)", _run(ensemble, questions, learn=True)))
+    rows.append(("ensemble (learned)", _run(ensemble, questions)))
+    sequential_ms = sum(r["mean_ms"] for n, r in rows if n.startswith("single:"))
+
+    print(f"{'配置':<24}{'准确率':>8}{'p50(ms)':>10}{'p95(ms)':>10}{'均值(ms)':>10}")
+    for name, r in rows:
+        print(f"{name:<24}{r['accuracy']:>8.3f}{r['p50_ms']:>10.0f}{r['p95_ms']:>10.0f}{r['mean_ms']:>10.0f}")
+    print(f"串行询问全部模型的平均延迟约 {sequential_ms:.0f} ms")
+    print("学到的权重:", {name: round(ensemble.weight(name), 3) for name, _ in members})
+    ensemble.close()
+    if server is not None:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
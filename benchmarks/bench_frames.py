@@ -0,0 +1,140 @@
+"""
+截图与预处理的内存基准
+循环回放录制目录，对比逐帧分配的旧路径（get_screenshot 后 np.array 交给 OCR）与
+帧缓冲池路径（capture_frame + preprocess_frame，结果数组直接交给 OCR），统计：
+    - 每帧截图+预处理延迟
+    - 缓冲池的分配 / 复用次数
+    - RSS（开始、结束、峰值）与 --tracemalloc 时 Python 层分配的峰值和块数
+
+两种路径各在独立子进程中运行，互不影响 RSS。录制为 raw 格式时缓冲池路径完全不分配整帧
+缓冲区；png 格式每帧仍需解码（解码结果复制进池中数组后释放）。
+
+用法:
+    python -m tools.synth_screens --out synth/raw --count 50 --format raw
+    python -m benchmarks.bench_frames --replay synth/raw --frames 10000
+    python -m benchmarks.bench_frames --replay synth/raw --frames 2000 --tracemalloc --json frames.json
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks.common import rss_mb, summarize
+
+MODES = ("legacy", "pooled")
+
+
+def peak_rss_mb() -> float:
+    # Linux 上 ru_maxrss 的单位是 KB
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3, 1)
+
+
+def run_mode(mode: str, directory: str, frames: int, config_path: str = None, trace: bool = False,
+             sample_every: int = 500) -> dict:
+    """在当前进程中运行一种路径"""
+    import numpy as np
+
+    from src.controllers.replay_controller import ReplayController
+    from src.core import config as cfg_loader
+    from src.utils.frame_pool import FramePool
+
+    config = cfg_loader.load_config(config_path)
+    controller = ReplayController(directory, config=config, timing="step", loop=True)
+    pool = FramePool()
+
+    def legacy():
+        screenshot, _ = controller.get_screenshot()
+        # 与 QuestionExtractor 相同：PIL 图像转换为数组后交给 OCR
+        np.array(screenshot)
+
+    def pooled():
+        frame = controller.capture_frame(pool)
+        try:
+            out, _ = controller.preprocess_frame(frame, pool)
+            pool.release(out)
+        finally:
+            pool.release(frame)
+
+    step = legacy if mode == "legacy" else pooled
+    # 预热：第一轮读取录制文件进入页缓存，缓冲池完成首次分配
+    for _ in range(min(len(controller), frames)):
+        step()
+    if trace:
+        import tracemalloc
+        tracemalloc.start()
+
+    rss_start = rss_mb()
+    rss_samples = [rss_start]
+    latencies = []
+    for i in range(1, frames + 1):
+        start = time.perf_counter()
+        step()
+        latencies.append(time.perf_counter() - start)
+        if i % sample_every == 0:
+            rss_samples.append(rss_mb())
+    rss_end = rss_mb()
+
+    result = {
+        "mode": mode,
+        **summarize(latencies),
+        "rss_start_mb": rss_start,
+        "rss_end_mb": rss_end,
+        "rss_max_sampled_mb": max(rss_samples + [rss_end]),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    if mode == "pooled":
+        result["pool"] = pool.stats()
+    if trace:
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        result["tracemalloc"] = {
+            "current_mb": round(current / 1e6, 2),
+            "peak_mb": round(peak / 1e6, 2),
+            "blocks": sum(stat.count for stat in snapshot.statistics("filename")),
+        }
+    return result
+
+
+def run(directory: str, frames: int = 10000, config_path: str = None, trace: bool = False,
+        modes=MODES) -> dict:
+    """每种路径在独立子进程中运行，返回 {路径: 结果}"""
+    results = {}
+    for mode in modes:
+        cmd = [sys.executable, "-m", "benchmarks.bench_frames", "--replay", directory,
+               "--frames", str(frames), "--mode", mode, "--child"]
+        if config_path:
+            cmd += ["--config", config_path]
+        if trace:
+            cmd.append("--tracemalloc")
+        proc = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        results[mode] = json.loads(proc.stdout)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="截图与预处理的内存基准")
+    parser.add_argument("--replay", required=True, help="录制目录（建议 raw 格式）")
+    parser.add_argument("--frames", type=int, default=10000, help="每种路径处理的帧数，录制帧不足时循环回放")
+    parser.add_argument("--mode", choices=MODES, help="只运行一种路径")
+    parser.add_argument("--config", help="配置文件路径（读取裁剪比例与二值化阈值）")
+    parser.add_argument("--tracemalloc", action="store_true", help="同时用 tracemalloc 统计 Python 层分配")
+    parser.add_argument("--json", help="将结果写入 JSON 文件")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_mode(args.mode, args.replay, args.frames, args.config, args.tracemalloc)))
+        return
+    result = run(args.replay, args.frames, args.config, args.tracemalloc,
+                 modes=(args.mode,) if args.mode else MODES)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
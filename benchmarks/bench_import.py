@@ -0,0 +1,117 @@
+"""
+导入耗时基准
+在全新的解释器中导入各模块并计时，同时检查是否意外加载了重量级依赖
+（PaddleOCR、openai、win32 等只应在配置选中对应后端时导入）
+
+用法:
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --max-ms 100 --repeat 10
+    python -m benchmarks.bench_import --modules src.core.quiz_bot --detail 15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+DEFAULT_MODULES = ["src", "src.core", "src.core.registry", "src.core.quiz_bot",
+                   "src.controllers", "src.generators", "src.extractors"]
+
+# 导入上述模块时不应出现的依赖
+HEAVY_MODULES = ["paddleocr", "paddle", "openai", "httpx", "numpy", "PIL",
+                 "win32gui", "win32ui", "pygetwindow"]
+
+_PROBE = """
+import json, sys, time
+heavy = {heavy!r}
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "loaded": [m for m in heavy if m in sys.modules]}}))
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (ROOT, env.get("PYTHONPATH")) if p)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def measure(module: str, repeat: int = 5) -> Dict[str, object]:
+    """
+    在 repeat 个全新进程中导入 module（第一次运行预热 .pyc，不计入）
+
+    Returns:
+        {min_ms, median_ms, loaded}，loaded 为被导入的重量级依赖
+    """
+    code = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    runs, loaded = [], []
+    for i in range(repeat + 1):
+        proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                              cwd=ROOT, env=_env())
+        if proc.returncode != 0:
+            raise RuntimeError(f"导入 {module} 失败:\n{proc.stderr.strip()}")
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        loaded = result["loaded"]
+        if i:
+            runs.append(result["ms"])
+    return {"min_ms": round(min(runs), 2), "median_ms": round(statistics.median(runs), 2),
+            "loaded": loaded}
+
+
+def importtime_detail(module: str, top: int = 10) -> List[Tuple[str, float]]:
+    """用 -X importtime 列出导入 module 时累计耗时最多的子模块 [(模块, 毫秒)]"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, cwd=ROOT, env=_env())
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, _, cumulative, name = (part.strip() for part in line.replace("import time:", "|", 1).split("|"))
+        entries.append((name, int(cumulative) / 1000))
+    # -X importtime 包含解释器启动时导入的模块，只保留本次导入触发的部分
+    started = next((i for i, (name, _) in enumerate(entries) if name.split(".")[0] == module.split(".")[0]), 0)
+    tail = entries[started:]
+    return sorted(tail, key=lambda e: e[1], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="导入耗时基准")
+    parser.add_argument("--modules", default=",".join(DEFAULT_MODULES), help="要测量的模块，逗号分隔")
+    parser.add_argument("--repeat", type=int, default=5, help="每个模块的进程数")
+    parser.add_argument("--max-ms", type=float, default=100.0, help="导入耗时中位数上限，超过时退出码为 1")
+    parser.add_argument("--detail", type=int, default=0, help="列出每个模块累计耗时最多的 N 个子模块")
+    parser.add_argument("--json", help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    modules = [m for m in args.modules.split(",") if m]
+    results, failures = {}, []
+    print(f"{'模块':<24}{'min ms':>10}{'中位 ms':>10}  重量级依赖")
+    for module in modules:
+        result = measure(module, args.repeat)
+        results[module] = result
+        over = result["median_ms"] > args.max_ms
+        if over or result["loaded"]:
+            failures.append(module)
+        print(f"{module:<24}{result['min_ms']:>10.1f}{result['median_ms']:>10.1f}  "
+              f"{', '.join(result['loaded']) or '-'}{'  <- 超过上限' if over else ''}")
+        if args.detail:
+            for name, cumulative in importtime_detail(module, args.detail):
+                print(f"    {name:<40}{cumulative:>8.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"max_ms": args.max_ms, "results": results}, f, ensure_ascii=False, indent=2)
+
+    if failures:
+        print(f"{len(failures)} 个模块超过 {args.max_ms:.0f} ms 或加载了重量级依赖: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
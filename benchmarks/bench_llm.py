@@ -0,0 +1,100 @@
+"""
+LLM 答题路径延迟基准
+通过本地模拟服务器（或任意 OpenAI 兼容端点）以指定并发驱动 AnswerGenerator，
+报告 p50/p95/p99 延迟与吞吐量
+
+用法:
+    python -m benchmarks.bench_llm --requests 500 --concurrency 8 --latency lognormal:0.5,0.3
+    python -m benchmarks.bench_llm --error-rate 0.1 --deadline 3 --json llm_bench.json
+    python -m benchmarks.bench_llm --base-url http://127.0.0.1:8000/v1   # 使用外部模拟服务器
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import summarize
+from src.generators.call_policy import DeadlineExceeded
+from src.generators.openai_generator import AnswerGenerator
+from tools.mock_llm_server import EndpointProfile, MockLLMServer
+
+
+QUESTION_TEMPLATE = (
+    "<Question>第{i}题：以下哪部作品的作者是曹雪芹?\n"
+    "<Option>1. 《红楼梦》\n"
+    "<Option>2. 《水浒传》\n"
+    "<Option>3. 《西游记》\n"
+    "<Option>4. 《三国演义》"
+)
+
+
+def run_benchmark(generator: AnswerGenerator, requests: int, concurrency: int) -> dict:
+    """以固定并发发送 requests 道题，返回延迟汇总与吞吐量"""
+    def one(i: int):
+        start = time.perf_counter()
+        try:
+            generator.get_answer(QUESTION_TEMPLATE.format(i=i))
+            return time.perf_counter() - start, None
+        except DeadlineExceeded as e:
+            return time.perf_counter() - start, str(e)
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - wall_start
+
+    ok = [latency for latency, error in results if error is None]
+    return {
+        **summarize(ok),
+        "requests": requests,
+        "concurrency": concurrency,
+        "failed": sum(1 for _, error in results if error is not None),
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(requests / wall, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM 答题路径延迟基准")
+    parser.add_argument("--requests", type=int, default=200, help="请求总数")
+    parser.add_argument("--concurrency", type=int, default=4, help="并发数")
+    parser.add_argument("--latency", default="lognormal:0.5,0.3", help="模拟服务器延迟分布")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="模拟服务器错误率")
+    parser.add_argument("--base-url", help="使用已有的 OpenAI 兼容端点，不启动内置模拟服务器")
+    parser.add_argument("--model", default="mock")
+    parser.add_argument("--deadline", type=float, default=10.0, help="每题调用预算（秒）")
+    parser.add_argument("--no-prewarm", action="store_true", help="关闭连接预热，对比首题延迟")
+    parser.add_argument("--json", help="将结果写入 JSON 文件，便于跨提交对比")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = MockLLMServer(default_profile=EndpointProfile(args.latency, args.error_rate))
+        base_url = server.start()
+
+    generator = AnswerGenerator(
+        model=args.model,
+        api_key="mock",
+        base_url=base_url,
+        http_config={"max_connections": args.concurrency, "max_keepalive": args.concurrency,
+                     "prewarm": not args.no_prewarm, "prewarm_connections": args.concurrency,
+                     "keepalive_interval": 0},
+        policy_config={"deadline": args.deadline},
+    )
+    try:
+        result = run_benchmark(generator, args.requests, args.concurrency)
+        result["endpoints"] = generator.get_stats()
+    finally:
+        generator.close()
+        if server is not None:
+            server.stop()
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
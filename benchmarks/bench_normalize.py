@@ -0,0 +1,121 @@
+"""
+文本规范化吞吐基准
+在模拟 OCR 输出的语料（题干、选项，混有全角字母数字、中英文标点、书名号、A/B/C/D 标记与空白）上
+测量每秒处理的字符串数：
+    - legacy          旧的缓存键：只去除空白
+    - naive           同样规则的逐条实现：NFKC + 逐个 replace + 正则
+    - fold            text_normalize.fold（一次 translate）
+    - key             text_normalize.normalize_key，不经过缓存
+    - key_cached      normalize_key 反复规范化少量相同文本（一局内同一题被规范化多次）
+    - marker / strip  is_option_marker / strip_option_marker
+
+用法:
+    python -m benchmarks.bench_normalize
+    python -m benchmarks.bench_normalize --strings 200000 --json normalize.json
+"""
+import argparse
+import json
+import random
+import re
+import time
+import unicodedata
+from typing import Callable, Dict, List
+
+from src.utils import text_normalize
+
+_CHARS = "以下哪部作品的作者是曹雪芹光在真空中传播速度约为每秒多少千米进击巨人调查兵团团长最后是谁红楼梦水浒传西游记三国演义"
+_WORDS = ["CPU", "ＤＮＡ", "NBA", "iPhone", "１９４９", "2024", "WWW", "ＵＳＢ"]
+_PUNCT = "，。？！：；（）、"
+_MARKERS = ["A.", "B、", "（C）", "Ｄ．", "A ", "b:", ""]
+
+
+def make_corpus(n: int, seed: int = 0) -> List[str]:
+    """生成 n 条互不相同的 OCR 风格文本，题干与选项约各占一半"""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(n):
+        if i % 2 == 0:
+            parts = [rng.choice(_CHARS) for _ in range(rng.randint(12, 30))]
+            parts.insert(rng.randrange(len(parts)), rng.choice(_WORDS))
+            parts.insert(rng.randrange(len(parts)), rng.choice(_PUNCT))
+            parts.append(rng.choice("？?"))
+        else:
+            parts = [rng.choice(_MARKERS)]
+            body = [rng.choice(_CHARS) for _ in range(rng.randint(2, 8))]
+            parts += ["《", *body, "》"] if rng.random() < 0.3 else body
+        if rng.random() < 0.3:
+            parts.insert(rng.randrange(len(parts) + 1), rng.choice(" 　\t"))
+        corpus.append("".join(parts) + str(i))
+    return corpus
+
+
+_NAIVE_REPLACE = [("，", ","), ("。", "."), ("、", ","), ("：", ":"), ("；", ";"), ("？", "?"), ("！", "!"),
+                  ("（", "("), ("）", ")"), ("【", "["), ("】", "]"), ("—", "-"), ("…", "...")]
+_NAIVE_DELETE = re.compile(r"[《》〈〉<>「」『』“”‘’\"'`\s]")
+_NAIVE_MARKER = re.compile(r"(?:[a-h][.,:]|\([a-h]\)|\[[a-h]\])(?![a-z0-9]\.)")
+
+
+def naive_key(text: str) -> str:
+    """不用 translate 表、逐条处理的等价实现，作为对照"""
+    text = unicodedata.normalize("NFKC", text)
+    for src, dst in _NAIVE_REPLACE:
+        text = text.replace(src, dst)
+    text = _NAIVE_DELETE.sub("", text).lower()
+    match = _NAIVE_MARKER.match(text)
+    if match is not None and match.end() < len(text):
+        text = text[match.end():]
+    return text
+
+
+def measure(fn: Callable[[str], object], corpus: List[str], repeat: int = 5) -> dict:
+    """对整个语料调用 fn，取最快一轮"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in corpus:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return {
+        "strings_per_s": round(len(corpus) / best),
+        "ns_per_string": round(best / len(corpus) * 1e9, 1),
+    }
+
+
+def run(strings: int = 100000, repeat: int = 5, hot: int = 64) -> Dict[str, dict]:
+    corpus = make_corpus(strings)
+    # 一局内反复规范化的少量题目与选项
+    hot_corpus = corpus[:hot] * (strings // hot)
+    uncached = text_normalize.normalize_key.__wrapped__
+    cases = {
+        "legacy": lambda s: "".join(s.split()),
+        "naive": naive_key,
+        "fold": text_normalize.fold,
+        "key": uncached,
+        "marker": text_normalize.is_option_marker,
+        "strip": text_normalize.strip_option_marker,
+    }
+    results = {name: measure(fn, corpus, repeat) for name, fn in cases.items()}
+    text_normalize.normalize_key.cache_clear()
+    results["key_cached"] = measure(text_normalize.normalize_key, hot_corpus, repeat)
+    results["speedup_vs_naive"] = round(results["key"]["strings_per_s"] / results["naive"]["strings_per_s"], 2)
+    mismatches = sum(naive_key(s) != uncached(s) for s in corpus)
+    results["naive_mismatches"] = mismatches
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="文本规范化吞吐基准")
+    parser.add_argument("--strings", type=int, default=100000, help="语料条数")
+    parser.add_argument("--repeat", type=int, default=5, help="每个条目的重复轮数，取最快一轮")
+    parser.add_argument("--json", help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    result = run(args.strings, args.repeat)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
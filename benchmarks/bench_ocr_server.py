@@ -0,0 +1,160 @@
+"""
+OCR 服务基准
+对比两种部署方式在 N 个并发实例下的吞吐与总内存：
+    - local:  N 个进程各自加载 PaddleOCR（QuestionExtractor）
+    - server: 一个 OCR 服务进程加载模型并微批推理，N 个进程用 RemoteQuestionExtractor 发送请求
+
+输入为合成答题画面裁剪、二值化后的题目区域（与运行时交给 OCR 的图像相同）。
+吞吐按所有实例完成模型加载后开始计时；内存为所有相关进程 RSS 之和，
+server 模式另外输出服务端的批大小分布与排队、推理耗时。
+
+用法:
+    python -m benchmarks.bench_ocr_server --instances 4 --requests 50
+    python -m benchmarks.bench_ocr_server --instances 8 --max-batch 8 --max-wait-ms 5 --json ocr_server.json
+"""
+import argparse
+import json
+import multiprocessing
+import time
+
+from benchmarks.common import rss_mb, summarize
+
+MODES = ("local", "server")
+
+
+def make_inputs(count: int = 4, size=(1080, 2400), config_path: str = None) -> list:
+    """渲染合成画面并按配置裁剪、二值化，返回 RGB 数组列表"""
+    import numpy as np
+
+    from src.core import config as cfg_loader
+    from src.utils.image_ops import binarize, crop_by_ratio
+    from tools.synth_screens import ScreenSynthesizer
+
+    config = cfg_loader.load_config(config_path)
+    synth = ScreenSynthesizer(seed=0)
+    inputs = []
+    for _ in range(count):
+        img, _ = synth.render(size)
+        region, _ = crop_by_ratio(img, tuple(config.screenshot.crop_ratios))
+        bw = binarize(region, config.screenshot.bw_threshold)
+        inputs.append(np.asarray(bw))
+    return inputs
+
+
+def _client(mode: str, address: str, inputs: list, requests: int, barrier, results):
+    """一个实例：创建提取器，等待全部实例就绪后连续识别 requests 次"""
+    if mode == "local":
+        from src.extractors.ocr_extractor import QuestionExtractor
+        extractor = QuestionExtractor()
+    else:
+        from src.extractors.remote_extractor import RemoteQuestionExtractor
+        extractor = RemoteQuestionExtractor(address, timeout=60.0)
+    # 预热一次：建立连接、触发首次推理的初始化
+    extractor.extract_question(inputs[0])
+    barrier.wait()
+    latencies = []
+    for i in range(requests):
+        start = time.perf_counter()
+        extractor.extract_question(inputs[i % len(inputs)])
+        latencies.append(time.perf_counter() - start)
+    results.put({"latencies": latencies, "rss_mb": rss_mb()})
+    # 等主进程读取服务端内存后再退出
+    barrier.wait()
+
+
+def _server(address_queue, stop_event, max_batch: int, max_wait_ms: float):
+    """OCR 服务进程：监听随机端口，把实际地址与统计结果经队列交回主进程"""
+    from src.extractors.ocr_extractor import QuestionExtractor
+    from src.extractors.ocr_server import OCRServer
+
+    extractor = QuestionExtractor()
+    server = OCRServer(extractor.ocr, extractor._normalize_ocr_results, address="127.0.0.1:0",
+                       max_batch=max_batch, max_wait=max_wait_ms / 1000)
+    server.start()
+    address_queue.put(server.address)
+    stop_event.wait()
+    address_queue.put(server.stats())
+    server.stop()
+
+
+def run_mode(mode: str, instances: int, requests: int, inputs: list, max_batch: int = 8,
+             max_wait_ms: float = 5.0, ctx=None) -> dict:
+    ctx = ctx or multiprocessing.get_context()
+    address, server_proc = None, None
+    if mode == "server":
+        address_queue, stop_event = ctx.Queue(), ctx.Event()
+        server_proc = ctx.Process(target=_server, args=(address_queue, stop_event, max_batch, max_wait_ms))
+        server_proc.start()
+        address = address_queue.get(timeout=120)
+
+    # 主进程也参与屏障：所有实例就绪后开始计时，全部完成后读取内存
+    barrier = ctx.Barrier(instances + 1)
+    results = ctx.Queue()
+    clients = [ctx.Process(target=_client, args=(mode, address, inputs, requests, barrier, results))
+               for _ in range(instances)]
+    for proc in clients:
+        proc.start()
+    try:
+        barrier.wait(timeout=300)
+        start = time.perf_counter()
+        outcomes = [results.get(timeout=600) for _ in clients]
+        wall = time.perf_counter() - start
+        server_rss = rss_mb(server_proc.pid) if server_proc else 0.0
+        barrier.wait(timeout=60)
+    finally:
+        for proc in clients:
+            proc.join()
+        server_stats = None
+        if server_proc:
+            stop_event.set()
+            server_stats = address_queue.get(timeout=30)
+            server_proc.join()
+
+    latencies = [t for outcome in outcomes for t in outcome["latencies"]]
+    client_rss = sum(outcome["rss_mb"] for outcome in outcomes)
+    result = {
+        "mode": mode,
+        "instances": instances,
+        **summarize(latencies),
+        "throughput_per_s": round(len(latencies) / wall, 1),
+        "rss_total_mb": round(client_rss + server_rss, 1),
+        "rss_clients_mb": round(client_rss, 1),
+    }
+    if server_proc:
+        result["rss_server_mb"] = server_rss
+        result["server"] = server_stats
+    return result
+
+
+def run(instances: int = 4, requests: int = 50, max_batch: int = 8, max_wait_ms: float = 5.0,
+        config_path: str = None, modes=MODES) -> dict:
+    inputs = make_inputs(config_path=config_path)
+    results = {mode: run_mode(mode, instances, requests, inputs, max_batch, max_wait_ms) for mode in modes}
+    if len(results) == len(MODES):
+        local, server = results["local"], results["server"]
+        results["throughput_ratio"] = round(server["throughput_per_s"] / local["throughput_per_s"], 2)
+        results["memory_ratio"] = round(server["rss_total_mb"] / local["rss_total_mb"], 2)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR 服务基准：每实例独立加载模型与共享 OCR 服务")
+    parser.add_argument("--instances", type=int, default=4, help="并发实例数")
+    parser.add_argument("--requests", type=int, default=50, help="每个实例的识别次数")
+    parser.add_argument("--max-batch", type=int, default=8, help="服务端每批最多合并的请求数")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="服务端凑批的最长等待（毫秒）")
+    parser.add_argument("--mode", choices=MODES, help="只运行一种部署方式")
+    parser.add_argument("--config", help="配置文件路径（读取裁剪比例与二值化阈值）")
+    parser.add_argument("--json", help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    result = run(args.instances, args.requests, args.max_batch, args.max_wait_ms, args.config,
+                 modes=(args.mode,) if args.mode else MODES)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+OCR 后处理微基准
+对 _normalize_ocr_results / _sort_and_merge_lines / _filter_and_classify /
+_convert_to_compatible_format 在不同文本框数量下计时，夹具同时覆盖
+PaddleOCR 2.x 列表格式与 3.x OCRResult 格式；结果写成 JSON，可与基线比较
+
+用法:
+    python -m benchmarks.bench_postprocess --json baseline.json
+    python -m benchmarks.bench_postprocess --compare baseline.json --threshold 0.15
+    python -m benchmarks.bench_postprocess --sizes 8,64 --quick
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import timeit
+from functools import partial
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from benchmarks.common import postprocess_extractor
+
+
+DEFAULT_SIZES = [4, 8, 16, 32, 64, 128]
+_CHARS = "以下哪部作品的作者是曹雪芹光在真空中传播速度约为每秒多少千米进击巨人调查兵团团长最后是谁红楼梦水浒传西游记三国演义"
+
+
+class OCRResultFixture:
+    """模拟 PaddleOCR 3.x 的 OCRResult：数据在 json['res'] 中，坐标为 numpy 数组"""
+
+    def __init__(self, items: List[Tuple[List, str]]):
+        self.json = {"res": {
+            "rec_texts": [text for _, text in items],
+            "rec_polys": [np.array(bbox, dtype=np.int16) for bbox, _ in items],
+            "rec_scores": [0.98] * len(items),
+        }}
+
+
+def make_boxes(n: int, seed: int = 0) -> List[Tuple[List, str]]:
+    """
+    生成 n 个文本框的答题画面 OCR 结果：1-3 行题干、2-4 个选项，
+    每行被切成若干相邻片段（模拟 OCR 把一行拆成多个框），顺序打乱
+
+    Returns:
+        [(bbox, text), ...]
+    """
+    rng = random.Random(seed * 1000 + n)
+    question_rows = min(3, max(1, n // 8))
+    option_rows = max(2, min(4, n - question_rows))
+    rows = []
+    y = 100
+    for _ in range(question_rows):
+        rows.append(y)
+        y += 60                      # 行高 40，行距 20，小于题干行距阈值
+    y += 120
+    for _ in range(option_rows):
+        rows.append(y)
+        y += 130
+
+    per_row = [1] * len(rows)
+    for i in range(n - len(rows)):
+        per_row[i % len(rows)] += 1
+
+    boxes = []
+    for top, count in zip(rows, per_row):
+        width = 900 // count
+        for k in range(count):
+            left = 60 + k * width
+            jitter = rng.randint(-3, 3)
+            bbox = [[left, top + jitter], [left + width - 8, top + jitter],
+                    [left + width - 8, top + 40 + jitter], [left, top + 40 + jitter]]
+            text = "".join(rng.choice(_CHARS) for _ in range(rng.randint(2, 8)))
+            boxes.append((bbox, text))
+    rng.shuffle(boxes)
+    return boxes
+
+
+def paddle2_fixture(boxes: List[Tuple[List, str]]) -> list:
+    """PaddleOCR 2.x: [[(bbox, (text, score)), ...]]"""
+    return [[(bbox, (text, 0.98)) for bbox, text in boxes]]
+
+
+def paddle3_fixture(boxes: List[Tuple[List, str]]) -> list:
+    """PaddleOCR 3.x: [OCRResult]"""
+    return [OCRResultFixture(boxes)]
+
+
+def measure(fn: Callable[[], object], repeat: int = 7, min_time: float = 0.05) -> Dict[str, float]:
+    """
+    计时单个调用：自动确定循环次数使每轮不少于 min_time 秒，重复 repeat 轮
+
+    Returns:
+        每次调用的 {min_us, median_us, loops, repeat}
+    """
+    timer = timeit.Timer(fn)
+    loops, elapsed = timer.autorange()
+    if elapsed < min_time:
+        loops = max(1, int(loops * min_time / max(elapsed, 1e-9)))
+    runs = [t / loops * 1e6 for t in timer.repeat(repeat=repeat, number=loops)]
+    return {"min_us": round(min(runs), 3), "median_us": round(statistics.median(runs), 3),
+            "loops": loops, "repeat": repeat}
+
+
+def build_cases(sizes: List[int]) -> Dict[str, Callable[[], object]]:
+    """为每个文本框数量与每个阶段构造无参调用，键为 "阶段/格式/n=数量" """
+    extractor = postprocess_extractor()
+    cases = {}
+    for n in sizes:
+        boxes = make_boxes(n)
+        raw = {"paddle2": paddle2_fixture(boxes), "paddle3": paddle3_fixture(boxes)}
+        for fmt, fixture in raw.items():
+            cases[f"normalize/{fmt}/n={n}"] = partial(extractor._normalize_ocr_results, fixture)
+
+        normalized = extractor._normalize_ocr_results(raw["paddle3"])
+        sorted_results = extractor._sort_and_merge_lines(normalized)
+        classified = extractor._filter_and_classify(sorted_results)
+        cases[f"sort_merge/-/n={n}"] = partial(extractor._sort_and_merge_lines, normalized)
+        cases[f"classify/-/n={n}"] = partial(extractor._filter_and_classify, sorted_results)
+        cases[f"convert/-/n={n}"] = partial(extractor._convert_to_compatible_format, classified, sorted_results)
+    return cases
+
+
+def run(cases: Dict[str, Callable[[], object]], repeat: int = 7, min_time: float = 0.05) -> Dict[str, dict]:
+    return {key: measure(fn, repeat, min_time) for key, fn in cases.items()}
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: Dict[str, dict], baseline: Dict[str, dict], threshold: float,
+            cases: Dict[str, Callable[[], object]] = None, retries: int = 2) -> List[str]:
+    """
+    以每次调用的最短时间比较，返回慢于基线超过 threshold 的条目
+
+    最短时间受调度噪声影响最小，适合微基准之间的比较；提供 cases 时，
+    超过阈值的条目会以更多轮数重测 retries 次并取最好成绩，减少误报。
+    """
+    for key in sorted(current):
+        for _ in range(retries if cases and key in baseline and key in cases else 0):
+            if current[key]["min_us"] <= baseline[key]["min_us"] * (1 + threshold):
+                break
+            again = measure(cases[key], repeat=current[key]["repeat"] * 2)
+            if again["min_us"] < current[key]["min_us"]:
+                current[key] = again
+
+    regressions = []
+    print(f"{'条目':<28}{'基线 us':>12}{'当前 us':>12}{'比值':>8}")
+    for key in sorted(current):
+        if key not in baseline:
+            continue
+        base, cur = baseline[key]["min_us"], current[key]["min_us"]
+        ratio = cur / base if base > 0 else 1.0
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  <- 回退"
+            regressions.append(key)
+        print(f"{key:<28}{base:>12.2f}{cur:>12.2f}{ratio:>8.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR 后处理微基准")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="文本框数量，逗号分隔")
+    parser.add_argument("--repeat", type=int, default=7, help="每个条目的重复轮数")
+    parser.add_argument("--quick", action="store_true", help="减少重复与每轮时长，用于 CI 冒烟")
+    parser.add_argument("--json", help="将结果写入 JSON 文件，作为之后比较的基线")
+    parser.add_argument("--compare", help="与基线 JSON 比较")
+    parser.add_argument("--threshold", type=float, default=0.15, help="允许的相对变慢比例")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    repeat, min_time = (3, 0.01) if args.quick else (args.repeat, 0.05)
+    report = {
+        "meta": {"revision": _git_revision(), "python": platform.python_version(),
+                 "platform": platform.platform(), "sizes": sizes, "repeat": repeat},
+    }
+    cases = build_cases(sizes)
+    report["results"] = run(cases, repeat, min_time)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"基线 {baseline['meta'].get('revision')} -> 当前 {report['meta']['revision']}")
+        regressions = compare(report["results"], baseline["results"], args.threshold, cases)
+        if regressions:
+            print(f"{len(regressions)} 个条目慢于基线超过 {args.threshold:.0%}")
+            sys.exit(1)
+        print("没有超过阈值的回退")
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+端到端回放基准
+用 ReplayController 回放录制的截图驱动完整的 QuizBot 流程，无需设备；
+可选使用本地模拟 LLM，使整个流程在 CI 上可重复
+
+用法:
+    python main.py bench --replay recordings/session1 --mock-llm
+    python -m benchmarks.bench_replay --replay recordings/session1 --mock-llm --json replay_bench.json
+"""
+import argparse
+import json
+import time
+
+from benchmarks.common import summarize
+from src.core import config as cfg_loader
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--replay", required=True, help="录制目录（包含 manifest.jsonl）")
+    parser.add_argument("--config", help="配置文件路径，默认使用当前目录的 config.yaml")
+    parser.add_argument("--questions", type=int, help="处理的题目数量，默认等于录制帧数")
+    parser.add_argument("--timing", choices=("step", "realtime"), default="step",
+                        help="step 立即返回下一帧（确定性）；realtime 按录制节奏")
+    parser.add_argument("--speculative", action="store_true", help="启用题干先行识别与预取")
+    parser.add_argument("--mock-llm", action="store_true", help="使用内置模拟 LLM 服务器，不访问真实 API")
+    parser.add_argument("--latency", default="fixed:0.3", help="模拟 LLM 的延迟分布")
+    parser.add_argument("--json", help="将结果写入 JSON 文件，便于跨提交对比")
+
+
+def _tap_agreement(taps, recorded_taps, tolerance: int = 10) -> float:
+    """回放点击与录制点击逐个比对，坐标误差在 tolerance 像素内视为一致"""
+    pairs = list(zip(taps, recorded_taps))
+    if not pairs:
+        return 0.0
+    same = sum(1 for (_, x, y), rec in pairs
+               if abs(x - rec["x"]) <= tolerance and abs(y - rec["y"]) <= tolerance)
+    return round(same / len(pairs), 4)
+
+
+def run(args) -> dict:
+    from src.core.quiz_bot import QuizBot
+    from src.utils import metrics
+    from src.utils.log import shutdown_logging
+
+    config = cfg_loader.load_config(args.config).to_dict()
+    config["controller"]["type"] = "replay"
+    config["replay"] = {"path": args.replay, "timing": args.timing, "speed": 1.0, "loop": False}
+    # 答案库命中会让结果依赖之前的运行，基准中关闭；统计只保留在内存中
+    config["answer_store"]["path"] = None
+    # 结果检测会额外截图，消耗回放帧
+    config["outcome"] = {"enabled": False}
+    # 标定结果（答题区域、二值化阈值）不写入缓存文件，每次基准都从头标定
+    config["roi_calibration"]["cache_path"] = None
+    config["threshold_calibration"]["cache_path"] = None
+    config["metrics"] = {"enabled": True, "jsonl_path": None, "prometheus_port": None, "window": 3600}
+    config["app"].update(click_delay=0, debug_mode=False, speculative=args.speculative, hot_reload=False)
+
+    server = None
+    if args.mock_llm:
+        from tools.mock_llm_server import EndpointProfile, MockLLMServer
+        server = MockLLMServer(default_profile=EndpointProfile(args.latency))
+        config["llm"].update(base_url=server.start(), api_key="mock", fallback_model=None)
+        config["llm"]["ensemble"] = {"enabled": False}
+
+    try:
+        bot = QuizBot(config=config)
+        controller = bot.android_controller
+        questions = args.questions or len(controller)
+        latencies, succeeded = [], 0
+        wall_start = time.perf_counter()
+        try:
+            for _ in range(questions):
+                start = time.perf_counter()
+                if bot.process_one_question():
+                    succeeded += 1
+                latencies.append(time.perf_counter() - start)
+        finally:
+            bot.answer_generator.close()
+            shutdown_logging()
+        wall = time.perf_counter() - wall_start
+    finally:
+        if server is not None:
+            server.stop()
+
+    return {
+        **summarize(latencies),
+        "questions": questions,
+        "succeeded": succeeded,
+        "wall_s": round(wall, 3),
+        "taps": len(controller.taps),
+        "tap_agreement": _tap_agreement(controller.taps, controller.recorded_taps),
+        "stages": metrics.get_registry().snapshot(),
+        "screens": bot.screen_gate.stats(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="端到端回放基准")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    result = run(args)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+跨进程传帧基准
+子进程模拟截图（把模板帧写入新数组或共享内存槽位）并发送，主进程模拟 OCR 端接收并读取像素，
+对比 multiprocessing.Queue 直接传 ndarray（pickle）与 SharedFrameRing（只传槽位编号）
+在 720p / 1080p / 1440p 竖屏 RGBA 帧下的吞吐与端到端延迟
+
+用法:
+    python -m benchmarks.bench_shm
+    python -m benchmarks.bench_shm --frames 1000 --slots 4 --json shm.json
+"""
+import argparse
+import json
+import multiprocessing
+import time
+
+import numpy as np
+
+from benchmarks.common import summarize
+
+RESOLUTIONS = {"720p": (720, 1280), "1080p": (1080, 1920), "1440p": (1440, 2560)}
+TRANSPORTS = ("pickle", "shm")
+
+
+def _template(width: int, height: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (height, width, 4), dtype=np.uint8)
+
+
+def _produce(transport: str, channel, width: int, height: int, frames: int):
+    """截图进程：每帧把模板写入新缓冲区（pickle）或共享内存槽位（shm）后发送"""
+    template = _template(width, height)
+    for i in range(frames):
+        if transport == "pickle":
+            frame = template.copy()
+            channel.put((frame, time.monotonic()))
+        else:
+            frame = channel.acquire(template.shape)
+            np.copyto(frame, template)
+            channel.send(frame, t=time.monotonic())
+    if transport == "pickle":
+        channel.put(None)
+    else:
+        channel.send_eof()
+        channel.close()
+
+
+def _consume(transport: str, channel, frames: int) -> list:
+    """OCR 进程：接收并按行抽样读取像素（代替 OCR），返回每帧端到端延迟"""
+    latencies = []
+    while True:
+        if transport == "pickle":
+            item = channel.get()
+            if item is None:
+                break
+            frame, sent = item
+            frame[::8].sum()
+        else:
+            shared = channel.receive()
+            if shared is None:
+                break
+            with shared:
+                shared.array[::8].sum()
+                sent = shared.meta["t"]
+        latencies.append(time.monotonic() - sent)
+    return latencies
+
+
+def run_case(transport: str, width: int, height: int, frames: int, slots: int, ctx) -> dict:
+    from src.utils.shm_ring import SharedFrameRing
+
+    if transport == "pickle":
+        # 与共享内存相同的在途帧上限
+        channel = ctx.Queue(maxsize=slots)
+    else:
+        channel = SharedFrameRing(slots=slots, slot_size=width * height * 4, ctx=ctx)
+    producer = ctx.Process(target=_produce, args=(transport, channel, width, height, frames))
+    start = time.perf_counter()
+    producer.start()
+    try:
+        latencies = _consume(transport, channel, frames)
+        wall = time.perf_counter() - start
+    finally:
+        producer.join()
+        if transport == "shm":
+            channel.close()
+            channel.unlink()
+    mb = width * height * 4 / 1e6
+    return {
+        **summarize(latencies),
+        "frames_per_s": round(len(latencies) / wall, 1),
+        "mb_per_s": round(len(latencies) * mb / wall, 1),
+    }
+
+
+def run(frames: int = 300, slots: int = 4, resolutions=RESOLUTIONS, start_method: str = None) -> dict:
+    ctx = multiprocessing.get_context(start_method)
+    results = {}
+    for name, (width, height) in resolutions.items():
+        results[name] = {transport: run_case(transport, width, height, frames, slots, ctx)
+                         for transport in TRANSPORTS}
+        pickle_fps = results[name]["pickle"]["frames_per_s"]
+        results[name]["speedup"] = round(results[name]["shm"]["frames_per_s"] / pickle_fps, 2) if pickle_fps else None
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="跨进程传帧基准：Queue pickle 与共享内存环")
+    parser.add_argument("--frames", type=int, default=300, help="每种分辨率与传输方式的帧数")
+    parser.add_argument("--slots", type=int, default=4, help="共享内存槽位数，同时作为队列容量")
+    parser.add_argument("--resolutions", default=",".join(RESOLUTIONS), help="逗号分隔，可选 720p,1080p,1440p")
+    parser.add_argument("--start-method", choices=("fork", "spawn", "forkserver"), help="子进程启动方式")
+    parser.add_argument("--json", help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    resolutions = {name: RESOLUTIONS[name] for name in args.resolutions.split(",")}
+    result = run(args.frames, args.slots, resolutions, args.start_method)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
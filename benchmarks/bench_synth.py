@@ -0,0 +1,146 @@
+"""
+合成画面 OCR 吞吐与准确率基准
+读取 tools.synth_screens 生成的目录，经与控制器相同的裁剪与二值化后交给
+QuestionExtractor，对照真实标注统计题干/选项识别准确率与点击命中率
+
+--postprocess-only 时跳过 PaddleOCR，直接把标注框作为 OCR 结果送入后处理，
+单独衡量排序、分类与格式化的正确性和开销
+
+--classify 时先经过画面分类器，只有判为答题页的帧才做 OCR；报告分类混淆矩阵
+以及有无分类器时浪费的 OCR 调用数（目录需用 --non-question 生成过渡画面与结果页）
+
+用法:
+    python -m tools.synth_screens --out synth/run1 --count 2000 --seed 1
+    python -m benchmarks.bench_synth --dir synth/run1
+    python -m benchmarks.bench_synth --dir synth/run1 --postprocess-only --json synth_bench.json
+    python -m benchmarks.bench_synth --dir synth/mixed --postprocess-only --classify
+"""
+import argparse
+import json
+import time
+
+from benchmarks.common import postprocess_extractor, summarize
+from src.core import config as cfg_loader
+from src.utils.answer_store import parse_question_body
+from src.utils.image_ops import binarize, crop_by_ratio
+from src.utils.recording import load_frame, load_manifest
+from src.utils.screen_classifier import LABELS, QUESTION, ScreenClassifier, ScreenGate
+
+
+def _squash(text: str) -> str:
+    return "".join(text.split())
+
+
+def _truth_as_ocr(truth: dict, offset) -> list:
+    """把标注框平移到裁剪后坐标，作为 [(bbox, text)] 形式的 OCR 结果"""
+    left, top = offset
+    return [([[x - left, y - top] for x, y in box["bbox"]], box["text"]) for box in truth.get("boxes", [])]
+
+
+def _hit(ocr_results: list, offset, truth: dict) -> bool:
+    """按真实答案（无答案时取第一个选项）计算点击位置，判断是否落在对应按钮内"""
+    target = truth.get("answer") or 1
+    if target >= len(ocr_results):
+        return False
+    bbox = ocr_results[target][0]
+    # 与控制器的 calculate_click_position 相同：bbox 中心点 + 裁剪偏移
+    x = (bbox[0][0] + bbox[2][0]) // 2 + offset[0]
+    y = (bbox[0][1] + bbox[2][1]) // 2 + offset[1]
+    x1, y1, x2, y2 = truth["buttons"][target - 1]
+    return x1 <= x <= x2 and y1 <= y <= y2
+
+
+def run(directory: str, postprocess_only: bool = False, limit: int = None, config_path: str = None,
+        classify: bool = False) -> dict:
+    from src.extractors.ocr_extractor import QuestionExtractor
+
+    config = cfg_loader.load_config(config_path)
+    screenshot_cfg = config.get("screenshot", {})
+    crop_ratios = tuple(screenshot_cfg.get("crop_ratios", [0.0, 0.2, 1.0, 0.7]))
+    bw_threshold = screenshot_cfg.get("bw_threshold", 200)
+    if postprocess_only:
+        extractor = postprocess_extractor()
+    else:
+        extractor = QuestionExtractor(ocr_version=config.get("ocr", {}).get("ocr_version", "PP-OCRv4"))
+    classifier_cfg = config.get("screen_classifier", {})
+    gate = ScreenGate(ScreenClassifier.from_config(classifier_cfg) if classify else None,
+                      probe_every=int(classifier_cfg.get("probe_every", 20)))
+    confusion = {truth: {label: 0 for label in LABELS} for truth in LABELS}
+    classify_latencies = []
+
+    frames, _ = load_manifest(directory)
+    frames = frames[:limit] if limit else frames
+    latencies = []
+    question_ok = options_ok = count_ok = hits = questions = 0
+    for event in frames:
+        truth = event["truth"]
+        screen = truth.get("screen", QUESTION)
+        questions += screen == QUESTION
+        # 与 ADB / 回放控制器相同的裁剪与二值化
+        cropped, box = crop_by_ratio(load_frame(directory, event), crop_ratios)
+        screenshot = binarize(cropped, bw_threshold)
+        offset = box[:2]
+
+        start = time.perf_counter()
+        verdict = gate.check(screenshot)
+        classify_latencies.append(time.perf_counter() - start)
+        confusion[screen][verdict.label] += 1
+        if not verdict.ocr:
+            continue
+
+        start = time.perf_counter()
+        if postprocess_only:
+            question_body, ocr_results = extractor._postprocess(_truth_as_ocr(truth, offset))
+        else:
+            question_body, ocr_results = extractor.extract_question(screenshot)
+        latencies.append(time.perf_counter() - start)
+        gate.record_ocr(verdict, bool(ocr_results) and len(ocr_results) >= 2)
+        if screen != QUESTION:
+            continue
+
+        question, options = parse_question_body(question_body)
+        question_ok += _squash(question) == _squash(truth["question"])
+        options = [_squash(o) for o in options]
+        options_ok += options == [_squash(o) for o in truth["options"]]
+        count_ok += len(options) == len(truth["options"])
+        hits += _hit(ocr_results, offset, truth)
+
+    n = questions
+    wall = sum(latencies)
+    return {
+        **summarize(latencies),
+        "mode": "postprocess" if postprocess_only else "ocr",
+        "frames": len(frames),
+        "question_frames": questions,
+        "frames_per_s": round(len(latencies) / wall, 2) if wall > 0 else 0.0,
+        "question_accuracy": round(question_ok / n, 4) if n else 0.0,
+        "options_accuracy": round(options_ok / n, 4) if n else 0.0,
+        "option_count_accuracy": round(count_ok / n, 4) if n else 0.0,
+        "tap_hit_rate": round(hits / n, 4) if n else 0.0,
+        "classify": summarize(classify_latencies) if classify else None,
+        "screens": confusion,
+        # 不做画面分类时每个非答题帧都会浪费一次 OCR
+        "wasted_ocr_without_classifier": len(frames) - questions,
+        "gate": gate.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="合成画面 OCR 吞吐与准确率基准")
+    parser.add_argument("--dir", required=True, help="synth_screens 输出目录")
+    parser.add_argument("--postprocess-only", action="store_true", help="跳过 OCR，只测后处理")
+    parser.add_argument("--limit", type=int, help="最多处理的帧数")
+    parser.add_argument("--config", help="配置文件路径（读取裁剪比例与二值化阈值）")
+    parser.add_argument("--classify", action="store_true", help="OCR 之前先做画面分类，跳过非答题画面")
+    parser.add_argument("--json", help="将结果写入 JSON 文件，便于跨提交对比")
+    args = parser.parse_args()
+
+    result = run(args.dir, args.postprocess_only, args.limit, args.config, args.classify)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+基准脚本的公共统计工具
+"""
+import os
+import statistics
+from typing import Dict, List, Union
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """最近秩百分位数，values 为空时返回 0"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    """将秒为单位的延迟列表汇总为毫秒的 p50/p95/p99/均值"""
+    return {
+        "count": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2) if latencies else 0.0,
+    }
+
+
+def rss_mb(pid: Union[int, str] = "self") -> float:
+    """进程的常驻内存（MB），读取 /proc/<pid>/statm，不可用时返回 0"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return 0.0
+    return round(pages * os.sysconf("SC_PAGE_SIZE") / 1e6, 1)
+
+
+def postprocess_extractor():
+    """返回未初始化 PaddleOCR 的 QuestionExtractor，只用于调用后处理方法"""
+    from src.extractors.ocr_extractor import QuestionExtractor
+
+    extractor = QuestionExtractor.__new__(QuestionExtractor)
+    extractor.merge_threshold = 20
+    extractor.debug = False
+    return extractor
@@ -1,7 +1,14 @@
 """
 自动答题机器人主程序
 使用重构后的面向对象架构
+
+用法:
+    python main.py                                   # 连接设备答题
+    python main.py bench --replay DIR [--mock-llm]   # 回放录制的截图做离线基准
+    python main.py ocr-server [--address HOST:PORT]  # 本地 OCR 服务，供多个实例共享模型
 """
+import argparse
+
 from src.core import QuizBot
 
 
@@ -28,4 +35,20 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="自动答题机器人")
+    # 子命令的参数由各自模块解析，只在选中时导入，正常答题不依赖 benchmarks 包
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("bench", add_help=False, help="回放录制的截图做离线端到端基准（参数见 bench -h）")
+    subparsers.add_parser("ocr-server", add_help=False, help="本地 OCR 推理服务，多个实例共享一份模型（参数见 ocr-server -h）")
+
+    args, rest = parser.parse_known_args()
+    if args.command == "bench":
+        from benchmarks import bench_replay
+        bench_replay.main(rest)
+    elif args.command == "ocr-server":
+        from src.extractors import ocr_server
+        ocr_server.main(rest)
+    elif rest:
+        parser.error(f"无法识别的参数: {' '.join(rest)}")
+    else:
+        main()
@@ -1,7 +1,21 @@
 """
 安卓控制器模块
+
+各控制器在首次访问时才导入：BlueStacks 控制器依赖 win32，不应拖累 ADB 与回放路径。
+按配置选择实现时使用 `src.core.registry.controllers`。
 """
-from .bluestack_controller import AndroidController
-from .adb_controller import ADBController
+import importlib
+
+_LAZY = {
+    'AndroidController': '.bluestack_controller',
+    'ADBController': '.adb_controller',
+    'ReplayController': '.replay_controller',
+}
+
+__all__ = ['AndroidController', 'ADBController', 'ReplayController']
+
 
-__all__ = ['AndroidController', 'ADBController']
+def __getattr__(name):
+    if name in _LAZY:
+        return getattr(importlib.import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,13 +2,27 @@
 ADB控制器模块
 通过adb命令控制安卓设备截图和点击
 """
+import asyncio
+import io
+import struct
 import subprocess
 import tempfile
+import threading
 import os
 from typing import Tuple, Optional
 from PIL import Image
 from src.core.base import AndroidControllerBase
 from src.utils.adb_helper import ADBHelper
+from src.utils.image_ops import binarize, binarize_into, crop_by_ratio, ratio_box
+from src.utils.log import get_logger
+from src.utils.recording import SessionRecorder
+
+logger = get_logger(__name__)
+
+# `screencap` 不带 -p 时输出的头部：宽、高、像素格式（Android 9 起另有 4 字节色彩空间）
+RAW_HEADER = struct.Struct("<III")
+# RGBA_8888 与 RGBX_8888，每像素 4 字节
+RAW_FORMATS = (1, 2)
 
 class ADBController(AndroidControllerBase):
     """通过adb控制安卓设备截图和点击"""
@@ -28,6 +42,9 @@ class ADBController(AndroidControllerBase):
         screenshot_cfg = config.get("screenshot", {})
         self.crop_ratios = tuple(screenshot_cfg.get("crop_ratios", [0.0, 0.2, 1.0, 0.7]))
         self.bw_threshold = screenshot_cfg.get("bw_threshold", 200)
+        self.bw_invert = False
+        # capture_raw 经设备上同一个临时文件中转；流水线的截图阶段与后台的作答结果检测可能同时截图
+        self._capture_lock = threading.Lock()
         
         # 如果启用自动设置
         if auto_setup:
@@ -43,6 +60,23 @@ class ADBController(AndroidControllerBase):
             self.adb_path = adb_path
             self.device_id = device_id
 
+        # 录制模式：截图与点击写入回放目录，供 ReplayController 离线回放
+        adb_cfg = config.get("adb", {})
+        self.recorder: Optional[SessionRecorder] = None
+        if adb_cfg.get("record_dir"):
+            self.start_recording(adb_cfg["record_dir"], adb_cfg.get("record_format", "png"))
+
+    def start_recording(self, directory: str, frame_format: str = "png"):
+        """开始录制原始截图与点击"""
+        self.stop_recording()
+        self.recorder = SessionRecorder(directory, frame_format)
+        logger.info("录制截图到 %s（%s）", directory, frame_format)
+
+    def stop_recording(self):
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
     def _adb_cmd(self, args):
         cmd = [self.adb_path]
         if self.device_id:
@@ -51,9 +85,23 @@ class ADBController(AndroidControllerBase):
         result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
         return result
 
-    def get_screenshot(self, save_debug: bool = False) -> Tuple[Image.Image, Tuple[int, int, int, int]]:
-        """通过adb截图并返回PIL图像和坐标"""
-        with tempfile.TemporaryDirectory() as tmpdir:
+    async def _adb_cmd_async(self, args) -> bytes:
+        """以 asyncio 子进程执行 adb 命令，返回标准输出"""
+        cmd = [self.adb_path]
+        if self.device_id:
+            cmd += ["-s", self.device_id]
+        cmd += args
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await proc.communicate()
+        if proc.returncode != 0:
+            raise RuntimeError(f"adb 命令失败 {args}: {stderr.decode(errors='ignore').strip()}")
+        return stdout
+
+    def capture_raw(self) -> Image.Image:
+        """通过adb截取原始全屏图像（未裁剪、未二值化）"""
+        with tempfile.TemporaryDirectory() as tmpdir, self._capture_lock:
             remote_path = "/sdcard/screen.png"
             local_path = os.path.join(tmpdir, "screen.png")
             # 截图
@@ -62,29 +110,109 @@ class ADBController(AndroidControllerBase):
             self._adb_cmd(["pull", remote_path, local_path])
             # 删除远程文件
             self._adb_cmd(["shell", "rm", remote_path])
-            # 打开图片
+            # 打开图片，临时目录删除前完成解码
             img = Image.open(local_path)
-            width, height = img.width, img.height
-            # 按比例裁剪
-            left_ratio, top_ratio, right_ratio, bottom_ratio = self.crop_ratios
-            left = int(left_ratio * width)
-            top = int(top_ratio * height)
-            right = int(right_ratio * width)
-            bottom = int(bottom_ratio * height)
-            cropped_img = img.crop((left, top, right, bottom))
-            # 二值化
-            gray_img = cropped_img.convert("L")
-            binary_img = gray_img.point(lambda x: 255 if x > self.bw_threshold else 0, mode='1')
-            final_img = binary_img.convert("RGB")
-            print(f"{save_debug=}")
-            if save_debug:
-                final_img.save("adb_final_img.jpg")
-            # 返回裁剪区域的绝对坐标
-            return final_img, (left, top, right, bottom)
+            img.load()
+        if self.recorder is not None:
+            self.recorder.frame(img)
+        return img
+
+    def preprocess(self, raw: Image.Image, save_debug: bool = False) -> Tuple[Image.Image, Tuple[int, int, int, int]]:
+        """按比例裁剪并二值化原始截图，返回处理后的图像和裁剪区域坐标"""
+        # 按比例裁剪
+        cropped_img, (left, top, right, bottom) = crop_by_ratio(raw, self.crop_ratios)
+        # 二值化
+        final_img = binarize(cropped_img, self.bw_threshold, self.bw_invert)
+        if save_debug:
+            final_img.save("adb_final_img.jpg")
+        # 返回裁剪区域的绝对坐标
+        return final_img, (left, top, right, bottom)
+
+    def capture_frame(self, pool):
+        """
+        通过 `adb exec-out screencap` 读取未压缩的 RGBA 像素，直接 readinto 到缓冲池数组中
+
+        省去设备端 PNG 编码、文件拉取与本地解码，也没有整帧大小的中间 bytes 对象。
+
+        Returns:
+            (高, 宽, 4) 的 RGBA 数组（缓冲池数组的视图），由调用方归还
+        """
+        import numpy as np
+
+        cmd = [self.adb_path] + (["-s", self.device_id] if self.device_id else []) + ["exec-out", "screencap"]
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        buf = None
+        try:
+            header = proc.stdout.read(RAW_HEADER.size)
+            if len(header) < RAW_HEADER.size:
+                raise RuntimeError(f"adb screencap 没有输出: {proc.stderr.read().decode(errors='ignore').strip()}")
+            width, height, pixel_format = RAW_HEADER.unpack(header)
+            if pixel_format not in RAW_FORMATS:
+                raise RuntimeError(f"不支持的 screencap 像素格式: {pixel_format}")
+            size = width * height * 4
+            buf = pool.acquire((size + 4,), np.uint8)
+            view = memoryview(buf)
+            n = 0
+            while n < len(view):
+                read = proc.stdout.readinto(view[n:])
+                if not read:
+                    break
+                n += read
+            # 新版本的头部多出 4 字节色彩空间，位于像素数据之前
+            extra = n - size
+            if extra not in (0, 4):
+                raise RuntimeError(f"screencap 数据长度不符: {n} 字节，应为 {size}")
+            frame = buf[extra:extra + size].reshape(height, width, 4)
+        except BaseException:
+            if buf is not None:
+                pool.release(buf)
+            proc.kill()
+            raise
+        finally:
+            proc.stdout.close()
+            proc.stderr.close()
+            proc.wait()
+        if self.recorder is not None:
+            self.recorder.frame(Image.fromarray(frame))
+        return frame
+
+    def preprocess_frame(self, frame, pool, save_debug: bool = False):
+        """preprocess 的缓冲池版本，结果与 preprocess 逐字节相同"""
+        box = ratio_box((frame.shape[1], frame.shape[0]), self.crop_ratios)
+        final = binarize_into(frame, box, self.bw_threshold, self.bw_invert, pool)
+        if save_debug:
+            Image.fromarray(final).save("adb_final_img.jpg")
+        return final, box
+
+    def get_screenshot(self, save_debug: bool = False) -> Tuple[Image.Image, Tuple[int, int, int, int]]:
+        """通过adb截图并返回PIL图像和坐标"""
+        return self.preprocess(self.capture_raw(), save_debug=save_debug)
+
+    async def capture_raw_async(self) -> Image.Image:
+        """通过 `adb exec-out screencap -p` 直接读取 PNG 数据，无需设备与本地临时文件"""
+        png = await self._adb_cmd_async(["exec-out", "screencap", "-p"])
+        img = Image.open(io.BytesIO(png))
+        img.load()
+        if self.recorder is not None:
+            self.recorder.frame(img)
+        return img
+
+    async def get_screenshot_async(self, save_debug: bool = False) -> Tuple[Image.Image, Tuple[int, int, int, int]]:
+        """异步截图；裁剪与二值化在线程池中执行，不阻塞事件循环"""
+        raw = await self.capture_raw_async()
+        return await asyncio.to_thread(self.preprocess, raw, save_debug)
 
     def click(self, x: int, y: int):
         """通过adb模拟点击"""
         self._adb_cmd(["shell", "input", "tap", str(x), str(y)])
+        if self.recorder is not None:
+            self.recorder.tap(x, y)
+
+    async def click_async(self, x: int, y: int):
+        """通过 asyncio 子进程模拟点击"""
+        await self._adb_cmd_async(["shell", "input", "tap", str(x), str(y)])
+        if self.recorder is not None:
+            self.recorder.tap(x, y)
 
     def calculate_click_position(self, bbox: list, offset: Tuple[int, int]) -> Tuple[int, int]:
         """计算点击位置（OCR bbox中心点 + 裁剪偏移）"""
@@ -97,3 +225,6 @@ class ADBController(AndroidControllerBase):
 
     def set_bw_threshold(self, threshold: int):
         self.bw_threshold = threshold
+
+    def set_bw_invert(self, invert: bool):
+        self.bw_invert = invert
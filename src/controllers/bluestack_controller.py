@@ -9,19 +9,20 @@ import win32gui
 import win32ui
 import win32con
 import ctypes
-from typing import Tuple
+from typing import Optional, Tuple
 from src.core.base import AndroidControllerBase
 from src.core import config as cfg_loader
+from src.utils.image_ops import binarize, crop_by_ratio
 
 
 class AndroidController(AndroidControllerBase):
     """安卓模拟器控制器 - 负责截图和模拟点击"""
     
-    def __init__(self, window_title: str = "BlueStacks App Player"):
+    def __init__(self, window_title: str = "BlueStacks App Player", config: Optional[dict] = None):
         """初始化控制器
 
-        支持通过全局配置覆盖默认截图和二值化设置。如果在 `config.yaml` 中设置
-        `screenshot` 字段，本类会自动读取并使用。
+        支持通过全局配置覆盖默认截图和二值化设置。未传入 config 时读取
+        `config.yaml`（已缓存，不会重复解析）中的 `screenshot` 字段。
         """
         self.window_title = window_title
         self.dpi_scale = 1.0
@@ -30,10 +31,12 @@ class AndroidController(AndroidControllerBase):
         self._set_dpi_awareness()
 
         # 尝试从配置读取截图参数
-        cfg = cfg_loader.load_config()
-        screenshot_cfg = cfg.get("screenshot", {})
+        if config is None:
+            config = cfg_loader.load_config()
+        screenshot_cfg = config.get("screenshot", {})
         self.crop_ratios = tuple(screenshot_cfg.get("crop_ratios", [0.0, 0.2, 1.0, 0.7]))
         self.bw_threshold = screenshot_cfg.get("bw_threshold", 200)
+        self.bw_invert = False
     
     def _set_dpi_awareness(self):
         """设置DPI感知"""
@@ -155,16 +158,7 @@ class AndroidController(AndroidControllerBase):
         Returns:
             (裁剪后的图像, (左, 上, 右, 下)相对坐标)
         """
-        left_ratio, top_ratio, right_ratio, bottom_ratio = crop_ratios
-        
-        width, height = img.width, img.height
-        left = int(left_ratio * width)
-        top = int(top_ratio * height)
-        right = int(right_ratio * width)
-        bottom = int(bottom_ratio * height)
-        
-        cropped_img = img.crop((left, top, right, bottom))
-        return cropped_img, (left, top, right, bottom)
+        return crop_by_ratio(img, crop_ratios)
     
     def _convert_to_black_and_white(self, img: Image.Image, threshold: int = None) -> Image.Image:
         """
@@ -180,12 +174,7 @@ class AndroidController(AndroidControllerBase):
         if threshold is None:
             threshold = self.bw_threshold
             
-        # 转换为灰度图像
-        gray_img = img.convert("L")
-        
-        # 二值化处理
-        binary_img = gray_img.point(lambda x: 255 if x > threshold else 0, mode='1')
-        return binary_img.convert("RGB")
+        return binarize(img, threshold, self.bw_invert)
     
     def get_screenshot(self, save_debug: bool = False) -> Tuple[Image.Image, Tuple[int, int, int, int]]:
         """
@@ -283,3 +272,7 @@ class AndroidController(AndroidControllerBase):
     def set_bw_threshold(self, threshold: int):
         """设置二值化阈值"""
         self.bw_threshold = threshold
+
+    def set_bw_invert(self, invert: bool):
+        """设置二值化后是否反色"""
+        self.bw_invert = invert
@@ -0,0 +1,128 @@
+"""
+回放控制器模块
+从录制目录按原始节奏回放截图，点击只记录不发送，用于无设备的离线基准
+录制目录格式见 src/utils/recording.py
+"""
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from PIL import Image
+
+from src.core.base import AndroidControllerBase
+from src.utils.image_ops import binarize, binarize_into, crop_by_ratio, ratio_box
+from src.utils.log import get_logger
+from src.utils.recording import load_frame, load_frame_into, load_manifest
+
+logger = get_logger(__name__)
+
+
+class ReplayFinished(Exception):
+    """录制的帧已全部回放"""
+
+
+class ReplayController(AndroidControllerBase):
+    """回放控制器 - 依次返回录制的截图，点击写入日志"""
+
+    def __init__(self, directory: str, config: dict = None, timing: str = "realtime",
+                 speed: float = 1.0, loop: bool = False):
+        """
+        Args:
+            directory: 录制目录
+            config: 配置字典，读取 screenshot 的裁剪比例与二值化阈值
+            timing: "realtime" 按录制时间戳节奏返回帧；"step" 每次截图立即返回下一帧
+            speed: realtime 模式的回放倍速
+            loop: 回放结束后是否从头开始，否则抛出 ReplayFinished
+        """
+        if config is None:
+            config = {}
+        screenshot_cfg = config.get("screenshot", {})
+        self.crop_ratios = tuple(screenshot_cfg.get("crop_ratios", [0.0, 0.2, 1.0, 0.7]))
+        self.bw_threshold = screenshot_cfg.get("bw_threshold", 200)
+        self.bw_invert = False
+
+        if timing not in ("realtime", "step"):
+            raise ValueError(f"未知的回放节奏: {timing}")
+        self.directory = directory
+        self.timing = timing
+        self.speed = speed
+        self.loop = loop
+        self.frames, self.recorded_taps = load_manifest(directory)
+        if not self.frames:
+            raise ValueError(f"录制目录中没有帧: {directory}")
+        self.taps: List[Tuple[float, int, int]] = []   # 回放期间的点击 (时间, x, y)
+        self._index = 0
+        self._start: Optional[float] = None
+        # 截图阶段与后台的作答结果检测可能同时取帧
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def _next_event(self) -> dict:
+        """取下一帧事件；realtime 模式下早于录制时间戳时等待"""
+        wait = 0.0
+        with self._lock:
+            if self._index >= len(self.frames):
+                if not self.loop:
+                    raise ReplayFinished(f"已回放全部 {len(self.frames)} 帧")
+                self._index = 0
+                self._start = None
+            event = self.frames[self._index]
+            self._index += 1
+
+            if self.timing == "realtime":
+                now = time.monotonic()
+                if self._start is None:
+                    self._start = now - event["t"] / self.speed
+                wait = self._start + event["t"] / self.speed - now
+        if wait > 0:
+            time.sleep(wait)
+        return event
+
+    def capture_raw(self) -> Image.Image:
+        """返回下一帧原始截图"""
+        return load_frame(self.directory, self._next_event())
+
+    def capture_frame(self, pool):
+        """下一帧读入缓冲池数组；raw 格式的录制无需任何中间缓冲区"""
+        return load_frame_into(self.directory, self._next_event(), pool)
+
+    def preprocess(self, raw: Image.Image, save_debug: bool = False) -> Tuple[Image.Image, Tuple[int, int, int, int]]:
+        """与 ADBController 相同的裁剪与二值化"""
+        cropped_img, box = crop_by_ratio(raw, self.crop_ratios)
+        final_img = binarize(cropped_img, self.bw_threshold, self.bw_invert)
+        if save_debug:
+            final_img.save("replay_final_img.jpg")
+        return final_img, box
+
+    def preprocess_frame(self, frame, pool, save_debug: bool = False):
+        """preprocess 的缓冲池版本，结果与 preprocess 逐字节相同"""
+        box = ratio_box((frame.shape[1], frame.shape[0]), self.crop_ratios)
+        final = binarize_into(frame, box, self.bw_threshold, self.bw_invert, pool)
+        if save_debug:
+            Image.fromarray(final).save("replay_final_img.jpg")
+        return final, box
+
+    def get_screenshot(self, save_debug: bool = False) -> Tuple[Image.Image, Tuple[int, int, int, int]]:
+        return self.preprocess(self.capture_raw(), save_debug=save_debug)
+
+    def click(self, x: int, y: int):
+        """只记录点击，不发送到任何设备"""
+        self.taps.append((time.monotonic(), int(x), int(y)))
+        logger.debug("[回放] 点击 (%d, %d)", x, y)
+
+    def calculate_click_position(self, bbox: list, offset: Tuple[int, int]) -> Tuple[int, int]:
+        """计算点击位置（OCR bbox中心点 + 裁剪偏移）"""
+        x = (bbox[0][0] + bbox[2][0]) // 2 + offset[0]
+        y = (bbox[0][1] + bbox[2][1]) // 2 + offset[1]
+        return int(x), int(y)
+
+    def set_crop_ratios(self, left: float, top: float, right: float, bottom: float):
+        self.crop_ratios = (left, top, right, bottom)
+
+    def set_bw_threshold(self, threshold: int):
+        self.bw_threshold = threshold
+
+    def set_bw_invert(self, invert: bool):
+        self.bw_invert = invert
@@ -2,11 +2,19 @@
 核心模块 - 包含基类和主应用类
 """
 from .base import QuestionExtractorBase, AnswerGeneratorBase, AndroidControllerBase
-from .quiz_bot import QuizBot
 
 __all__ = [
     'QuestionExtractorBase',
-    'AnswerGeneratorBase', 
+    'AnswerGeneratorBase',
     'AndroidControllerBase',
     'QuizBot'
 ]
+
+
+def __getattr__(name):
+    # QuizBot 依赖所有具体实现（PaddleOCR、win32 等），只在用到时导入，
+    # 使得 `src.core.base` 可以被各实现模块单独导入
+    if name == 'QuizBot':
+        from .quiz_bot import QuizBot
+        return QuizBot
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,161 @@
+"""
+asyncio 答题运行器
+单个事件循环驱动多个设备会话：ADB 使用异步子进程，LLM 使用 AsyncOpenAI，
+OCR 放入共享线程池执行
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from src.core.base import AndroidControllerBase, AnswerGeneratorBase, QuestionExtractorBase
+from src.generators.call_policy import DeadlineExceeded
+from src.utils import metrics
+from src.utils.log import fields, get_logger, timing_fields
+from src.utils.screen_classifier import ScreenGate
+
+logger = get_logger(__name__)
+
+
+class AsyncSession:
+    """一个设备会话：独立的控制器，与其他会话共享提取器和生成器"""
+
+    def __init__(self, name: str, controller: AndroidControllerBase,
+                 extractor: QuestionExtractorBase, generator: AnswerGeneratorBase,
+                 click_delay: float = 1.5, debug_mode: bool = False,
+                 screen_gate: Optional[ScreenGate] = None, outcome_detector=None, roi_calibrator=None,
+                 threshold_calibrator=None):
+        self.name = name
+        self.controller = controller
+        self.extractor = extractor
+        self.generator = generator
+        self.click_delay = click_delay
+        self.debug_mode = debug_mode
+        self.screen_gate = screen_gate or ScreenGate()
+        self.outcome_detector = outcome_detector      # OutcomeDetector，None 表示不检测作答结果
+        self.roi_calibrator = roi_calibrator          # RoiCalibrator，None 表示使用固定裁剪比例
+        self.threshold_calibrator = threshold_calibrator  # ThresholdCalibrator，None 表示使用固定阈值
+        self.question_count = 0
+        self.success_count = 0
+
+    async def process_one_question(self, ocr_executor: ThreadPoolExecutor) -> bool:
+        """异步处理一道题目，流程与 QuizBot.process_one_question 相同"""
+        loop = asyncio.get_running_loop()
+        timings = {}
+        roi = None
+        with metrics.timer("capture", into=timings):
+            if self.roi_calibrator is not None or self.threshold_calibrator is not None:
+                raw = await self.controller.capture_raw_async()
+                if self.roi_calibrator is not None:
+                    roi = await asyncio.to_thread(self.roi_calibrator.prepare, raw)
+                screenshot, box = await asyncio.to_thread(self.controller.preprocess, raw, self.debug_mode)
+                abs_left, abs_top = box[:2]
+                if self.threshold_calibrator is not None:
+                    await asyncio.to_thread(self.threshold_calibrator.observe, raw, box)
+            else:
+                screenshot, (abs_left, abs_top, _, _) = await self.controller.get_screenshot_async(
+                    save_debug=self.debug_mode
+                )
+        with metrics.timer("classify", into=timings):
+            screen = self.screen_gate.check(screenshot)
+        if not screen.ocr:
+            logger.debug("[%s] 跳过非答题画面", self.name, extra=screen.log_fields())
+            return False
+        with metrics.timer("ocr", into=timings):
+            question_body, ocr_results = await loop.run_in_executor(
+                ocr_executor, self.extractor.extract_question, screenshot
+            )
+        self.screen_gate.record_ocr(screen, bool(ocr_results) and len(ocr_results) >= 2)
+        if self.roi_calibrator is not None:
+            self.roi_calibrator.feedback(roi, ocr_results, screenshot.size)
+        if self.threshold_calibrator is not None:
+            self.threshold_calibrator.record_ocr(bool(ocr_results) and len(ocr_results) >= 2)
+        if not ocr_results or len(ocr_results) < 2:
+            logger.info("[%s] 未识别到有效题目和选项", self.name)
+            return False
+
+        try:
+            with metrics.timer("llm", into=timings):
+                answer_text = await self.generator.get_answer_async(question_body)
+        except DeadlineExceeded as e:
+            logger.warning("[%s] LLM 未在截止时间内给出答案: %s", self.name, e)
+            return False
+        option_number = self.generator.extract_option_number(answer_text)
+        logger.debug("[%s] LLM答案: %s -> 选项 %d", self.name, answer_text, option_number)
+        if option_number < 1 or option_number >= len(ocr_results):
+            logger.warning("[%s] 选项编号 %d 超出范围", self.name, option_number)
+            return False
+
+        click_x, click_y = self.controller.calculate_click_position(
+            ocr_results[option_number][0], (abs_left, abs_top)
+        )
+        with metrics.timer("tap", into=timings):
+            await self.controller.click_async(click_x, click_y)
+        logger.info("[%s] 作答: 选项 %d", self.name, option_number,
+                    extra=fields(session=self.name, option=option_number, x=click_x, y=click_y,
+                                 **timing_fields(timings)))
+        waited = 0.0
+        if self.outcome_detector is not None:
+            # 截图比对在默认线程池中执行，不占用 OCR 线程，耗时计入等待时间
+            check_started = loop.time()
+            await loop.run_in_executor(
+                None, self.outcome_detector.verify, self.controller, self.generator,
+                question_body, ocr_results, option_number, (abs_left, abs_top)
+            )
+            waited = loop.time() - check_started
+        await asyncio.sleep(max(0.0, self.click_delay - waited))
+        return True
+
+    async def run(self, ocr_executor: ThreadPoolExecutor, max_questions: Optional[int] = None):
+        while max_questions is None or self.question_count < max_questions:
+            self.question_count += 1
+            try:
+                if await self.process_one_question(ocr_executor):
+                    self.success_count += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("[%s] 处理题目时出错: %s", self.name, e)
+
+
+class AsyncQuizRunner:
+    """asyncio 运行器 - 一个事件循环驱动任意数量的会话"""
+
+    def __init__(self, sessions: List[AsyncSession], ocr_workers: int = 1):
+        """
+        Args:
+            sessions: 会话列表
+            ocr_workers: OCR 线程数；PaddleOCR 实例不是线程安全的，共享一个实例时保持 1
+        """
+        self.sessions = sessions
+        self.ocr_workers = ocr_workers
+
+    async def run_async(self, max_questions: Optional[int] = None):
+        """并发运行所有会话，每个会话最多处理 max_questions 道题"""
+        with ThreadPoolExecutor(max_workers=self.ocr_workers, thread_name_prefix="ocr") as ocr_executor:
+            try:
+                await asyncio.gather(*(s.run(ocr_executor, max_questions) for s in self.sessions))
+            finally:
+                generators = {id(s.generator): s.generator for s in self.sessions}
+                for generator in generators.values():
+                    # 先取统计再关闭：答案库关闭后无法再统计记录数
+                    for endpoint, stats in generator.get_stats().items():
+                        logger.info("LLM 端点 %s: %s", endpoint, stats)
+                    await generator.aclose()
+
+    def run(self, max_questions: Optional[int] = None):
+        logger.info("答题机器人启动（asyncio 模式，%d 个会话）", len(self.sessions))
+        try:
+            asyncio.run(self.run_async(max_questions))
+        except KeyboardInterrupt:
+            logger.info("用户中断")
+        finally:
+            for s in self.sessions:
+                logger.info("[%s] 共处理 %d 题,成功 %d 题", s.name, s.question_count, s.success_count)
+            gates = {id(s.screen_gate): s.screen_gate for s in self.sessions}
+            for gate in gates.values():
+                logger.info("画面分类", extra=fields(**gate.stats()))
+            for s in self.sessions:
+                if s.roi_calibrator is not None:
+                    logger.info("[%s] 答题区域", s.name, extra=fields(**s.roi_calibrator.stats()))
+                if s.threshold_calibrator is not None:
+                    logger.info("[%s] 二值化阈值", s.name, extra=fields(**s.threshold_calibrator.stats()))
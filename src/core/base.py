@@ -1,6 +1,14 @@
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
-from typing import Tuple, List
-from PIL.Image import Image
+from typing import Callable, Tuple, List, Optional, TYPE_CHECKING
+
+# asyncio 与 PIL 导入较慢，只在用到时导入，同步的 ADB 路径无需为此付出启动时间
+if TYPE_CHECKING:
+    import numpy as np
+    from PIL.Image import Image
+
+    from src.generators.call_policy import Deadline
 
 
 class QuestionExtractorBase(ABC):
@@ -8,7 +16,10 @@ class QuestionExtractorBase(ABC):
 
     @abstractmethod
     def extract_question(self, image: Image) -> Tuple[str, List]:
-        """从图像中提取题目并返回格式化文本和OCR结果"""
+        """从图像中提取题目并返回格式化文本和OCR结果
+
+        image 也可能是控制器 `preprocess_frame` 返回的 (高, 宽, 3) uint8 数组。
+        """
         raise NotImplementedError()
 
     @abstractmethod
@@ -16,6 +27,14 @@ class QuestionExtractorBase(ABC):
         """设置文本框合并阈值"""
         raise NotImplementedError()
 
+    def extract_question_streaming(self, image: Image,
+                                   on_question: Callable[[str], None]) -> Tuple[str, List]:
+        """可选：题干识别完成后立即回调 on_question(题干)，再继续识别选项
+
+        默认实现不支持分段识别，直接整体识别且不回调。
+        """
+        return self.extract_question(image)
+
 
 class AnswerGeneratorBase(ABC):
     """抽象基类：答案生成器（LLM）"""
@@ -30,6 +49,22 @@ class AnswerGeneratorBase(ABC):
         """从LLM返回文本中提取选项编号"""
         raise NotImplementedError()
 
+    async def get_answer_async(self, question_body: str) -> str:
+        """get_answer 的异步版本，默认在线程池中执行同步实现"""
+        import asyncio
+        return await asyncio.to_thread(self.get_answer, question_body)
+
+    def get_answers(self, question_bodies: List[str], deadline: Optional[Deadline] = None) -> List[Optional[str]]:
+        """可选：在一次请求中回答多道题，按顺序返回各题的答案文本，未答出的题为 None
+
+        deadline 为整批共享的截止时间，实现后可以由 AnswerBroker 合并多个会话的请求。
+        """
+        raise NotImplementedError()
+
+    def prefetch(self, question: str):
+        """可选：题干已识别、选项尚未识别时调用，用于提前查缓存或预热连接"""
+        pass
+
     def set_model(self, model: str):
         """可选：更换模型实现"""
         raise NotImplementedError()
@@ -38,6 +73,26 @@ class AnswerGeneratorBase(ABC):
         """可选：设置系统提示词"""
         raise NotImplementedError()
 
+    def record_outcome(self, question_body: str, correct_option: int):
+        """可选：反馈某道题已确认的正确选项，供实现学习或缓存"""
+        pass
+
+    def record_incorrect(self, question_body: str, wrong_option: int):
+        """可选：反馈某道题所选选项已确认错误（正确选项未知）"""
+        pass
+
+    def get_stats(self) -> dict:
+        """可选：返回调用统计（如各端点成功率、延迟）"""
+        return {}
+
+    def close(self):
+        """可选：释放连接等资源"""
+        pass
+
+    async def aclose(self):
+        """close 的异步版本，用于释放异步客户端"""
+        self.close()
+
 
 class AndroidControllerBase(ABC):
     """抽象基类：安卓/模拟器控制器"""
@@ -52,11 +107,50 @@ class AndroidControllerBase(ABC):
         """在屏幕上模拟一次点击"""
         raise NotImplementedError()
 
+    async def get_screenshot_async(self, save_debug: bool = False) -> Tuple[Image, Tuple[int, int, int, int]]:
+        """get_screenshot 的异步版本，默认在线程池中执行同步实现"""
+        import asyncio
+        return await asyncio.to_thread(self.get_screenshot, save_debug)
+
+    async def click_async(self, x: int, y: int):
+        """click 的异步版本，默认在线程池中执行同步实现"""
+        import asyncio
+        await asyncio.to_thread(self.click, x, y)
+
     @abstractmethod
     def calculate_click_position(self, bbox: list, offset: Tuple[int, int]) -> Tuple[int, int]:
         """根据OCR bbox 和偏移量计算点击坐标"""
         raise NotImplementedError()
 
+    def capture_raw(self) -> Image:
+        """可选：只截取原始画面，不做裁剪和二值化
+
+        与 `preprocess` 一起实现后，流水线运行器可以把截图与预处理拆成两个阶段。
+        """
+        raise NotImplementedError()
+
+    async def capture_raw_async(self) -> Image:
+        """capture_raw 的异步版本，默认在线程池中执行同步实现"""
+        import asyncio
+        return await asyncio.to_thread(self.capture_raw)
+
+    def preprocess(self, raw: Image, save_debug: bool = False) -> Tuple[Image, Tuple[int, int, int, int]]:
+        """可选：裁剪并二值化 `capture_raw` 的结果，返回值与 `get_screenshot` 相同"""
+        raise NotImplementedError()
+
+    def capture_frame(self, pool) -> np.ndarray:
+        """可选：把原始画面直接写入缓冲池借出的 (高, 宽, 3 或 4) uint8 数组
+
+        与 `preprocess_frame` 一起实现后，截图与预处理不再为每帧分配新的整帧缓冲区。
+        返回的数组（或其视图）由调用方用 `pool.release` 归还。
+        """
+        raise NotImplementedError()
+
+    def preprocess_frame(self, frame: np.ndarray, pool,
+                         save_debug: bool = False) -> Tuple[np.ndarray, Tuple[int, int, int, int]]:
+        """可选：`preprocess` 的缓冲池版本，返回二值化后的 (高, 宽, 3) 数组与裁剪区域，数组由调用方归还"""
+        raise NotImplementedError()
+
     def set_crop_ratios(self, left: float, top: float, right: float, bottom: float):
         """可选：设置截图裁剪比例"""
         raise NotImplementedError()
@@ -64,3 +158,7 @@ class AndroidControllerBase(ABC):
     def set_bw_threshold(self, threshold: int):
         """可选：设置二值化阈值"""
         raise NotImplementedError()
+
+    def set_bw_invert(self, invert: bool):
+        """可选：设置二值化后是否反色（深色主题下使输出仍为白底黑字）"""
+        raise NotImplementedError()
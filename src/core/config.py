@@ -1,48 +1,251 @@
 """
 配置加载模块
 支持从 `config.yaml` 加载配置并提供默认值
+
+配置加载后是只读的 `FrozenConfig`，按文件路径缓存，文件修改时间不变时直接复用，
+重复调用 `load_config` / `get` 不会再次解析 YAML。`ConfigWatcher` 在后台轮询
+文件变化，重新加载后回调，用于热更新 `Tunables` 中的可调参数。
 """
 import os
-from typing import Any, Dict, Optional
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple
 
 import yaml
 
+from src.utils.log import get_logger
+
+logger = get_logger(__name__)
+
 
 DEFAULT_CONFIG = {
     "controller": {"type": "adb"},
-    "adb": {"adb_path": "adb", "device_id": None},
+    "adb": {"adb_path": "adb", "device_id": None, "record_dir": None, "record_format": "png"},
+    "replay": {"path": None, "timing": "realtime", "speed": 1.0, "loop": False},
     "screenshot": {"crop_ratios": [0.0, 0.2, 1.0, 0.7], "bw_threshold": 200},
-    "llm": {"model": "gpt-4o", "api_key": None, "base_url": None},
-    "app": {"window_title": "BlueStacks App Player", "click_delay": 1.5, "debug_mode": False},
+    "ocr": {"backend": "paddleocr", "ocr_version": "PP-OCRv4",
+            "server": {"address": "127.0.0.1:8866", "timeout": 10.0, "max_batch": 8, "max_wait_ms": 5.0}},
+    "llm": {"backend": "openai", "model": "gpt-4o", "api_key": None, "base_url": None, "http": {},
+            "fallback_model": None, "policy": {}, "ensemble": {"enabled": False},
+            "broker": {"enabled": False}},
+    "answer_store": {"path": None, "bank": None},
+    "app": {"window_title": "BlueStacks App Player", "click_delay": 1.5, "debug_mode": False,
+            "speculative": False, "runner": "sequential", "pipeline_queue_size": 1,
+            "hot_reload": False, "hot_reload_interval": 1.0},
+    "logging": {"level": "INFO", "format": "text", "file": None, "queue_size": 10000},
+    "screen_classifier": {"enabled": False, "probe_every": 20},
+    "outcome": {"enabled": False},
+    "roi_calibration": {"enabled": False, "cache_path": "roi_cache.json"},
+    "threshold_calibration": {"enabled": False, "cache_path": "threshold_cache.json"},
+    "frame_pool": {"enabled": False, "max_per_shape": 4},
+    "metrics": {"enabled": False, "window": 60, "jsonl_path": "metrics.jsonl", "interval": 10,
+                "prometheus_port": None},
 }
 
 
-def load_config(path: Optional[str] = None) -> Dict[str, Any]:
-    """加载 YAML 配置文件，返回一个配置字典
+def _freeze(value: Any) -> Any:
+    if isinstance(value, Mapping) and not isinstance(value, FrozenConfig):
+        return FrozenConfig(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
 
-    Args:
-        path: 配置文件路径，未提供时使用仓库根目录下的 `config.yaml`
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+def _deep_merge(base: Mapping, override: Mapping) -> dict:
+    """返回 base 与 override 递归合并后的新字典，不修改两个输入"""
+    merged = _thaw(base)
+    for k, v in override.items():
+        if isinstance(v, Mapping) and isinstance(merged.get(k), dict):
+            merged[k] = _deep_merge(merged[k], v)
+        else:
+            merged[k] = _thaw(v)
+    return merged
+
+
+class FrozenConfig(Mapping):
+    """只读配置
+
+    行为与字典相同（`get`、`[]`、`in`、`**` 展开），嵌套字典同样只读，列表转为元组；
+    也支持属性访问，如 `config.screenshot.bw_threshold`。需要修改时用 `to_dict()`
+    取得可变副本，或用 `merged()` 生成覆盖后的新配置。
     """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Mapping = None):
+        object.__setattr__(self, "_data", {k: _freeze(v) for k, v in (data or {}).items()})
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._data[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name: str, value: Any):
+        raise TypeError("配置只读，请使用 to_dict() 或 merged() 生成新配置")
+
+    def __delattr__(self, name: str):
+        raise TypeError("配置只读")
+
+    def __reduce__(self):
+        return FrozenConfig, (self.to_dict(),)
+
+    def __repr__(self) -> str:
+        return f"FrozenConfig({self.to_dict()!r})"
+
+    def to_dict(self) -> dict:
+        """可变的深拷贝"""
+        return _thaw(self)
+
+    def merged(self, overrides: Mapping) -> "FrozenConfig":
+        """递归合并 overrides 后的新配置"""
+        return FrozenConfig(_deep_merge(self, overrides))
+
+
+@dataclass(frozen=True)
+class Tunables:
+    """运行中可以热更新、无需重启（重新加载 PaddleOCR）的参数"""
+
+    bw_threshold: int
+    crop_ratios: Tuple[float, float, float, float]
+    click_delay: float
+    model: str
+
+    # 字段在配置文件中的位置
+    KEYS: ClassVar[Dict[str, str]] = {
+        "bw_threshold": "screenshot.bw_threshold",
+        "crop_ratios": "screenshot.crop_ratios",
+        "click_delay": "app.click_delay",
+        "model": "llm.model",
+    }
+
+    @classmethod
+    def from_config(cls, config: Mapping) -> "Tunables":
+        """
+        从配置中读取并校验可调参数
+
+        Raises:
+            ValueError: 取值类型或范围不合法
+        """
+        screenshot_cfg = config.get("screenshot", {})
+        try:
+            tunables = cls(
+                bw_threshold=int(screenshot_cfg.get("bw_threshold", 200)),
+                crop_ratios=tuple(float(r) for r in screenshot_cfg.get("crop_ratios", (0.0, 0.2, 1.0, 0.7))),
+                click_delay=float(config.get("app", {}).get("click_delay", 1.5)),
+                model=str(config.get("llm", {}).get("model", "gpt-4o")),
+            )
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"配置取值不合法: {e}") from e
+
+        crop = tunables.crop_ratios
+        if len(crop) != 4 or not (0 <= crop[0] < crop[2] <= 1 and 0 <= crop[1] < crop[3] <= 1):
+            raise ValueError(f"crop_ratios 应为 0-1 之间的 [左, 上, 右, 下]: {list(tunables.crop_ratios)}")
+        if not 0 <= tunables.bw_threshold <= 255:
+            raise ValueError(f"bw_threshold 应在 0-255 之间: {tunables.bw_threshold}")
+        if tunables.click_delay < 0:
+            raise ValueError(f"click_delay 不能为负: {tunables.click_delay}")
+        return tunables
+
+    def changes(self, other: "Tunables") -> Dict[str, Any]:
+        """与 other 不同的字段及其在 other 中的取值"""
+        return {name: getattr(other, name) for name in self.__dataclass_fields__
+                if getattr(self, name) != getattr(other, name)}
+
+
+def changed_keys(old: Mapping, new: Mapping) -> List[str]:
+    """两份配置中取值不同的键，形如 "screenshot.bw_threshold"（只展开到第二层）"""
+    changed = []
+    for section in sorted(set(old) | set(new)):
+        a, b = old.get(section), new.get(section)
+        if a == b:
+            continue
+        if isinstance(a, Mapping) and isinstance(b, Mapping):
+            changed += [f"{section}.{k}" for k in sorted(set(a) | set(b)) if a.get(k) != b.get(k)]
+        else:
+            changed.append(section)
+    return changed
+
+
+def _resolve(path: Optional[str]) -> str:
     if path is None:
         path = os.path.join(os.getcwd(), "config.yaml")
+    return os.path.abspath(path)
+
+
+def _stamp(path: str) -> Optional[Tuple[int, int]]:
+    """文件的 (修改时间, 大小)，文件不存在时返回 None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
 
-    config = DEFAULT_CONFIG.copy()
+def _parse(path: str) -> FrozenConfig:
+    """
+    读取并合并默认配置
+
+    Raises:
+        OSError: 文件无法读取（不存在除外，此时返回默认配置）
+        yaml.YAMLError: 解析失败
+        ValueError: 顶层不是映射
+    """
     try:
         with open(path, "r", encoding="utf-8") as f:
             user_cfg = yaml.safe_load(f) or {}
-            # 深度合并（浅合并即可覆盖常见字段）
-            for k, v in user_cfg.items():
-                if isinstance(v, dict) and k in config:
-                    config[k].update(v)
-                else:
-                    config[k] = v
     except FileNotFoundError:
-        # 没有配置文件，返回默认配置
-        return config
-    except Exception:
-        # 解析错误等，仍返回默认配置
-        return config
+        user_cfg = {}
+    if not isinstance(user_cfg, dict):
+        raise ValueError(f"配置文件顶层应为映射: {path}")
+    return FrozenConfig(_deep_merge(DEFAULT_CONFIG, user_cfg))
+
+
+_cache: Dict[str, Tuple[Optional[Tuple[int, int]], FrozenConfig]] = {}
+_cache_lock = threading.Lock()
+
+
+def load_config(path: Optional[str] = None) -> FrozenConfig:
+    """加载 YAML 配置文件，返回只读配置
 
+    同一路径的文件未修改时返回缓存的同一对象；解析失败时返回默认配置。
+
+    Args:
+        path: 配置文件路径，未提供时使用当前目录下的 `config.yaml`
+    """
+    path = _resolve(path)
+    stamp = _stamp(path)
+    with _cache_lock:
+        cached = _cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    try:
+        config = _parse(path)
+    except Exception as e:
+        # 解析错误等，仍返回默认配置
+        logger.warning("配置文件 %s 解析失败，使用默认配置: %s", path, e)
+        config = FrozenConfig(DEFAULT_CONFIG)
+    with _cache_lock:
+        _cache[path] = (stamp, config)
     return config
 
 
@@ -53,8 +256,61 @@ def get(path: Optional[str] = None, key: Optional[str] = None, default: Any = No
     parts = key.split(".")
     cur = cfg
     for p in parts:
-        if isinstance(cur, dict) and p in cur:
+        if isinstance(cur, Mapping) and p in cur:
             cur = cur[p]
         else:
             return default
     return cur
+
+
+class ConfigWatcher:
+    """轮询配置文件，修改后重新加载并回调 on_change(旧配置, 新配置)
+
+    解析失败或可调参数不合法时保留旧配置并记录警告，等待下一次修改。
+    """
+
+    def __init__(self, on_change: Callable[[FrozenConfig, FrozenConfig], None],
+                 path: Optional[str] = None, interval: float = 1.0):
+        self.on_change = on_change
+        self.path = _resolve(path)
+        self.interval = interval
+        self.config = load_config(self.path)
+        self._stamp = _stamp(self.path)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.exception("配置热更新失败: %s", e)
+
+    def check(self) -> bool:
+        """检查一次文件变化，应用了新配置时返回 True"""
+        stamp = _stamp(self.path)
+        if stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        try:
+            config = _parse(self.path)
+            Tunables.from_config(config)
+        except Exception as e:
+            logger.warning("配置文件 %s 无效，保留当前配置: %s", self.path, e)
+            return False
+        if config == self.config:
+            return False
+
+        with _cache_lock:
+            _cache[self.path] = (stamp, config)
+        old, self.config = self.config, config
+        self.on_change(old, config)
+        return True
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=1.0)
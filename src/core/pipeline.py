@@ -0,0 +1,318 @@
+"""
+流水线答题运行器
+将截图、预处理、OCR、答题、点击拆成独立阶段，阶段之间用有界队列连接
+"""
+import itertools
+import queue
+import threading
+import time
+from typing import Callable, List, Optional, TYPE_CHECKING
+
+from src.core.base import AndroidControllerBase
+from src.generators.call_policy import DeadlineExceeded
+from src.utils import metrics
+from src.utils.text_normalize import normalize_key
+from src.utils.log import fields, get_logger, ms
+
+logger = get_logger(__name__)
+
+if TYPE_CHECKING:
+    from src.core.quiz_bot import QuizBot
+
+
+class _Job:
+    """在各阶段之间流转的一道题，id 为贯穿全流程的关联 ID"""
+
+    def __init__(self, job_id: str, epoch: int):
+        self.id = job_id
+        self.epoch = epoch              # 截图时已完成的点击次数，用于识别过期画面
+        self.created = time.monotonic()
+        self.raw = None
+        self.frame = None               # 帧缓冲池中的原始截图数组，预处理后归还
+        self.screenshot = None
+        self.ocr_input = None           # 交给 OCR 的图像；启用帧缓冲池时为池中数组，OCR 之后归还
+        self.screen = None              # 画面分类结果（ScreenVerdict）
+        self.roi = None                 # 答题区域标定的候选区域（RoiCandidate）
+        self.offset = (0, 0)
+        self.question_body = ""
+        self.ocr_results: List = []
+        self.option_number = 0
+
+
+class StageStats:
+    """单个阶段的处理统计"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.busy = 0.0
+        self.processed = 0
+        self.dropped = 0
+
+    def utilization(self, wall: float) -> float:
+        return self.busy / wall if wall > 0 else 0.0
+
+
+class PipelinedQuizRunner:
+    """流水线运行器 - 各阶段在独立线程中并发运行
+
+    下一帧的截图与预处理可以与当前题目的 LLM 等待重叠；队列有界，
+    下游繁忙时上游阻塞（背压）。截图时记录 epoch（已点击次数），
+    点击之前截下的画面以及与正在作答的题目相同的画面会在答题阶段被丢弃。
+    """
+
+    def __init__(self, bot: "QuizBot", queue_size: int = 1):
+        """
+        Args:
+            bot: 提供控制器、提取器、生成器与应用配置的 QuizBot
+            queue_size: 阶段间队列容量
+        """
+        self.bot = bot
+        self.queue_size = queue_size
+        self.stats = {name: StageStats(name) for name in ("capture", "preprocess", "ocr", "answer", "input")}
+        self.latencies = metrics.Histogram()    # 端到端延迟，内存占用与题目数量无关
+        self.answered = 0
+
+        self._ids = itertools.count(1)
+        self._stop = threading.Event()
+        self._epoch = 0
+        self._settle_until = 0.0
+        self._last_question = ("", -1)  # (题干键, epoch)
+        self._lock = threading.Lock()
+        self._max_questions: Optional[int] = None
+
+        # 控制器未拆分截图与预处理时，在截图阶段一次完成
+        self._split_capture = type(bot.android_controller).capture_raw is not AndroidControllerBase.capture_raw
+        self._pool = bot.frame_pool
+
+    def _release(self, job: Optional[_Job]):
+        """归还题目借出的缓冲区（题目被丢弃或 OCR 完成时）"""
+        if job is None or self._pool is None:
+            return
+        for arr in (job.frame, job.ocr_input):
+            if arr is not None:
+                self._pool.release(arr)
+        job.frame = job.ocr_input = None
+
+    def _put(self, q: queue.Queue, job: _Job) -> bool:
+        """阻塞放入下游队列，期间响应停止信号"""
+        while not self._stop.is_set():
+            try:
+                q.put(job, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _stage(self, name: str, inbox: Optional[queue.Queue], outbox: Optional[queue.Queue],
+               work: Callable[[Optional[_Job]], Optional[_Job]]):
+        stats = self.stats[name]
+        while not self._stop.is_set():
+            job = None
+            if inbox is not None:
+                try:
+                    job = inbox.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            start = time.monotonic()
+            try:
+                result = work(job)
+            except DeadlineExceeded as e:
+                logger.warning("[%s] LLM 未在截止时间内给出答案: %s", job.id if job else "-", e)
+                result = None
+            except Exception as e:
+                logger.exception("[%s] %s 阶段出错: %s", job.id if job else "-", name, e)
+                result = None
+            elapsed = time.monotonic() - start
+            stats.busy += elapsed
+            metrics.observe(f"pipeline.{name}", elapsed)
+            if result is None:
+                stats.dropped += 1
+                self._release(job)
+                continue
+            stats.processed += 1
+            if outbox is not None and not self._put(outbox, result):
+                self._release(result)
+                return
+
+    # ---- 各阶段 ----
+
+    def _capture(self, _) -> Optional[_Job]:
+        # 等待上一题点击后的过渡动画，等待时间不计入阶段忙碌时间
+        wait = self._settle_until - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+            self.stats["capture"].busy -= wait
+        job = _Job(f"q{next(self._ids):05d}", self._epoch)
+        controller = self.bot.android_controller
+        if self._pool is not None:
+            job.frame = controller.capture_frame(self._pool)
+        elif self._split_capture:
+            job.raw = controller.capture_raw()
+        else:
+            job.screenshot, box = controller.get_screenshot(save_debug=self.bot.debug_mode)
+            job.offset = box[:2]
+        return job
+
+    def _preprocess(self, job: _Job) -> Optional[_Job]:
+        if job.frame is not None:
+            self._preprocess_frame(job)
+        elif job.raw is not None:
+            if self.bot.roi_calibrator is not None:
+                job.roi = self.bot.roi_calibrator.prepare(job.raw)
+            job.screenshot, box = self.bot.android_controller.preprocess(job.raw, save_debug=self.bot.debug_mode)
+            job.offset = box[:2]
+            if self.bot.threshold_calibrator is not None:
+                self.bot.threshold_calibrator.observe(job.raw, box)
+            job.raw = None
+        if job.ocr_input is None:
+            job.ocr_input = job.screenshot
+        # 非答题画面在这里丢弃，不占用 OCR 阶段
+        job.screen = self.bot.screen_gate.check(job.screenshot)
+        if not job.screen.ocr:
+            logger.debug("[%s] 跳过非答题画面", job.id, extra=job.screen.log_fields())
+            return None
+        return job
+
+    def _preprocess_frame(self, job: _Job):
+        """帧缓冲池版本的预处理：二值化结果写入池中数组，原始截图数组随即归还"""
+        from PIL import Image
+
+        bot = self.bot
+        if bot.roi_calibrator is not None:
+            job.roi = bot.roi_calibrator.prepare(job.frame)
+        job.ocr_input, box = bot.android_controller.preprocess_frame(job.frame, self._pool,
+                                                                      save_debug=bot.debug_mode)
+        job.offset = box[:2]
+        if bot.threshold_calibrator is not None:
+            bot.threshold_calibrator.observe(job.frame, box)
+        self._pool.release(job.frame)
+        job.frame = None
+        # 画面分类只看灰度，取二值化结果的单个通道
+        job.screenshot = Image.fromarray(job.ocr_input[..., 0])
+
+    def _ocr(self, job: _Job) -> Optional[_Job]:
+        if job.epoch < self._epoch:
+            return None
+        extractor = self.bot.question_extractor
+        try:
+            if self.bot.speculative:
+                job.question_body, job.ocr_results = extractor.extract_question_streaming(
+                    job.ocr_input, self.bot.answer_generator.prefetch
+                )
+            else:
+                job.question_body, job.ocr_results = extractor.extract_question(job.ocr_input)
+        finally:
+            self._release(job)
+        found = bool(job.ocr_results) and len(job.ocr_results) >= 2
+        self.bot.screen_gate.record_ocr(job.screen, found)
+        if self.bot.roi_calibrator is not None:
+            self.bot.roi_calibrator.feedback(job.roi, job.ocr_results, job.screenshot.size)
+        if self.bot.threshold_calibrator is not None:
+            self.bot.threshold_calibrator.record_ocr(found)
+        if not found:
+            return None
+        return job
+
+    def _answer(self, job: _Job) -> Optional[_Job]:
+        key = normalize_key(job.question_body)
+        with self._lock:
+            # 点击之前截下的画面，或与正在作答的是同一画面
+            if job.epoch < self._epoch or self._last_question == (key, job.epoch):
+                return None
+            self._last_question = (key, job.epoch)
+        logger.debug("[%s] 识别到的题目:\n%s", job.id, job.question_body)
+        generator = self.bot.answer_generator
+        try:
+            answer_text = generator.get_answer(job.question_body)
+            job.option_number = generator.extract_option_number(answer_text)
+        except Exception:
+            # 作答失败，允许同一画面的后续帧重试
+            self._forget_question()
+            raise
+        logger.debug("[%s] LLM答案: %s -> 选项 %d", job.id, answer_text, job.option_number)
+        if job.option_number < 1 or job.option_number >= len(job.ocr_results):
+            logger.warning("[%s] 选项编号 %d 超出范围", job.id, job.option_number)
+            self._forget_question()
+            return None
+        return job
+
+    def _forget_question(self):
+        with self._lock:
+            self._last_question = ("", -1)
+
+    def _input(self, job: _Job) -> Optional[_Job]:
+        controller = self.bot.android_controller
+        x, y = controller.calculate_click_position(job.ocr_results[job.option_number][0], job.offset)
+        controller.click(x, y)
+        if self.bot.outcome_detector is not None:
+            # 后台检测作答结果，不阻塞下一题的截图与识别
+            self.bot.outcome_detector.submit(controller, self.bot.answer_generator, job.question_body,
+                                             job.ocr_results, job.option_number, job.offset)
+        with self._lock:
+            self._epoch += 1
+            self._settle_until = time.monotonic() + self.bot.click_delay
+            self.answered += 1
+            latency = time.monotonic() - job.created
+            self.latencies.record(latency)
+            metrics.observe("question.total", latency)
+            logger.info("[%s] 作答: 选项 %d", job.id, job.option_number,
+                        extra=fields(job=job.id, option=job.option_number, x=x, y=y, total_ms=ms(latency)))
+            if self._max_questions is not None and self.answered >= self._max_questions:
+                self._stop.set()
+        return job
+
+    def run(self, max_questions: Optional[int] = None):
+        """
+        运行流水线直到答完 max_questions 道题或被中断
+
+        Args:
+            max_questions: 最多作答的题目数量，None 表示无限
+        """
+        self._max_questions = max_questions
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(4)]
+        stages = [
+            ("capture", None, queues[0], self._capture),
+            ("preprocess", queues[0], queues[1], self._preprocess),
+            ("ocr", queues[1], queues[2], self._ocr),
+            ("answer", queues[2], queues[3], self._answer),
+            ("input", queues[3], None, self._input),
+        ]
+        threads = [
+            threading.Thread(target=self._stage, args=stage, name=f"pipeline-{stage[0]}", daemon=True)
+            for stage in stages
+        ]
+
+        logger.info("答题机器人启动（流水线模式）")
+        start = time.monotonic()
+        for t in threads:
+            t.start()
+        try:
+            while not self._stop.wait(0.5):
+                pass
+        except KeyboardInterrupt:
+            logger.info("用户中断")
+            self._stop.set()
+        finally:
+            for t in threads:
+                t.join(timeout=5.0)
+            self.report(time.monotonic() - start)
+
+    def report(self, wall: float):
+        """打印各阶段利用率与端到端延迟"""
+        logger.info("共作答 %d 题，用时 %.1fs", self.answered, wall)
+        for stats in self.stats.values():
+            logger.info("阶段 %s", stats.name,
+                        extra=fields(utilization=round(stats.utilization(wall), 3),
+                                     processed=stats.processed, dropped=stats.dropped))
+        if self.latencies.count:
+            logger.info("端到端延迟",
+                        extra=fields(p50_ms=ms(self.latencies.percentile(50)),
+                                     p95_ms=ms(self.latencies.percentile(95)),
+                                     p99_ms=ms(self.latencies.percentile(99))))
+        logger.info("画面分类", extra=fields(**self.bot.screen_gate.stats()))
+        if self._pool is not None:
+            logger.info("帧缓冲池", extra=fields(**self._pool.stats()))
+        if self.bot.roi_calibrator is not None:
+            logger.info("答题区域", extra=fields(**self.bot.roi_calibrator.stats()))
+        if self.bot.threshold_calibrator is not None:
+            logger.info("二值化阈值", extra=fields(**self.bot.threshold_calibrator.stats()))
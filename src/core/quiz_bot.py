@@ -4,12 +4,17 @@
 """
 import time
 from typing import Optional
-from src.extractors import QuestionExtractor
-from src.generators import AnswerGenerator
-from src.controllers import AndroidController
 from src.core.base import QuestionExtractorBase, AnswerGeneratorBase, AndroidControllerBase
-from src.controllers.adb_controller import ADBController
 from src.core import config as cfg_loader
+from src.core import registry
+from src.generators.cached_generator import CachedAnswerGenerator
+from src.generators.call_policy import DeadlineExceeded
+from src.utils.answer_store import AnswerStore
+from src.utils.question_bank import open_bank
+from src.utils import metrics
+from src.utils.log import fields, get_logger, ms, setup_logging, shutdown_logging, timing_fields
+
+logger = get_logger(__name__)
 
 
 class QuizBot:
@@ -19,7 +24,8 @@ class QuizBot:
                  window_title: str = "BlueStacks App Player",
                  model: str = "gpt-4o",
                  api_key: Optional[str] = None,
-                 config_path: Optional[str] = None):
+                 config_path: Optional[str] = None,
+                 config: Optional[dict] = None):
         """
         初始化答题机器人
         
@@ -27,41 +33,134 @@ class QuizBot:
             window_title: 模拟器窗口标题
             model: LLM模型名称
             api_key: OpenAI API密钥
+            config_path: 配置文件路径
+            config: 已加载的配置字典，提供时不再读取 config_path
         """
-        # 读取配置（合并默认）
-        self.config = cfg_loader.load_config(config_path)
+        # 读取配置（合并默认，只读）
+        if config is None:
+            config = cfg_loader.load_config(config_path)
+        elif not isinstance(config, cfg_loader.FrozenConfig):
+            config = cfg_loader.FrozenConfig(config)
+        self.config = config
+        self.config_path = config_path
+        self.config_watcher: Optional[cfg_loader.ConfigWatcher] = None
+        setup_logging(self.config.get("logging"))
 
         # 初始化三个核心模块（通过基类注入实现可替换性）
+        # 实现按名称从注册表取得，只导入配置选中的后端
         ocr_cfg = self.config.get("ocr", {})
-        self.question_extractor: QuestionExtractorBase = QuestionExtractor(
-            ocr_version=ocr_cfg.get("ocr_version", "PP-OCRv4"),
-        )
+        QuestionExtractor = registry.extractors.get(ocr_cfg.get("backend", "paddleocr"))
+        if hasattr(QuestionExtractor, "from_config"):
+            # 远程 OCR 等需要额外配置的提取器
+            self.question_extractor: QuestionExtractorBase = QuestionExtractor.from_config(
+                ocr_cfg, debug=self.config.get("app", {}).get("debug_mode", False))
+        else:
+            self.question_extractor: QuestionExtractorBase = QuestionExtractor(
+                ocr_version=ocr_cfg.get("ocr_version", "PP-OCRv4"),
+                debug=self.config.get("app", {}).get("debug_mode", False),
+            )
         llm_cfg = self.config.get("llm", {})
-        self.answer_generator: AnswerGeneratorBase = AnswerGenerator(
-            model=llm_cfg.get("model", model), 
-            api_key=llm_cfg.get("api_key", api_key),
-            base_url=llm_cfg.get("base_url")
-        )
+        if llm_cfg.get("ensemble", {}).get("enabled"):
+            # 多模型并发投票
+            self.answer_generator: AnswerGeneratorBase = registry.generators.get("ensemble").from_config(llm_cfg)
+        else:
+            AnswerGenerator = registry.generators.get(llm_cfg.get("backend", "openai"))
+            self.answer_generator: AnswerGeneratorBase = AnswerGenerator(
+                model=llm_cfg.get("model", model), 
+                api_key=llm_cfg.get("api_key", api_key),
+                base_url=llm_cfg.get("base_url"),
+                http_config=llm_cfg.get("http"),
+                fallback_model=llm_cfg.get("fallback_model"),
+                policy_config=llm_cfg.get("policy")
+            )
+        if llm_cfg.get("broker", {}).get("enabled"):
+            # 多会话共享生成器时合并同时到达的题目；位于答案库之下，命中答案库的题不参与凑批
+            if type(self.answer_generator).get_answers is AnswerGeneratorBase.get_answers:
+                logger.warning("答案生成器 %s 不支持多题合并请求，已关闭 llm.broker",
+                               type(self.answer_generator).__name__)
+            else:
+                from src.generators.answer_broker import AnswerBroker
+                self.answer_generator = AnswerBroker.from_config(self.answer_generator, llm_cfg.get("broker"))
+
+        # 本地答案库：命中时直接作答，不调用 LLM
+        store_cfg = self.config.get("answer_store", {})
+        store_path = store_cfg.get("path")
+        if store_path:
+            bank_path = store_cfg.get("bank")
+            bank = open_bank(bank_path)
+            if bank_path and bank is None:
+                logger.warning("只读题库 %s 不存在，仅使用本地答案库", bank_path)
+            self.answer_generator = CachedAnswerGenerator(self.answer_generator, AnswerStore(store_path), bank)
 
-        # 根据配置选择控制器实现（adb 或 bluestacks）
+        # 根据配置选择控制器实现（adb、replay 或 bluestacks）
         controller_type = self.config.get("controller", {}).get("type", "adb")
+        controller_cls = registry.controllers.get(controller_type)
         if controller_type == "adb":
             adb_cfg = self.config.get("adb", {})
             # auto_setup=True 会自动下载 ADB、检测设备并选择
-            self.android_controller: AndroidControllerBase = ADBController(
+            self.android_controller: AndroidControllerBase = controller_cls(
                 adb_path=adb_cfg.get("adb_path", "adb"), 
                 device_id=adb_cfg.get("device_id", None), 
                 config=self.config,
                 auto_setup=adb_cfg.get("auto_setup", True)
             )
-        else:
+        elif controller_type == "replay":
+            replay_cfg = self.config.get("replay", {})
+            self.android_controller: AndroidControllerBase = controller_cls(
+                replay_cfg["path"],
+                config=self.config,
+                timing=replay_cfg.get("timing", "realtime"),
+                speed=replay_cfg.get("speed", 1.0),
+                loop=replay_cfg.get("loop", False)
+            )
+        elif controller_type == "bluestacks":
             # bluetacks controller still accepts window_title
-            self.android_controller: AndroidControllerBase = AndroidController(window_title=window_title)
+            self.android_controller: AndroidControllerBase = controller_cls(
+                window_title=window_title, config=self.config
+            )
+        else:
+            # 通过 registry.controllers.register 登记的其他控制器
+            self.android_controller: AndroidControllerBase = controller_cls(config=self.config)
         
         # 应用级配置
         app_cfg = self.config.get("app", {})
         self.click_delay = app_cfg.get("click_delay", 1.5)
         self.debug_mode = app_cfg.get("debug_mode", False)
+        # 推测式分发：题干识别完即预取答案，与选项识别重叠
+        self.speculative = app_cfg.get("speculative", False)
+        # 运行模式：sequential 逐题串行，pipelined 各阶段流水线并发，async 单事件循环多会话
+        self.runner = app_cfg.get("runner", "sequential")
+        self.pipeline_queue_size = app_cfg.get("pipeline_queue_size", 1)
+        # 可热更新的参数：修改 config.yaml 后无需重启（重新加载 PaddleOCR）即可生效
+        self.hot_reload = app_cfg.get("hot_reload", False)
+        self.tunables = cfg_loader.Tunables.from_config(self.config)
+        self._async_sessions: list = []
+
+        # OCR 之前的画面分类：只有答题页交给 OCR，同时统计浪费的 OCR 调用
+        from src.utils.screen_classifier import ScreenGate
+        self.screen_gate = ScreenGate.from_config(self.config.get("screen_classifier"))
+
+        # 答题区域自动标定：按设备与分辨率缓存裁剪比例，OCR 只处理题干与选项所在区域
+        self.roi_calibrator = self.create_roi_calibrator(self.android_controller)
+        # 二值化阈值自动标定：按设备缓存，定期抽样直方图复查
+        self.threshold_calibrator = self.create_threshold_calibrator(self.android_controller)
+
+        # 帧缓冲池：截图与预处理原地写入复用的数组，长时间运行时不再每帧分配整帧缓冲区
+        self.frame_pool = self.create_frame_pool(self.android_controller)
+
+        # 点击后检测作答结果，确认的正确答案写入答案库（需要控制器提供原始截图）
+        self.outcome_detector = None
+        outcome_cfg = self.config.get("outcome", {})
+        if outcome_cfg.get("enabled", False):
+            from src.utils.outcome_detector import OutcomeDetector
+            if OutcomeDetector.supports(self.android_controller):
+                self.outcome_detector = OutcomeDetector.from_config(outcome_cfg)
+            else:
+                logger.warning("控制器 %s 不支持原始截图，已关闭作答结果检测",
+                               type(self.android_controller).__name__)
+
+        # 阶段耗时统计（未启用时计时器为空操作）
+        metrics.configure(self.config.get("metrics"))
     
     def process_one_question(self) -> bool:
         """
@@ -70,31 +169,57 @@ class QuizBot:
         Returns:
             是否成功处理
         """
+        timings = {}
+        buffers = []
         try:
+            started = time.perf_counter()
+
             # 1. 截图
-            print("正在截图...")
-            screenshot, (abs_left, abs_top, abs_right, abs_bottom) = \
-                self.android_controller.get_screenshot(save_debug=self.debug_mode)
+            with metrics.timer("capture", into=timings):
+                screenshot, (abs_left, abs_top, abs_right, abs_bottom), ocr_input, roi = \
+                    self.capture_screen(buffers)
             
-            # 2. 提取题目
-            print("正在识别题目...")
-            question_body, ocr_results = self.question_extractor.extract_question(screenshot)
-            print(f"\n识别到的题目:\n{question_body}\n")
+            # 2. 非答题画面（加载、过渡、结果页）不做 OCR
+            with metrics.timer("classify", into=timings):
+                screen = self.screen_gate.check(screenshot)
+            if not screen.ocr:
+                logger.debug("跳过非答题画面", extra=screen.log_fields())
+                return False
+
+            # 3. 提取题目
+            with metrics.timer("ocr", into=timings):
+                if self.speculative:
+                    question_body, ocr_results = self.question_extractor.extract_question_streaming(
+                        ocr_input, self.answer_generator.prefetch
+                    )
+                else:
+                    question_body, ocr_results = self.question_extractor.extract_question(ocr_input)
+            self.release_buffers(buffers)
+            logger.debug("识别到的题目:\n%s", question_body)
+            self.screen_gate.record_ocr(screen, bool(ocr_results) and len(ocr_results) >= 2)
+            if self.roi_calibrator is not None:
+                self.roi_calibrator.feedback(roi, ocr_results, screenshot.size)
+            if self.threshold_calibrator is not None:
+                self.threshold_calibrator.record_ocr(bool(ocr_results) and len(ocr_results) >= 2)
             
             if not ocr_results or len(ocr_results) < 2:
-                print("未识别到有效题目和选项")
+                logger.info("未识别到有效题目和选项", extra=fields(**timing_fields(timings)))
                 return False
             
-            # 3. 获取答案
-            print("正在调用LLM分析...")
-            answer_text = self.answer_generator.get_answer(question_body)
+            # 4. 获取答案
+            try:
+                with metrics.timer("llm", into=timings):
+                    answer_text = self.answer_generator.get_answer(question_body)
+            except DeadlineExceeded as e:
+                # 题目仍停留在屏幕上，下一轮会重新截图作答
+                logger.warning("LLM 未在截止时间内给出答案: %s", e, extra=fields(**timing_fields(timings)))
+                return False
             option_number = self.answer_generator.extract_option_number(answer_text)
-            print(f"LLM答案: {answer_text}")
-            print(f"最终选择: 选项 {option_number}")
+            logger.debug("LLM答案: %s", answer_text)
             
-            # 4. 计算点击位置
+            # 5. 计算点击位置
             if option_number < 1 or option_number > len(ocr_results):
-                print(f"选项编号 {option_number} 超出范围")
+                logger.warning("选项编号 %d 超出范围", option_number, extra=fields(**timing_fields(timings)))
                 return False
             
             # OCR结果中第0个是题目,从第1个开始是选项
@@ -104,20 +229,74 @@ class QuizBot:
                 (abs_left, abs_top)
             )
             
-            # 5. 执行点击
-            print(f"点击位置: ({click_x}, {click_y})")
-            self.android_controller.click(click_x, click_y)
+            # 6. 执行点击
+            with metrics.timer("tap", into=timings):
+                self.android_controller.click(click_x, click_y)
+            total = time.perf_counter() - started
+            metrics.observe("question.total", total)
+            logger.info("作答: 选项 %d", option_number,
+                        extra=fields(option=option_number, x=click_x, y=click_y,
+                                     total_ms=ms(total), **timing_fields(timings)))
             
-            # 6. 等待下一题
-            time.sleep(self.click_delay)
+            # 7. 检测作答结果，检测耗时计入等待时间
+            waited = 0.0
+            if self.outcome_detector is not None:
+                check_started = time.perf_counter()
+                self.outcome_detector.verify(self.android_controller, self.answer_generator,
+                                             question_body, ocr_results, option_number, (abs_left, abs_top))
+                waited = time.perf_counter() - check_started
+
+            # 8. 等待下一题
+            time.sleep(max(0.0, self.click_delay - waited))
             
             return True
             
         except Exception as e:
-            print(f"处理题目时出错: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("处理题目时出错: %s", e)
             return False
+        finally:
+            self.release_buffers(buffers)
+
+    def capture_screen(self, buffers: list):
+        """
+        截图并预处理，按需调用答题区域与阈值标定
+
+        启用帧缓冲池时截图与二值化结果写入池中数组，借出的数组追加到 buffers，由调用方用
+        `release_buffers` 归还；二值化数组直接交给 OCR，不再转换为 PIL 图像后复制。
+
+        Returns:
+            (用于画面分类的图像, 裁剪区域, 交给 OCR 的图像或数组, 答题区域候选)
+        """
+        controller = self.android_controller
+        roi = None
+        if self.frame_pool is not None:
+            from PIL import Image
+            frame = controller.capture_frame(self.frame_pool)
+            buffers.append(frame)
+            # 标定器直接接收数组，只在需要测量的帧上转换为 PIL 图像
+            if self.roi_calibrator is not None:
+                roi = self.roi_calibrator.prepare(frame)
+            ocr_input, box = controller.preprocess_frame(frame, self.frame_pool, save_debug=self.debug_mode)
+            buffers.append(ocr_input)
+            if self.threshold_calibrator is not None:
+                self.threshold_calibrator.observe(frame, box)
+            # 画面分类只看灰度，取二值化结果的单个通道
+            return Image.fromarray(ocr_input[..., 0]), box, ocr_input, roi
+        if self.roi_calibrator is not None or self.threshold_calibrator is not None:
+            raw = controller.capture_raw()
+            if self.roi_calibrator is not None:
+                roi = self.roi_calibrator.prepare(raw)
+            screenshot, box = controller.preprocess(raw, save_debug=self.debug_mode)
+            if self.threshold_calibrator is not None:
+                self.threshold_calibrator.observe(raw, box)
+        else:
+            screenshot, box = controller.get_screenshot(save_debug=self.debug_mode)
+        return screenshot, box, screenshot, roi
+
+    def release_buffers(self, buffers: list):
+        """归还 capture_screen 借出的缓冲区"""
+        while buffers:
+            self.frame_pool.release(buffers.pop())
     
     def run(self, max_questions: Optional[int] = None):
         """
@@ -126,9 +305,31 @@ class QuizBot:
         Args:
             max_questions: 最多处理的题目数量,None表示无限循环
         """
-        print("=" * 50)
-        print("答题机器人启动")
-        print("=" * 50)
+        if self.hot_reload:
+            self.start_config_watcher()
+        if self.runner == "pipelined":
+            from src.core.pipeline import PipelinedQuizRunner
+            try:
+                PipelinedQuizRunner(self, queue_size=self.pipeline_queue_size).run(max_questions)
+            finally:
+                self.stop_config_watcher()
+                self.close_outcome_detector()
+                self.answer_generator.close()
+                metrics.shutdown()
+                shutdown_logging()
+            return
+        if self.runner == "async":
+            from src.core.async_runner import AsyncQuizRunner
+            try:
+                AsyncQuizRunner(self.build_async_sessions()).run(max_questions)
+            finally:
+                self.stop_config_watcher()
+                self.close_outcome_detector()
+                metrics.shutdown()
+                shutdown_logging()
+            return
+
+        logger.info("答题机器人启动")
         
         question_count = 0
         success_count = 0
@@ -140,26 +341,159 @@ class QuizBot:
                     break
                 
                 question_count += 1
-                print(f"\n{'='*50}")
-                print(f"正在处理第 {question_count} 题")
-                print('='*50)
+                logger.debug("正在处理第 %d 题", question_count)
                 
                 success = self.process_one_question()
                 if success:
                     success_count += 1
                 
         except KeyboardInterrupt:
-            print("\n\n用户中断")
+            logger.info("用户中断")
         except Exception as e:
-            print(f"\n\n程序异常: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("程序异常: %s", e)
         finally:
-            print("\n" + "=" * 50)
-            print("答题机器人停止")
-            print(f"共处理 {question_count} 题,成功 {success_count} 题")
-            print("=" * 50)
+            self.stop_config_watcher()
+            self.close_outcome_detector()
+            metrics.shutdown()
+            logger.info("答题机器人停止: 共处理 %d 题,成功 %d 题", question_count, success_count)
+            # 先取统计再关闭：答案库关闭后无法再统计记录数
+            for endpoint, stats in self.answer_generator.get_stats().items():
+                logger.info("LLM 端点 %s: %s", endpoint, stats)
+            self.answer_generator.close()
+            for stage, stats in metrics.get_registry().snapshot().items():
+                logger.info("阶段 %s", stage, extra=fields(**stats))
+            logger.info("画面分类", extra=fields(**self.screen_gate.stats()))
+            if self.roi_calibrator is not None:
+                logger.info("答题区域", extra=fields(**self.roi_calibrator.stats()))
+            if self.threshold_calibrator is not None:
+                logger.info("二值化阈值", extra=fields(**self.threshold_calibrator.stats()))
+            if self.frame_pool is not None:
+                logger.info("帧缓冲池", extra=fields(**self.frame_pool.stats()))
+            shutdown_logging()
     
+    def build_async_sessions(self) -> list:
+        """为 asyncio 运行器创建会话
+
+        配置了 `adb.device_ids` 时每个设备一个会话，共享 OCR 与答案生成器；
+        否则只使用当前控制器。
+        """
+        from src.core.async_runner import AsyncSession
+
+        controllers = [self.android_controller]
+        device_ids = self.config.get("adb", {}).get("device_ids") or []
+        ADBController = registry.controllers.get("adb")
+        if device_ids and isinstance(self.android_controller, ADBController):
+            controllers = [
+                ADBController(adb_path=self.android_controller.adb_path, device_id=device_id,
+                              config=self.config, auto_setup=False)
+                for device_id in device_ids
+            ]
+        self._async_sessions = [
+            AsyncSession(getattr(c, "device_id", None) or f"session{i}", c,
+                         self.question_extractor, self.answer_generator,
+                         click_delay=self.click_delay, debug_mode=self.debug_mode,
+                         screen_gate=self.screen_gate, outcome_detector=self.outcome_detector,
+                         roi_calibrator=self.roi_calibrator if c is self.android_controller
+                         else self.create_roi_calibrator(c),
+                         threshold_calibrator=self.threshold_calibrator if c is self.android_controller
+                         else self.create_threshold_calibrator(c))
+            for i, c in enumerate(controllers, 1)
+        ]
+        return self._async_sessions
+
+    def create_roi_calibrator(self, controller: AndroidControllerBase):
+        """按 `roi_calibration` 配置为控制器创建标定器，未启用或控制器不支持时返回 None"""
+        roi_cfg = self.config.get("roi_calibration", {})
+        if not roi_cfg.get("enabled", False):
+            return None
+        from src.utils.roi_calibrator import RoiCalibrator
+        if not RoiCalibrator.supports(controller):
+            logger.warning("控制器 %s 不支持原始截图或设置裁剪比例，已关闭答题区域标定",
+                           type(controller).__name__)
+            return None
+        # 配置中的 crop_ratios 作为先验区域；区域改变后画面分类模板需要重新学习
+        return RoiCalibrator.from_config(controller, roi_cfg, prior=self.tunables.crop_ratios,
+                                         on_change=lambda _: self.screen_gate.reset_template())
+
+    def create_frame_pool(self, controller: AndroidControllerBase):
+        """按 `frame_pool` 配置创建缓冲池，未启用或控制器不支持原地截图时返回 None"""
+        pool_cfg = self.config.get("frame_pool", {})
+        if not pool_cfg.get("enabled", False):
+            return None
+        cls = type(controller)
+        if cls.capture_frame is AndroidControllerBase.capture_frame or \
+                cls.preprocess_frame is AndroidControllerBase.preprocess_frame:
+            logger.warning("控制器 %s 不支持原地截图，已关闭帧缓冲池", cls.__name__)
+            return None
+        from src.utils.frame_pool import FramePool
+        return FramePool(max_per_shape=int(pool_cfg.get("max_per_shape", 4)))
+
+    def create_threshold_calibrator(self, controller: AndroidControllerBase):
+        """按 `threshold_calibration` 配置为控制器创建标定器，未启用或控制器不支持时返回 None"""
+        threshold_cfg = self.config.get("threshold_calibration", {})
+        if not threshold_cfg.get("enabled", False):
+            return None
+        from src.utils.threshold_calibrator import ThresholdCalibrator
+        if not ThresholdCalibrator.supports(controller):
+            logger.warning("控制器 %s 不支持原始截图或设置阈值，已关闭二值化阈值标定",
+                           type(controller).__name__)
+            return None
+        return ThresholdCalibrator.from_config(controller, threshold_cfg, threshold=self.tunables.bw_threshold)
+
+    def close_outcome_detector(self):
+        """等待后台检测完成并输出作答结果统计"""
+        if self.outcome_detector is not None:
+            self.outcome_detector.close()
+            logger.info("作答结果统计", extra=fields(**self.outcome_detector.stats()))
+
+    def start_config_watcher(self, interval: Optional[float] = None):
+        """监视配置文件，修改可调参数（阈值、裁剪比例、点击间隔、模型）后立即生效"""
+        if self.config_watcher is not None:
+            return
+        if interval is None:
+            interval = self.config.get("app", {}).get("hot_reload_interval", 1.0)
+        self.config_watcher = cfg_loader.ConfigWatcher(self._on_config_change, self.config_path, interval)
+        self.config_watcher.start()
+        logger.info("监视配置文件 %s", self.config_watcher.path)
+
+    def stop_config_watcher(self):
+        if self.config_watcher is not None:
+            self.config_watcher.stop()
+            self.config_watcher = None
+
+    def _on_config_change(self, old: cfg_loader.FrozenConfig, new: cfg_loader.FrozenConfig):
+        """配置文件被修改：应用可调参数，其余字段提示需要重启"""
+        self.apply_tunables(cfg_loader.Tunables.from_config(new))
+        self.config = new
+        restart_needed = [key for key in cfg_loader.changed_keys(old, new)
+                          if key not in cfg_loader.Tunables.KEYS.values()]
+        if restart_needed:
+            logger.warning("以下配置修改需要重启后生效: %s", ", ".join(restart_needed))
+
+    def apply_tunables(self, tunables: cfg_loader.Tunables):
+        """应用与当前取值不同的可调参数"""
+        controllers = [s.controller for s in self._async_sessions] or [self.android_controller]
+        applied = {}
+        for name, value in self.tunables.changes(tunables).items():
+            try:
+                if name == "bw_threshold":
+                    for controller in controllers:
+                        controller.set_bw_threshold(value)
+                elif name == "crop_ratios":
+                    for controller in controllers:
+                        controller.set_crop_ratios(*value)
+                elif name == "click_delay":
+                    self.set_click_delay(value)
+                elif name == "model":
+                    self.answer_generator.set_model(value)
+            except NotImplementedError:
+                logger.warning("当前实现不支持热更新 %s", cfg_loader.Tunables.KEYS[name])
+                continue
+            applied[name] = value
+        self.tunables = tunables
+        if applied:
+            logger.info("配置已热更新", extra=fields(**applied))
+
     def set_debug_mode(self, enabled: bool):
         """设置调试模式"""
         self.debug_mode = enabled
@@ -167,6 +501,8 @@ class QuizBot:
     def set_click_delay(self, delay: float):
         """设置点击后等待时间"""
         self.click_delay = delay
+        for session in self._async_sessions:
+            session.click_delay = delay
     
     def set_crop_ratios(self, left: float, top: float, right: float, bottom: float):
         """设置截图裁剪比例"""
@@ -0,0 +1,77 @@
+"""
+后端注册表
+控制器、题目提取器与答案生成器按名称登记为 "模块:属性" 字符串，只在配置选中时才导入，
+使得导入 `src` 不会加载 win32、PaddleOCR 或 openai 等重量级依赖
+
+用法:
+    from src.core import registry
+    controller_cls = registry.controllers.get("adb")
+    registry.controllers.register("scrcpy", "my_pkg.scrcpy_controller:ScrcpyController")
+"""
+import importlib
+import threading
+from typing import Any, Dict, List
+
+
+class Registry:
+    """名称到 "模块:属性" 的映射，首次 get 时导入并缓存"""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self._targets: Dict[str, str] = {}
+        self._loaded: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, target: str):
+        """
+        登记一个后端，已存在的同名后端会被替换
+
+        Args:
+            name: 配置中使用的名称
+            target: "包.模块:类名"
+        """
+        if ":" not in target:
+            raise ValueError(f"后端路径应为 '模块:属性' 格式: {target}")
+        with self._lock:
+            self._targets[name] = target
+            self._loaded.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """
+        导入并返回名为 name 的后端
+
+        Raises:
+            KeyError: 未登记该名称
+            ImportError: 后端或其依赖无法导入
+        """
+        with self._lock:
+            if name in self._loaded:
+                return self._loaded[name]
+            if name not in self._targets:
+                raise KeyError(f"未知的{self.kind}: {name!r}，可用: {', '.join(self.names())}")
+            target = self._targets[name]
+        module_name, _, attr = target.partition(":")
+        obj = getattr(importlib.import_module(module_name), attr)
+        with self._lock:
+            self._loaded[name] = obj
+        return obj
+
+    def names(self) -> List[str]:
+        return sorted(self._targets)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._targets
+
+
+controllers = Registry("控制器")
+controllers.register("adb", "src.controllers.adb_controller:ADBController")
+controllers.register("replay", "src.controllers.replay_controller:ReplayController")
+controllers.register("bluestacks", "src.controllers.bluestack_controller:AndroidController")
+
+extractors = Registry("题目提取器")
+extractors.register("paddleocr", "src.extractors.ocr_extractor:QuestionExtractor")
+extractors.register("remote", "src.extractors.remote_extractor:RemoteQuestionExtractor")
+
+generators = Registry("答案生成器")
+generators.register("openai", "src.generators.openai_generator:AnswerGenerator")
+generators.register("ensemble", "src.generators.ensemble_generator:EnsembleGenerator")
@@ -1,6 +1,19 @@
 """
 题目提取器模块
+
+提取器在首次访问时才导入，避免导入包时加载 NumPy 与 PaddleOCR。
+按配置选择实现时使用 `src.core.registry.extractors`。
 """
-from .ocr_extractor import QuestionExtractor
+import importlib
+
+_LAZY = {
+    'QuestionExtractor': '.ocr_extractor',
+}
 
 __all__ = ['QuestionExtractor']
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        return getattr(importlib.import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,23 +2,36 @@
 题目获取模块
 负责从图像中提取题目和选项
 """
-from paddleocr import PaddleOCR
 import numpy as np
-from typing import List, Tuple, Union
+from typing import Callable, List, Optional, Tuple, Union
 from PIL import Image
 from src.core.base import QuestionExtractorBase
+from src.utils import metrics
+from src.utils.log import get_logger
+from src.utils.text_normalize import is_option_marker, strip_option_marker
+
+logger = get_logger(__name__)
+
+
+def _as_array(image) -> np.ndarray:
+    """PIL 图像转换为数组；已经是数组（缓冲池中的预处理结果）时原样返回"""
+    return image if isinstance(image, np.ndarray) else np.array(image)
 
 
 class QuestionExtractor(QuestionExtractorBase):
     """题目提取器 - 使用OCR技术从截图中提取题目和选项"""
     
-    def __init__(self, ocr_version: str = "PP-OCRv4"):
+    def __init__(self, ocr_version: str = "PP-OCRv4", debug: bool = False):
         """
         初始化OCR模型
         
         Args:
             ocr_version: 使用的PPOCR模型版本 (如 "PP-OCRv3" / "PP-OCRv4")
+            debug: 是否输出并保存每帧的原始OCR结果（output 目录）
         """
+        # 延迟导入：只用到后处理（基准、回放评估）时无需安装 PaddleOCR
+        from paddleocr import PaddleOCR
+
         self.ocr = PaddleOCR(
             lang="ch",
             use_doc_orientation_classify=False, 
@@ -27,49 +40,123 @@ class QuestionExtractor(QuestionExtractorBase):
             ocr_version=ocr_version
             )
         self.merge_threshold = 20  # 合并文本框的距离阈值
+        self.debug = debug
     
     def extract_question(self, image: Image.Image) -> Tuple[str, List]:
         """
         从图像中提取题目和选项
         
         Args:
-            image: PIL图像对象
+            image: PIL图像对象，或缓冲池中的 (高, 宽, 3) 数组（直接交给 OCR，不再复制）
             
         Returns:
             (question_body, ocr_results): 格式化的题目文本和OCR原始结果
         """
         # 转换为numpy数组
-        img_array = np.array(image)
-        
-        # OCR识别
-        result = self.ocr.predict(img_array)
-        
-        for res in result:
-            res.print()
-            res.save_to_img("output")
-            res.save_to_json("output")
+        img_array = _as_array(image)
+        return self._postprocess(self._predict(img_array))
+
+    def extract_question_streaming(self, image: Image.Image,
+                                   on_question: Callable[[str], None]) -> Tuple[str, List]:
+        """
+        分段识别：先识别题干区域并回调，再识别选项区域
+
+        题干与第一个选项之间有明显的空白行，按行投影找到该分界后分两次 OCR，
+        调用方可以在选项识别期间提前查询答案库或预热 LLM 连接。
+        找不到分界时退化为整体识别。
+
+        Args:
+            image: PIL图像对象或 (高, 宽, 3) 数组
+            on_question: 题干识别完成后的回调，参数为题干文本
+
+        Returns:
+            与 extract_question 相同的 (question_body, ocr_results)
+        """
+        img_array = _as_array(image)
+        split_y = self._find_question_split(img_array)
+        if split_y is None:
+            return self.extract_question(img_array)
+
+        # 1. 题干区域
+        question_results = self._predict(img_array[:split_y], "ocr.inference.question")
+        question_text = ''.join(text.strip() for _, text in self._sort_and_merge_lines(question_results))
+        if question_text:
+            on_question(question_text)
+
+        # 2. 选项区域，bbox 平移回整图坐标
+        option_results = [
+            ([[x, y + split_y] for x, y in bbox], text)
+            for bbox, text in self._predict(img_array[split_y:], "ocr.inference.options")
+        ]
+
+        return self._postprocess(question_results + option_results)
+
+    def _predict(self, img_array: np.ndarray, timer: str = "ocr.inference") -> List[Tuple[List, str]]:
+        """
+        对一张图做检测与识别，返回统一格式的 [(bbox, text)]
+
+        子类（如 RemoteQuestionExtractor）覆盖此方法更换推理方式，排序、合并与分类等后处理共用。
+        """
+        # OCR识别（PaddleOCR 3.x 的 predict 一次完成检测与识别，无法分开计时）
+        with metrics.timer(timer):
+            result = self.ocr.predict(img_array)
+
+        if self.debug:
+            for res in result:
+                res.print()
+                res.save_to_img("output")
+                res.save_to_json("output")
 
         # 合并相近的文本框
-        normalized_results = self._normalize_ocr_results(result)
-        
-        print(f"Normalized OCR Results: {normalized_results}")
+        with metrics.timer("ocr.normalize"):
+            return self._normalize_ocr_results(result)
+
+    def _find_question_split(self, img_array: np.ndarray, min_gap: int = 50) -> Optional[int]:
+        """
+        用行投影找到题干块与选项之间的分界行
+
+        Args:
+            img_array: 二值化后的图像数组（白底黑字）
+            min_gap: 视为题干结束的最小空白行数，与 _filter_and_classify 的题干行距阈值一致
+
+        Returns:
+            分界行的 Y 坐标，找不到时返回 None
+        """
+        gray = img_array.min(axis=2) if img_array.ndim == 3 else img_array
+        ink_rows = np.flatnonzero((gray < 128).mean(axis=1) > 0.002)
+        if ink_rows.size < 2:
+            return None
+
+        # 相邻有墨迹行之间的空白长度，第一个足够大的空白即题干结束处
+        gaps = np.diff(ink_rows)
+        big = np.flatnonzero(gaps > min_gap)
+        if big.size == 0:
+            return None
+        first = big[0]
+        return int((ink_rows[first] + ink_rows[first + 1]) // 2)
+
+    def _postprocess(self, normalized_results: List[Tuple[List, str]]) -> Tuple[str, List]:
+        """对统一格式的OCR结果排序、分类并格式化为题目文本和兼容结果"""
+        logger.debug("Normalized OCR Results: %s", normalized_results)
         
         # 按Y坐标排序并合并同一行的文本
-        sorted_results = self._sort_and_merge_lines(normalized_results)
+        with metrics.timer("ocr.sort_merge"):
+            sorted_results = self._sort_and_merge_lines(normalized_results)
         
-        print(f"Sorted and Merged by Line: {sorted_results}")
+        logger.debug("Sorted and Merged by Line: %s", sorted_results)
         
         # 过滤选项标记并分离题目和选项
-        filtered_results = self._filter_and_classify(sorted_results)
+        with metrics.timer("ocr.classify"):
+            filtered_results = self._filter_and_classify(sorted_results)
         
-        print(f"Filtered Results: {filtered_results}")
+        logger.debug("Filtered Results: %s", filtered_results)
         
         # 格式化题目
-        question_body = self._format_question_v2(filtered_results)
-        
         # 转换为兼容格式：[题目, 选项1, 选项2, ...]
         # 每个元素是 (bbox, text) 元组
-        compatible_results = self._convert_to_compatible_format(filtered_results, sorted_results)
+        with metrics.timer("ocr.format"):
+            question_body = self._format_question_v2(filtered_results)
+            compatible_results = self._convert_to_compatible_format(filtered_results, sorted_results)
         
         return question_body, compatible_results
 
@@ -321,14 +408,14 @@ class QuestionExtractor(QuestionExtractorBase):
         if not results:
             return {'question': '', 'options': []}
         
-        # 过滤掉单个字母的选项标记（A、B、C、D）
+        # 过滤掉单独成块的选项标记（A、B.、（C） 等）
         filtered = []
         for bbox, text in results:
             # 去除空白
             text = text.strip()
             
-            # 过滤空文本或纯字母文本
-            if text and not (len(text) == 1 and text.isalpha()):
+            # 过滤空文本或纯标记文本；单个汉字（如 "是"/"否"）是有效选项
+            if text and not is_option_marker(text):
                 filtered.append((bbox, text))
         
         if not filtered:
@@ -365,8 +452,8 @@ class QuestionExtractor(QuestionExtractorBase):
         # 合并题目文本
         question_text = ''.join([text for _, text in question_parts])
         
-        # 剩余的是选项
-        options = [text for _, text in filtered[option_start_idx:]]
+        # 剩余的是选项，与选项文本合并到同一行的标记（"A.红楼梦"）一并去掉
+        options = [strip_option_marker(text) for _, text in filtered[option_start_idx:]]
         
         return {'question': question_text, 'options': options}
     
@@ -0,0 +1,369 @@
+"""
+本地 OCR 推理服务
+同一台机器上运行多个 QuizBot 进程时，每个进程各自加载一份 PaddleOCR，内存占用成倍增加，
+推理线程也互相争抢 CPU。该服务独占模型，各进程通过 RemoteQuestionExtractor 发送预处理后的图像；
+服务端把 max_wait_ms 内到达的并发请求合并为一批，一次调用 predict
+
+排序、合并与分类等后处理仍在客户端完成（合并阈值等参数按实例设置），服务端只返回 [(bbox, text)]。
+
+用法:
+    python main.py ocr-server                                    # 按 config.yaml 的 ocr.server 监听
+    python -m src.extractors.ocr_server --address unix:/tmp/quiz_ocr.sock --max-batch 8
+
+协议（HTTP/1.1，支持 keep-alive）:
+    POST /predict   请求体为 uint8 像素，头部 X-Shape: 高,宽,通道
+                    返回 {"results": [[bbox, text], ...], "batch": 本批大小}
+    GET /stats      批处理统计
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
+
+from src.utils import metrics
+from src.utils.log import fields, get_logger
+
+# `python main.py ocr-server` 解析参数时不必导入 NumPy
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = get_logger(__name__)
+
+DEFAULT_SERVER_CONFIG = {
+    "address": "127.0.0.1:8866",   # HOST:PORT，或 unix:/路径（仅类 Unix 系统）
+    "timeout": 10.0,               # 客户端等待一次识别的超时（秒）
+    "max_batch": 8,                # 每批最多合并的请求数
+    "max_wait_ms": 5.0,            # 收到第一个请求后等待凑批的最长时间
+}
+
+# 单个请求的像素上限，防止错误的 X-Shape 让服务端分配过大的缓冲区
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+
+
+def parse_address(address: str) -> Tuple[str, object]:
+    """
+    解析服务地址
+
+    Returns:
+        ("unix", 套接字路径) 或 ("tcp", (主机, 端口))
+    """
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:"):]
+    host, _, port = address.removeprefix("http://").rstrip("/").rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"OCR 服务地址应为 HOST:PORT 或 unix:/路径: {address}")
+    return "tcp", (host, int(port))
+
+
+class _Request:
+    __slots__ = ("array", "enqueued", "done", "results", "batch", "error")
+
+    def __init__(self, array: np.ndarray):
+        self.array = array
+        self.enqueued = time.monotonic()
+        self.done = threading.Event()
+        self.results = None
+        self.batch = 0
+        self.error: Optional[BaseException] = None
+
+
+class MicroBatcher:
+    """把并发提交的图像合并成小批，在单个推理线程中调用 predict_batch
+
+    推理线程取到第一个请求后最多再等 max_wait 秒，或凑满 max_batch 个请求后立即推理；
+    负载低时每批只有一个请求，延迟只增加一次队列交接。
+    """
+
+    def __init__(self, predict_batch: Callable[[List[np.ndarray]], List[list]],
+                 max_batch: int = 8, max_wait: float = 0.005):
+        self.predict_batch = predict_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+        self.batch_sizes = [0] * (max_batch + 1)
+        self.wait = metrics.Histogram()
+        self.inference = metrics.Histogram()
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="ocr-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, array: np.ndarray, timeout: Optional[float] = None) -> Tuple[list, int]:
+        """
+        提交一张图并等待结果
+
+        Returns:
+            ([(bbox, text)], 所在批的大小)
+        """
+        request = _Request(array)
+        self._queue.put(request)
+        if not request.done.wait(timeout):
+            raise TimeoutError("OCR 推理超时")
+        if request.error is not None:
+            raise request.error
+        return request.results, request.batch
+
+    def _collect(self, first: _Request) -> List[_Request]:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                self._queue.put(None)
+                break
+            batch.append(request)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            started = time.monotonic()
+            try:
+                results = self.predict_batch([r.array for r in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"批推理返回 {len(results)} 个结果，应为 {len(batch)}")
+                error = None
+            except Exception as e:
+                logger.exception("OCR 批推理失败: %s", e)
+                results, error = [None] * len(batch), e
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self.requests += len(batch)
+                self.batches += 1
+                self.errors += error is not None
+                self.batch_sizes[len(batch)] += 1
+                self.inference.record(elapsed)
+                for request in batch:
+                    self.wait.record(started - request.enqueued)
+            for request, result in zip(batch, results):
+                request.results, request.batch, request.error = result, len(batch), error
+                request.array = None
+                request.done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "batches": self.batches,
+                "errors": self.errors,
+                "mean_batch": round(self.requests / self.batches, 2) if self.batches else 0.0,
+                "batch_sizes": {n: c for n, c in enumerate(self.batch_sizes) if c},
+                "wait_p50_ms": round(self.wait.percentile(50) * 1000, 2),
+                "wait_p95_ms": round(self.wait.percentile(95) * 1000, 2),
+                "inference_p50_ms": round(self.inference.percentile(50) * 1000, 2),
+                "inference_p95_ms": round(self.inference.percentile(95) * 1000, 2),
+            }
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5.0)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class OCRServer:
+    """独占 PaddleOCR 模型的 HTTP 服务，监听 TCP 端口或 Unix 套接字"""
+
+    def __init__(self, ocr, normalize: Callable[[list], list], address: str = "127.0.0.1:8866",
+                 max_batch: int = 8, max_wait: float = 0.005, timeout: float = 30.0):
+        """
+        Args:
+            ocr: PaddleOCR 实例（predict 接受图像列表，每张图返回一个结果）
+            normalize: 把单张图的 predict 结果转换为 [(bbox, text)]，即 QuestionExtractor._normalize_ocr_results
+            address: HOST:PORT（端口为 0 时自动分配）或 unix:/路径
+            max_batch: 每批最多合并的请求数
+            max_wait: 凑批的最长等待（秒）
+            timeout: 单个请求在服务端等待推理的上限（秒）
+        """
+        self.ocr = ocr
+        self.normalize = normalize
+        self.address = address
+        self.timeout = timeout
+        self.batcher = MicroBatcher(self._predict_batch, max_batch=max_batch, max_wait=max_wait)
+        kind, target = parse_address(address)
+        handler = self._handler_class()
+        if kind == "unix":
+            if os.path.exists(target):
+                os.unlink(target)  # 上次未正常退出留下的套接字文件
+            self._httpd = _UnixHTTPServer(target, handler)
+        else:
+            self._httpd = ThreadingHTTPServer(target, handler)
+            self._httpd.daemon_threads = True
+            # 端口为 0 时换成实际分配的端口
+            self.address = "%s:%d" % self._httpd.server_address[:2]
+        self._unix_path = target if kind == "unix" else None
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, ocr, normalize: Callable[[list], list], server_config: Optional[dict] = None,
+                    **overrides) -> "OCRServer":
+        """根据 `ocr.server` 配置创建服务，overrides 中非 None 的值优先"""
+        cfg = {**DEFAULT_SERVER_CONFIG, **(server_config or {})}
+        cfg.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(ocr, normalize, address=str(cfg["address"]), max_batch=int(cfg["max_batch"]),
+                   max_wait=float(cfg["max_wait_ms"]) / 1000)
+
+    def _predict_batch(self, arrays: List[np.ndarray]) -> List[list]:
+        with metrics.timer("ocr_server.inference"):
+            results = list(self.ocr.predict(arrays))
+        return [self.normalize([result]) for result in results]
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, fmt, *args):
+                logger.debug("[OCR 服务] " + fmt, *args)
+
+            def _reply(self, status: int, payload: dict):
+                body = json.dumps(payload, ensure_ascii=False, default=_jsonable).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == "/stats":
+                    self._reply(200, server.stats())
+                else:
+                    self._reply(404, {"error": "not found"})
+
+            def do_POST(self):
+                if self.path != "/predict":
+                    self._reply(404, {"error": "not found"})
+                    return
+                try:
+                    array = self._read_image()
+                except ValueError as e:
+                    self.close_connection = True
+                    self._reply(400, {"error": str(e)})
+                    return
+                try:
+                    results, batch = server.batcher.submit(array, timeout=server.timeout)
+                except Exception as e:
+                    self._reply(500, {"error": f"{type(e).__name__}: {e}"})
+                    return
+                self._reply(200, {"results": results, "batch": batch})
+
+            def _read_image(self) -> np.ndarray:
+                """按 X-Shape 把请求体直接 readinto 到数组中"""
+                import numpy as np
+
+                try:
+                    shape = tuple(int(n) for n in self.headers.get("X-Shape", "").split(","))
+                    length = int(self.headers.get("Content-Length", "0"))
+                except ValueError:
+                    raise ValueError("X-Shape 或 Content-Length 无效") from None
+                if len(shape) not in (2, 3) or min(shape) <= 0:
+                    raise ValueError(f"X-Shape 应为 高,宽[,通道]: {shape}")
+                nbytes = shape[0] * shape[1] * (shape[2] if len(shape) == 3 else 1)
+                if nbytes != length or nbytes > MAX_REQUEST_BYTES:
+                    raise ValueError(f"请求体长度 {length} 与 X-Shape {shape} 不符")
+                array = np.empty(shape, dtype=np.uint8)
+                view = memoryview(array).cast("B")
+                read = 0
+                while read < nbytes:
+                    n = self.rfile.readinto(view[read:])
+                    if not n:
+                        raise ValueError("请求体不完整")
+                    read += n
+                return array
+
+        return Handler
+
+    def start(self):
+        """在后台线程中开始服务（测试、基准用）"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="ocr-server", daemon=True)
+        self._thread.start()
+
+    def serve_forever(self):
+        logger.info("OCR 服务已启动", extra=fields(address=self.address, max_batch=self.batcher.max_batch,
+                                                  max_wait_ms=self.batcher.max_wait * 1000))
+        self._httpd.serve_forever()
+
+    def stats(self) -> dict:
+        return self.batcher.stats()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self.batcher.close()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+        if self._unix_path and os.path.exists(self._unix_path):
+            os.unlink(self._unix_path)
+        logger.info("OCR 服务已停止", extra=fields(**self.stats()))
+
+
+def _jsonable(value):
+    """numpy 标量与数组（部分 PaddleOCR 版本的 bbox）转换为 JSON 类型"""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"无法序列化 {type(value).__name__}")
+
+
+def run(config: Optional[dict] = None, address: Optional[str] = None, max_batch: Optional[int] = None,
+        max_wait_ms: Optional[float] = None):
+    """加载 PaddleOCR 并阻塞运行服务，Ctrl+C 退出"""
+    from src.extractors.ocr_extractor import QuestionExtractor
+
+    config = config or {}
+    ocr_cfg = config.get("ocr", {})
+    extractor = QuestionExtractor(ocr_version=ocr_cfg.get("ocr_version", "PP-OCRv4"))
+    server = OCRServer.from_config(extractor.ocr, extractor._normalize_ocr_results, ocr_cfg.get("server"),
+                                   address=address, max_batch=max_batch, max_wait_ms=max_wait_ms)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("用户中断")
+    finally:
+        server.stop()
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--config", help="配置文件路径，默认使用当前目录的 config.yaml")
+    parser.add_argument("--address", help="监听地址 HOST:PORT 或 unix:/路径，默认取 ocr.server.address")
+    parser.add_argument("--max-batch", type=int, help="每批最多合并的请求数")
+    parser.add_argument("--max-wait-ms", type=float, help="凑批的最长等待（毫秒）")
+
+
+def main(argv=None):
+    from src.core import config as cfg_loader
+    from src.utils.log import setup_logging, shutdown_logging
+
+    parser = argparse.ArgumentParser(description="本地 OCR 推理服务")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    config = cfg_loader.load_config(args.config)
+    setup_logging(config.get("logging"))
+    try:
+        run(config, args.address, args.max_batch, args.max_wait_ms)
+    finally:
+        shutdown_logging()
+
+
+if __name__ == "__main__":
+    main()
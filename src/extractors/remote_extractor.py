@@ -0,0 +1,106 @@
+"""
+OCR 服务客户端
+把预处理后的图像发给本地 OCR 服务（src/extractors/ocr_server.py）识别，本进程不加载 PaddleOCR；
+排序、合并与分类等后处理沿用 QuestionExtractor
+"""
+import http.client
+import json
+import socket
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.extractors.ocr_extractor import QuestionExtractor
+from src.extractors.ocr_server import DEFAULT_SERVER_CONFIG, parse_address
+from src.utils import metrics
+from src.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """经 Unix 套接字的 HTTP 连接"""
+
+    def __init__(self, path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+class RemoteQuestionExtractor(QuestionExtractor):
+    """题目提取器 - 由本地 OCR 服务完成检测与识别
+
+    每个线程一条 keep-alive 连接，流水线与 asyncio 运行器可以并发调用；
+    服务端关闭空闲连接后自动重连一次。
+    """
+
+    def __init__(self, address: str = DEFAULT_SERVER_CONFIG["address"], timeout: float = 10.0,
+                 debug: bool = False):
+        """
+        Args:
+            address: OCR 服务地址，HOST:PORT 或 unix:/路径
+            timeout: 单次识别的超时（秒）
+            debug: 是否打印每帧的识别结果
+        """
+        self.address = address
+        self.timeout = timeout
+        self.merge_threshold = 20  # 合并文本框的距离阈值
+        self.debug = debug
+        self._kind, self._target = parse_address(address)
+        self._local = threading.local()
+
+    @classmethod
+    def from_config(cls, ocr_config: Optional[dict] = None, debug: bool = False) -> "RemoteQuestionExtractor":
+        """根据 `ocr` 配置创建客户端，服务地址与超时取自 ocr.server"""
+        cfg = {**DEFAULT_SERVER_CONFIG, **((ocr_config or {}).get("server") or {})}
+        return cls(address=str(cfg["address"]), timeout=float(cfg["timeout"]), debug=debug)
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self._kind == "unix":
+                conn = _UnixHTTPConnection(self._target, timeout=self.timeout)
+            else:
+                conn = http.client.HTTPConnection(*self._target, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _reset_connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _predict(self, img_array: np.ndarray, timer: str = "ocr.inference") -> List[Tuple[List, str]]:
+        """把像素原样发给 OCR 服务，返回 [(bbox, text)]"""
+        arr = np.ascontiguousarray(img_array, dtype=np.uint8)
+        headers = {"Content-Type": "application/octet-stream", "X-Shape": ",".join(map(str, arr.shape))}
+        with metrics.timer(timer):
+            for attempt in range(2):
+                conn = self._connection()
+                try:
+                    conn.request("POST", "/predict", body=memoryview(arr).cast("B"), headers=headers)
+                    response = conn.getresponse()
+                    body = response.read()
+                    break
+                except (ConnectionError, http.client.BadStatusLine):
+                    # keep-alive 连接已被服务端关闭（服务重启等），重连重试一次
+                    self._reset_connection()
+                    if attempt:
+                        raise
+                except Exception:
+                    self._reset_connection()
+                    raise
+        payload = json.loads(body)
+        if response.status != 200:
+            raise RuntimeError(f"OCR 服务返回 {response.status}: {payload.get('error')}")
+        results = [(bbox, text) for bbox, text in payload["results"]]
+        if self.debug:
+            logger.debug("OCR 服务结果（批大小 %d）: %s", payload.get("batch", 0), [text for _, text in results])
+        return results
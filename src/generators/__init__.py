@@ -1,6 +1,22 @@
 """
 答案生成器模块
+
+各生成器在首次访问时才导入，避免导入包时加载 openai SDK。
+按配置选择实现时使用 `src.core.registry.generators`。
 """
-from .openai_generator import AnswerGenerator
+import importlib
+
+_LAZY = {
+    'AnswerGenerator': '.openai_generator',
+    'EnsembleGenerator': '.ensemble_generator',
+    'CachedAnswerGenerator': '.cached_generator',
+    'AnswerBroker': '.answer_broker',
+}
+
+__all__ = ['AnswerGenerator', 'EnsembleGenerator', 'CachedAnswerGenerator', 'AnswerBroker']
+
 
-__all__ = ['AnswerGenerator']
+def __getattr__(name):
+    if name in _LAZY:
+        return getattr(importlib.import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
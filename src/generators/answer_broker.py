@@ -0,0 +1,231 @@
+"""
+答案请求合并模块
+多个设备会话共享一个生成器时，每道题都是一次单独的请求，且都携带同样长的系统提示词与示例对话。
+AnswerBroker 把短时间内从不同会话到达的题目合并为一次多题请求（`get_answers`），
+再把各题答案分发回各自调用方的 Future
+
+凑批窗口随截止时间自适应：窗口结束时间不晚于批内最早截止的题目减去预计请求耗时；
+最近题目到达的间隔普遍大于窗口时（单会话）不等待，直接发送。
+"""
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional
+
+from src.core.base import AnswerGeneratorBase
+from src.generators.call_policy import Deadline, DeadlineExceeded
+from src.utils import metrics
+from src.utils.log import fields, get_logger
+
+logger = get_logger(__name__)
+
+
+DEFAULT_BROKER_CONFIG = {
+    "max_batch": 8,              # 每次请求最多合并的题数
+    "max_wait_ms": 150.0,        # 收到第一道题后等待凑批的最长时间
+    "latency_estimate": 1.5,     # 还没有观测数据时预计的一次请求耗时（秒）
+    "max_inflight": 4,           # 同时在途的合并请求数
+}
+
+
+class _Pending:
+    __slots__ = ("body", "future", "arrived", "expires_at")
+
+    def __init__(self, body: str, budget: float):
+        self.body = body
+        self.future: Future = Future()
+        self.arrived = time.monotonic()
+        self.expires_at = self.arrived + budget
+
+
+class AnswerBroker(AnswerGeneratorBase):
+    """答案请求合并器 - 包装支持 `get_answers` 的生成器，跨会话合并并发的题目
+
+    同步调用（流水线、线程）在 `get_answer` 中等待结果，asyncio 会话通过 `get_answer_async`
+    等待同一个 Future；合并请求在后台线程池中发出，凑批与请求互不阻塞。
+    批内漏答的题单独重新询问。
+    """
+
+    def __init__(self, generator: AnswerGeneratorBase, max_batch: int = 8, max_wait: float = 0.15,
+                 deadline: Optional[float] = None, latency_estimate: float = 1.5, max_inflight: int = 4):
+        """
+        Args:
+            generator: 实际的生成器，需要实现 get_answers
+            max_batch: 每次请求最多合并的题数
+            max_wait: 收到第一道题后等待凑批的最长时间（秒）
+            deadline: 每道题从提交起的答题预算（秒），默认取生成器调用策略的 deadline
+            latency_estimate: 没有观测数据时预计的一次请求耗时（秒）
+            max_inflight: 同时在途的合并请求数
+        """
+        if type(generator).get_answers is AnswerGeneratorBase.get_answers:
+            raise TypeError(f"{type(generator).__name__} 不支持多题合并请求（get_answers）")
+        self.generator = generator
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        policy = getattr(generator, "policy", None)
+        self.deadline = deadline if deadline is not None else getattr(policy, "deadline", 10.0)
+        self.latency = latency_estimate   # 合并请求耗时的指数滑动平均
+        self.requests = 0
+        self.batches = 0
+        self.retries = 0
+        self.batch_sizes = [0] * (max_batch + 1)
+        self.wait = metrics.Histogram()
+        self._gaps: deque = deque(maxlen=16)
+        self._last_arrival: Optional[float] = None
+        self._pending: List[_Pending] = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=max_inflight, thread_name_prefix="answer-broker")
+        self._thread = threading.Thread(target=self._run, name="answer-broker", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_config(cls, generator: AnswerGeneratorBase, broker_config: Optional[dict] = None) -> "AnswerBroker":
+        """根据 `llm.broker` 配置包装生成器"""
+        cfg = {**DEFAULT_BROKER_CONFIG, **(broker_config or {})}
+        return cls(generator, max_batch=int(cfg["max_batch"]), max_wait=float(cfg["max_wait_ms"]) / 1000,
+                   latency_estimate=float(cfg["latency_estimate"]), max_inflight=int(cfg["max_inflight"]))
+
+    # ---- 提交 ----
+
+    def submit(self, question_body: str) -> Future:
+        """提交一道题，返回在答案到达时完成的 Future"""
+        pending = _Pending(question_body, self.deadline)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("AnswerBroker 已关闭")
+            if self._last_arrival is not None:
+                self._gaps.append(pending.arrived - self._last_arrival)
+            self._last_arrival = pending.arrived
+            self._pending.append(pending)
+            self._cond.notify()
+        return pending.future
+
+    def get_answer(self, question_body: str) -> str:
+        return self.submit(question_body).result()
+
+    async def get_answer_async(self, question_body: str) -> str:
+        import asyncio
+        return await asyncio.wrap_future(self.submit(question_body))
+
+    # ---- 凑批 ----
+
+    def _window_end(self) -> float:
+        """当前批的发送时间，调用时持有锁且 _pending 非空"""
+        first = self._pending[0]
+        # 最近到达间隔的中位数大于窗口时，等待也凑不到第二道题
+        if len(self._gaps) >= 4 and statistics.median(self._gaps) > self.max_wait:
+            return first.arrived
+        # 为最早截止的题留出一次请求（含 50% 余量）的时间
+        send_by = min(p.expires_at for p in self._pending) - self.latency * 1.5
+        return min(first.arrived + self.max_wait, send_by)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed and not self._pending:
+                    return
+                while len(self._pending) < self.max_batch and not self._closed:
+                    remaining = self._window_end() - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            self._executor.submit(self._dispatch, batch)
+
+    def _dispatch(self, batch: List[_Pending]):
+        started = time.monotonic()
+        deadline = Deadline(max(0.0, min(p.expires_at for p in batch) - started))
+        try:
+            answers = self.generator.get_answers([p.body for p in batch], deadline)
+        except Exception as e:
+            for pending in batch:
+                pending.future.set_exception(e)
+            return
+        elapsed = time.monotonic() - started
+        with self._cond:
+            self.requests += len(batch)
+            self.batches += 1
+            self.batch_sizes[len(batch)] += 1
+            for pending in batch:
+                self.wait.record(started - pending.arrived)
+            self.latency = 0.8 * self.latency + 0.2 * elapsed
+
+        missing = []
+        for pending, answer in zip(batch, answers):
+            if answer is None:
+                missing.append(pending)
+            else:
+                pending.future.set_result(answer)
+        if missing:
+            logger.warning("合并请求漏答 %d/%d 道题，单独重新询问", len(missing), len(batch))
+            for pending in missing:
+                self._retry(pending)
+
+    def _retry(self, pending: _Pending):
+        with self._cond:
+            self.retries += 1
+        budget = pending.expires_at - time.monotonic()
+        try:
+            if budget <= 0:
+                raise DeadlineExceeded("合并请求漏答且已没有剩余预算")
+            pending.future.set_result(self.generator.get_answers([pending.body], Deadline(budget))[0])
+        except Exception as e:
+            pending.future.set_exception(e)
+
+    # ---- 委托给实际生成器 ----
+
+    def extract_option_number(self, answer: str) -> int:
+        return self.generator.extract_option_number(answer)
+
+    def prefetch(self, question: str):
+        self.generator.prefetch(question)
+
+    def set_model(self, model: str):
+        self.generator.set_model(model)
+
+    def set_system_prompt(self, prompt: str):
+        self.generator.set_system_prompt(prompt)
+
+    def record_outcome(self, question_body: str, correct_option: int):
+        self.generator.record_outcome(question_body, correct_option)
+
+    def record_incorrect(self, question_body: str, wrong_option: int):
+        self.generator.record_incorrect(question_body, wrong_option)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "requests": self.requests,
+                "batches": self.batches,
+                "retries": self.retries,
+                "mean_batch": round(self.requests / self.batches, 2) if self.batches else 0.0,
+                "batch_sizes": {n: c for n, c in enumerate(self.batch_sizes) if c},
+                "wait_p50_ms": round(self.wait.percentile(50) * 1000, 1),
+                "wait_p95_ms": round(self.wait.percentile(95) * 1000, 1),
+                "latency_estimate_ms": round(self.latency * 1000, 1),
+            }
+
+    def get_stats(self) -> dict:
+        return {**self.generator.get_stats(), "answer_broker": self.stats()}
+
+    def _shutdown(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout=5.0)
+        self._executor.shutdown(wait=True)
+        logger.info("答案请求合并", extra=fields(**self.stats()))
+
+    def close(self):
+        self._shutdown()
+        self.generator.close()
+
+    async def aclose(self):
+        import asyncio
+        await asyncio.to_thread(self._shutdown)
+        await self.generator.aclose()
@@ -0,0 +1,144 @@
+"""
+带答案库缓存的答案生成模块
+先查本地答案库（以及可选的只读题库），未命中再交给实际的生成器（LLM / 集成投票）
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from src.core.base import AnswerGeneratorBase
+from src.utils.answer_store import AnswerStore, parse_question_body
+from src.utils.question_bank import QuestionBank
+from src.utils.text_normalize import normalize_key
+from src.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class CachedAnswerGenerator(AnswerGeneratorBase):
+    """缓存答案生成器 - 包装任意生成器，命中答案库时不调用 LLM
+
+    支持推测式预取：题干识别出来后立即调用 `prefetch`，
+    在选项仍在 OCR 的同时完成答案库查询；选项到达后直接比对候选答案。
+    """
+
+    def __init__(self, generator: AnswerGeneratorBase, store: AnswerStore, bank: Optional[QuestionBank] = None):
+        """
+        Args:
+            generator: 未命中缓存时使用的实际生成器
+            store: 本地答案库
+            bank: 多个实例共享的只读题库，与答案库的候选记录合并，答案库（本机新写入的记录）优先
+        """
+        self.generator = generator
+        self.store = store
+        self.bank = bank
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="answer-prefetch")
+        self._prefetched: Optional[Tuple[str, Future]] = None
+
+    def prefetch(self, question: str):
+        """题干已识别、选项尚未识别时调用：后台查询答案库并预热实际生成器"""
+        key = normalize_key(question)
+        self._prefetched = (key, self._executor.submit(self._lookup, question))
+        self.generator.prefetch(question)
+
+    def _lookup(self, question: str) -> List[Tuple[str, str, int]]:
+        """按题干查询答案库与只读题库的全部候选记录"""
+        candidates = self.store.lookup_question(question)
+        if self.bank is not None:
+            candidates += self.bank.lookup_question(question)
+        return candidates
+
+    def _candidates(self, question: str) -> List[Tuple[str, str, int]]:
+        """优先使用预取结果，题干对不上时重新查询"""
+        prefetched, self._prefetched = self._prefetched, None
+        if prefetched is not None and prefetched[0] == normalize_key(question):
+            return prefetched[1].result()
+        return self._lookup(question)
+
+    def get_answer(self, question_body: str) -> str:
+        """
+        获取题目答案，优先使用答案库
+
+        Args:
+            question_body: 格式化的题目字符串
+
+        Returns:
+            答案文本，缓存命中时形如 "<Answer>2. 选项内容"
+        """
+        question, options = parse_question_body(question_body)
+        option_number = AnswerStore.match_candidates(self._candidates(question), options)
+        if option_number is not None:
+            self.cache_hits += 1
+            logger.debug("答案库命中: 选项 %d", option_number)
+            return f"<Answer>{option_number}. {options[option_number - 1]}"
+
+        self.cache_misses += 1
+        answer = self.generator.get_answer(question_body)
+        option_number = self.generator.extract_option_number(answer)
+        if options and 1 <= option_number <= len(options):
+            self.store.put(question, options, options[option_number - 1], source="llm")
+        return answer
+
+    async def get_answer_async(self, question_body: str) -> str:
+        """get_answer 的异步版本：答案库查询放到线程池，未命中时调用实际生成器的异步接口"""
+        import asyncio
+
+        question, options = parse_question_body(question_body)
+        candidates = await asyncio.to_thread(self._lookup, question)
+        option_number = AnswerStore.match_candidates(candidates, options)
+        if option_number is not None:
+            self.cache_hits += 1
+            return f"<Answer>{option_number}. {options[option_number - 1]}"
+
+        self.cache_misses += 1
+        answer = await self.generator.get_answer_async(question_body)
+        option_number = self.generator.extract_option_number(answer)
+        if options and 1 <= option_number <= len(options):
+            await asyncio.to_thread(self.store.put, question, options, options[option_number - 1], "llm")
+        return answer
+
+    def extract_option_number(self, answer: str) -> int:
+        return self.generator.extract_option_number(answer)
+
+    def set_model(self, model: str):
+        self.generator.set_model(model)
+
+    def set_system_prompt(self, prompt: str):
+        self.generator.set_system_prompt(prompt)
+
+    def record_outcome(self, question_body: str, correct_option: int):
+        """写入已验证记录，之后同一题直接命中答案库"""
+        question, options = parse_question_body(question_body)
+        if options and 1 <= correct_option <= len(options):
+            self.store.put(question, options, options[correct_option - 1], source="verified", verified=True)
+            logger.debug("答案库写入已验证答案: 选项 %d", correct_option)
+        self.generator.record_outcome(question_body, correct_option)
+
+    def record_incorrect(self, question_body: str, wrong_option: int):
+        """删除与错误答案一致的未验证记录，下次重新询问 LLM"""
+        question, options = parse_question_body(question_body)
+        if options and 1 <= wrong_option <= len(options):
+            self.store.discard(question, options, options[wrong_option - 1])
+        self.generator.record_incorrect(question_body, wrong_option)
+
+    def get_stats(self) -> dict:
+        return {**self.generator.get_stats(),
+                "answer_store": {"hits": self.cache_hits, "misses": self.cache_misses,
+                                 "records": len(self.store),
+                                 "bank_records": len(self.bank) if self.bank is not None else 0}}
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.generator.close()
+        self._close_stores()
+
+    async def aclose(self):
+        self._executor.shutdown(wait=False)
+        await self.generator.aclose()
+        self._close_stores()
+
+    def _close_stores(self):
+        self.store.close()
+        if self.bank is not None:
+            self.bank.close()
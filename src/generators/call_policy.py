@@ -0,0 +1,306 @@
+"""
+LLM 调用策略模块
+为每道题提供截止时间预算、抖动退避重试、按端点熔断以及备用模型降级
+"""
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from src.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+
+T = TypeVar("T")
+
+DEFAULT_POLICY_CONFIG = {
+    "deadline": 10.0,         # 每道题 LLM 调用的总预算（秒）
+    "max_attempts": 3,        # 预算内最多尝试次数
+    "backoff_base": 0.2,      # 退避基数（秒），按 2 的幂增长
+    "backoff_max": 2.0,       # 单次退避上限（秒）
+    "fallback_margin": 3.0,   # 剩余预算低于该值时改用备用模型（秒）
+    "breaker_failures": 3,    # 连续失败多少次后熔断该端点
+    "breaker_reset": 30.0,    # 熔断后多久允许半开试探（秒）
+}
+
+
+class DeadlineExceeded(Exception):
+    """在截止时间内未能得到结果"""
+
+
+class Deadline:
+    """截止时间 - 基于单调时钟的剩余预算"""
+
+    def __init__(self, budget: float):
+        self.expires_at = time.monotonic() + budget
+
+    def remaining(self) -> float:
+        """剩余秒数，已过期时返回 0"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+class CircuitBreaker:
+    """熔断器 - 连续失败达到阈值后短路请求，冷却后放行一次半开试探"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_started = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """当前是否允许向该端点发送请求；半开状态下同一时间只放行一次试探"""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == self.OPEN:
+                if now - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+            elif self.state == self.HALF_OPEN:
+                # 试探仍在进行；超过 reset_timeout 仍无结果（例如协程被取消）时视为丢失，重新试探
+                if self._probing and now - self.probe_started < self.reset_timeout:
+                    return False
+            else:
+                return True
+            self._probing = True
+            self.probe_started = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class EndpointStats:
+    """单个端点的调用结果统计"""
+
+    def __init__(self):
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.short_circuited = 0
+        self.total_latency = 0.0
+        self.last_error: Optional[str] = None
+
+    def as_dict(self) -> dict:
+        avg = self.total_latency / self.successes if self.successes else 0.0
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "short_circuited": self.short_circuited,
+            "avg_latency_ms": round(avg * 1000, 1),
+            "last_error": self.last_error,
+        }
+
+
+def _is_timeout(exc: Exception) -> bool:
+    """兼容 openai.APITimeoutError、httpx.TimeoutException 与内置 TimeoutError"""
+    return isinstance(exc, TimeoutError) or "Timeout" in type(exc).__name__
+
+
+class DeadlineCallPolicy:
+    """截止时间感知的调用策略
+
+    一次 `call` 共享同一个预算：失败后以全抖动指数退避重试，
+    端点熔断或剩余时间不足时自动切换到后备端点（更快的备用模型）。
+    """
+
+    def __init__(self, deadline: float = 10.0, max_attempts: int = 3,
+                 backoff_base: float = 0.2, backoff_max: float = 2.0,
+                 fallback_margin: float = 3.0, breaker_failures: int = 3,
+                 breaker_reset: float = 30.0):
+        self.deadline = deadline
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.fallback_margin = fallback_margin
+        self.breaker_failures = breaker_failures
+        self.breaker_reset = breaker_reset
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._stats: Dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, policy_config: Optional[dict] = None) -> "DeadlineCallPolicy":
+        """根据 `llm.policy` 配置创建策略"""
+        cfg = {**DEFAULT_POLICY_CONFIG, **(policy_config or {})}
+        return cls(
+            deadline=float(cfg["deadline"]),
+            max_attempts=int(cfg["max_attempts"]),
+            backoff_base=float(cfg["backoff_base"]),
+            backoff_max=float(cfg["backoff_max"]),
+            fallback_margin=float(cfg["fallback_margin"]),
+            breaker_failures=int(cfg["breaker_failures"]),
+            breaker_reset=float(cfg["breaker_reset"]),
+        )
+
+    def _breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            if endpoint not in self._breakers:
+                self._breakers[endpoint] = CircuitBreaker(self.breaker_failures, self.breaker_reset)
+                self._stats[endpoint] = EndpointStats()
+            return self._breakers[endpoint]
+
+    def _select(self, endpoints: List[str], remaining: float) -> Optional[str]:
+        """选择本次尝试的端点：剩余时间不足时优先后备端点，跳过已熔断端点"""
+        ordered = endpoints
+        if len(endpoints) > 1 and remaining < self.fallback_margin:
+            ordered = endpoints[1:] + endpoints[:1]
+        for endpoint in ordered:
+            if self._breaker(endpoint).allow():
+                return endpoint
+            with self._lock:
+                self._stats[endpoint].short_circuited += 1
+        return None
+
+    def _plan_attempt(self, endpoints: List[str], deadline: Deadline) -> Optional[Tuple[str, float]]:
+        """确定下一次尝试的端点与超时，预算耗尽或全部熔断时返回 None"""
+        remaining = deadline.remaining()
+        if remaining <= 0:
+            return None
+        endpoint = self._select(endpoints, remaining)
+        if endpoint is None:
+            return None
+
+        # 主端点需要为后备端点留出余量，避免慢响应吃光整个预算
+        timeout = remaining
+        if len(endpoints) > 1 and endpoint == endpoints[0] and remaining > self.fallback_margin:
+            timeout = remaining - self.fallback_margin
+        with self._lock:
+            self._stats[endpoint].calls += 1
+        return endpoint, timeout
+
+    def _record_success(self, endpoint: str, latency: float):
+        self._breaker(endpoint).record_success()
+        with self._lock:
+            stats = self._stats[endpoint]
+            stats.successes += 1
+            stats.total_latency += latency
+
+    def _record_failure(self, endpoint: str, attempt: int, exc: Exception):
+        self._breaker(endpoint).record_failure()
+        error = f"{type(exc).__name__}: {exc}"
+        with self._lock:
+            stats = self._stats[endpoint]
+            stats.failures += 1
+            stats.last_error = error
+            if _is_timeout(exc):
+                stats.timeouts += 1
+        logger.warning("LLM 调用失败 [%s] 第 %d 次: %s", endpoint, attempt, error)
+
+    def _backoff(self, attempt: int, deadline: Deadline) -> Optional[float]:
+        """全抖动指数退避时长；不再重试时返回 None"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1))))
+        if attempt == self.max_attempts or deadline.remaining() <= delay:
+            return None
+        return delay
+
+    def _exhausted(self, last_error: Optional[Exception]) -> DeadlineExceeded:
+        reason = f"最后错误: {last_error}" if last_error else "所有端点均已熔断"
+        return DeadlineExceeded(f"{self.deadline:.1f}s 预算内未获得答案 ({reason})")
+
+    def call(self, endpoints: List[str], fn: Callable[[str, float], T],
+             deadline: Optional[Deadline] = None) -> T:
+        """
+        在截止时间内调用 fn，直到成功或预算耗尽
+
+        Args:
+            endpoints: 端点列表，第一个为主端点，其余按顺序作为后备
+            fn: 实际请求函数 fn(endpoint, timeout)，timeout 为本次尝试可用的秒数
+            deadline: 外部传入的截止时间，默认按 `self.deadline` 新建
+
+        Returns:
+            fn 的返回值
+
+        Raises:
+            DeadlineExceeded: 预算耗尽、重试次数用尽或所有端点均已熔断
+        """
+        if deadline is None:
+            deadline = Deadline(self.deadline)
+
+        last_error: Optional[Exception] = None
+        for attempt in range(1, self.max_attempts + 1):
+            plan = self._plan_attempt(endpoints, deadline)
+            if plan is None:
+                break
+            endpoint, timeout = plan
+            start = time.monotonic()
+            try:
+                result = fn(endpoint, timeout)
+            except Exception as e:
+                last_error = e
+                self._record_failure(endpoint, attempt, e)
+            else:
+                self._record_success(endpoint, time.monotonic() - start)
+                return result
+
+            delay = self._backoff(attempt, deadline)
+            if delay is None:
+                break
+            time.sleep(delay)
+
+        raise self._exhausted(last_error) from last_error
+
+    async def call_async(self, endpoints: List[str], fn: Callable[[str, float], Awaitable[T]],
+                         deadline: Optional[Deadline] = None) -> T:
+        """`call` 的 asyncio 版本，fn 为协程函数，退避期间不阻塞事件循环"""
+        import asyncio
+
+        if deadline is None:
+            deadline = Deadline(self.deadline)
+
+        last_error: Optional[Exception] = None
+        for attempt in range(1, self.max_attempts + 1):
+            plan = self._plan_attempt(endpoints, deadline)
+            if plan is None:
+                break
+            endpoint, timeout = plan
+            start = time.monotonic()
+            try:
+                result = await asyncio.wait_for(fn(endpoint, timeout), timeout)
+            except Exception as e:
+                last_error = e
+                self._record_failure(endpoint, attempt, e)
+            else:
+                self._record_success(endpoint, time.monotonic() - start)
+                return result
+
+            delay = self._backoff(attempt, deadline)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+
+        raise self._exhausted(last_error) from last_error
+
+    def stats(self) -> Dict[str, dict]:
+        """返回各端点的调用统计"""
+        with self._lock:
+            return {
+                name: {**stat.as_dict(), "breaker": self._breakers[name].state}
+                for name, stat in self._stats.items()
+            }
@@ -0,0 +1,223 @@
+"""
+多模型投票答案生成模块
+并发询问多个模型，按权重对选项编号投票，截止时间到达时以已到达的票数给出答案
+"""
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+from src.core.base import AnswerGeneratorBase
+from src.generators.openai_generator import AnswerGenerator
+from src.generators.call_policy import DeadlineExceeded
+from src.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class EnsembleGenerator(AnswerGeneratorBase):
+    """集成答案生成器 - 多个模型并发作答，加权投票"""
+
+    def __init__(self, members: List[Tuple[str, AnswerGeneratorBase]],
+                 deadline: float = 8.0, weights_path: Optional[str] = None,
+                 prior_weights: Optional[Dict[str, float]] = None):
+        """
+        初始化集成生成器
+
+        Args:
+            members: [(成员名, 生成器), ...]，成员名用于记录权重，必须互不相同
+            deadline: 每道题的投票截止时间（秒），到时以已到达的票数决定
+            weights_path: 成员历史正确率的持久化文件，None 表示不持久化
+            prior_weights: 没有历史记录时各成员的初始权重，默认 1.0
+        """
+        if not members:
+            raise ValueError("集成生成器至少需要一个成员")
+        names = [name for name, _ in members]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            # 同名成员共用权重记录与在途调用，后一个会一直被当作"上一次调用未返回"而跳过
+            raise ValueError(f"集成成员名重复: {', '.join(duplicates)}；"
+                             "同一模型用于多个端点时请为每个成员设置 name")
+        self.members = members
+        self.deadline = deadline
+        self.weights_path = weights_path
+        self.prior_weights = prior_weights or {}
+
+        # 每个成员的 [答对次数, 参与次数]，用于学习权重
+        self.records: Dict[str, List[int]] = {name: [0, 0] for name, _ in members}
+        self._load_records()
+
+        # 最近若干题各成员的投票，等待 record_outcome 反馈正确答案
+        self._pending_votes: Dict[str, Dict[str, int]] = {}
+        # 各成员尚未返回的上一次调用；已开始执行的 future 无法取消，仍会占用该成员的工作线程
+        self._inflight: Dict[str, Future] = {}
+        self.skipped_busy: Dict[str, int] = {name: 0 for name, _ in members}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=len(members), thread_name_prefix="ensemble")
+
+    @classmethod
+    def from_config(cls, llm_config: dict) -> "EnsembleGenerator":
+        """
+        根据 `llm` 配置创建集成生成器
+
+        `llm.ensemble.members` 中每项可单独指定 name / model / api_key / base_url / weight，
+        未指定的字段继承 `llm` 顶层配置；name 缺省为模型名，必须互不相同。
+        """
+        ensemble_cfg = llm_config.get("ensemble", {})
+        members = []
+        prior_weights = {}
+        for member_cfg in ensemble_cfg.get("members", []):
+            model = member_cfg["model"]
+            name = member_cfg.get("name", model)
+            generator = AnswerGenerator(
+                model=model,
+                api_key=member_cfg.get("api_key", llm_config.get("api_key")),
+                base_url=member_cfg.get("base_url", llm_config.get("base_url")),
+                http_config=llm_config.get("http"),
+                policy_config={**llm_config.get("policy", {}), "deadline": ensemble_cfg.get("deadline", 8.0)},
+            )
+            members.append((name, generator))
+            prior_weights[name] = float(member_cfg.get("weight", 1.0))
+
+        return cls(
+            members,
+            deadline=float(ensemble_cfg.get("deadline", 8.0)),
+            weights_path=ensemble_cfg.get("weights_path"),
+            prior_weights=prior_weights,
+        )
+
+    def _load_records(self):
+        if not self.weights_path or not os.path.exists(self.weights_path):
+            return
+        try:
+            with open(self.weights_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            for name, record in saved.items():
+                if name in self.records:
+                    self.records[name] = [int(record[0]), int(record[1])]
+        except (OSError, ValueError, IndexError, TypeError) as e:
+            logger.warning("读取集成权重失败，使用初始权重: %s", e)
+
+    def _save_records(self):
+        if not self.weights_path:
+            return
+        tmp_path = self.weights_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.records, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.weights_path)
+
+    def weight(self, name: str) -> float:
+        """成员权重：拉普拉斯平滑后的历史正确率乘以初始权重"""
+        correct, total = self.records[name]
+        return self.prior_weights.get(name, 1.0) * (correct + 1) / (total + 2)
+
+    def _ask(self, generator: AnswerGeneratorBase, question_body: str) -> int:
+        answer = generator.get_answer(question_body)
+        return generator.extract_option_number(answer)
+
+    def get_answer(self, question_body: str) -> str:
+        """
+        并发询问所有成员并加权投票
+
+        Args:
+            question_body: 格式化的题目字符串
+
+        Returns:
+            形如 "<Answer>2" 的答案文本
+        """
+        start = time.monotonic()
+        futures = {}
+        with self._lock:
+            for name, generator in self.members:
+                previous = self._inflight.get(name)
+                if previous is not None and not previous.done():
+                    # 上一题的慢响应仍在进行，本题新提交只会排在它后面错过截止时间；
+                    # 跳过该成员，不计入投票，也不影响其正确率
+                    self.skipped_busy[name] += 1
+                    logger.debug("集成成员 %s 上一次调用仍未返回，本题跳过", name)
+                    continue
+                future = self._executor.submit(self._ask, generator, question_body)
+                self._inflight[name] = future
+                futures[future] = name
+        weights = {name: self.weight(name) for name, _ in self.members}
+        votes: Dict[str, int] = {}
+        tally: Dict[int, float] = {}
+        pending = set(futures)
+
+        while pending:
+            remaining = self.deadline - (time.monotonic() - start)
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures[future]
+                try:
+                    option = future.result()
+                except Exception as e:
+                    logger.warning("集成成员 %s 作答失败: %s", name, e)
+                    continue
+                votes[name] = option
+                tally[option] = tally.get(option, 0.0) + weights[name]
+
+            # 领先选项的票数已无法被剩余成员反超时提前结束
+            if tally:
+                ranked = sorted(tally.values(), reverse=True)
+                runner_up = ranked[1] if len(ranked) > 1 else 0.0
+                undecided = sum(weights[futures[f]] for f in pending)
+                if ranked[0] > runner_up + undecided:
+                    break
+
+        for future in pending:
+            future.cancel()
+
+        if not tally:
+            raise DeadlineExceeded(f"集成投票在 {self.deadline:.1f}s 内没有收到任何成员的答案")
+
+        best = max(tally, key=tally.get)
+        with self._lock:
+            self._pending_votes[question_body] = votes
+            # 只保留最近的投票记录，避免无反馈时无限增长
+            while len(self._pending_votes) > 256:
+                self._pending_votes.pop(next(iter(self._pending_votes)))
+
+        logger.debug("集成投票: %s -> 选项 %d (%d/%d 票)", votes, best, len(votes), len(self.members))
+        return f"<Answer>{best}"
+
+    def record_outcome(self, question_body: str, correct_option: int):
+        """根据已确认的正确选项更新各成员的正确率"""
+        with self._lock:
+            votes = self._pending_votes.pop(question_body, None)
+            if not votes:
+                return
+            for name, option in votes.items():
+                self.records[name][1] += 1
+                if option == correct_option:
+                    self.records[name][0] += 1
+            self._save_records()
+
+    def extract_option_number(self, answer: str) -> int:
+        """从 "<Answer>N" 中提取选项编号"""
+        numbers = re.findall(r'\d+', answer)
+        return int(numbers[0]) if numbers else 1
+
+    def set_system_prompt(self, prompt: str):
+        for _, generator in self.members:
+            generator.set_system_prompt(prompt)
+
+    def get_stats(self) -> dict:
+        stats = {}
+        for name, generator in self.members:
+            correct, total = self.records[name]
+            stats[f"ensemble:{name}"] = {"weight": round(self.weight(name), 3),
+                                         "correct": correct, "total": total,
+                                         "skipped_busy": self.skipped_busy[name]}
+            stats.update(generator.get_stats())
+        return stats
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for _, generator in self.members:
+            generator.close()
@@ -0,0 +1,149 @@
+"""
+LLM HTTP 传输模块
+为 OpenAI 客户端提供连接池化、可预热、可保活的 httpx 客户端
+"""
+import threading
+import time
+from typing import Optional
+
+import httpx
+
+from src.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+
+DEFAULT_HTTP_CONFIG = {
+    "http2": False,             # 是否启用 HTTP/2（需要安装 h2）
+    "max_connections": 10,      # 连接池最大连接数
+    "max_keepalive": 5,         # 最多保持的空闲长连接数
+    "keepalive_expiry": 120.0,  # 空闲长连接保留时间（秒）
+    "connect_timeout": 5.0,     # 建立连接超时（秒）
+    "read_timeout": 30.0,       # 读取响应超时（秒）
+    "prewarm": True,            # 启动时预热连接
+    "prewarm_connections": 1,   # 预热时并发建立的连接数
+    "keepalive_interval": 30.0, # 空闲保活请求间隔（秒），0 表示关闭
+}
+
+
+def _h2_available() -> bool:
+    """检查是否安装了 HTTP/2 依赖 h2"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _client_kwargs(http_config: Optional[dict]) -> dict:
+    """将 `llm.http` 配置转换为 httpx 客户端参数"""
+    cfg = {**DEFAULT_HTTP_CONFIG, **(http_config or {})}
+
+    http2 = bool(cfg["http2"])
+    if http2 and not _h2_available():
+        logger.warning("未安装 h2，HTTP/2 已降级为 HTTP/1.1 (pip install httpx[http2])")
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=int(cfg["max_connections"]),
+        max_keepalive_connections=int(cfg["max_keepalive"]),
+        keepalive_expiry=float(cfg["keepalive_expiry"]),
+    )
+    read_timeout = float(cfg["read_timeout"])
+    timeout = httpx.Timeout(
+        connect=float(cfg["connect_timeout"]),
+        read=read_timeout,
+        write=read_timeout,
+        pool=float(cfg["connect_timeout"]),
+    )
+    return {"http2": http2, "limits": limits, "timeout": timeout}
+
+
+def build_http_client(http_config: Optional[dict] = None) -> httpx.Client:
+    """
+    根据配置构建调优后的 httpx 客户端
+
+    Args:
+        http_config: `llm.http` 配置字典，缺省字段使用 DEFAULT_HTTP_CONFIG
+
+    Returns:
+        带长连接池与显式超时的 httpx.Client
+    """
+    return httpx.Client(**_client_kwargs(http_config))
+
+
+def build_async_http_client(http_config: Optional[dict] = None) -> httpx.AsyncClient:
+    """与 build_http_client 相同配置的异步客户端，供 AsyncOpenAI 使用"""
+    return httpx.AsyncClient(**_client_kwargs(http_config))
+
+
+class ConnectionWarmer:
+    """连接保温器 - 启动时预热连接，空闲时定期发送轻量请求保持长连接"""
+
+    def __init__(self, http_client: httpx.Client, url: str,
+                 interval: float = 30.0, connections: int = 1):
+        """
+        初始化连接保温器
+
+        Args:
+            http_client: 需要保温的 httpx 客户端（与 OpenAI 客户端共享连接池）
+            url: 预热/保活请求的目标地址（通常为 API base_url）
+            interval: 空闲保活间隔（秒），0 表示只预热不保活
+            connections: 预热时并发建立的连接数
+        """
+        self.http_client = http_client
+        self.url = url
+        self.interval = interval
+        self.connections = max(1, int(connections))
+        self._last_used = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def touch(self):
+        """记录一次真实请求，空闲计时从此刻重新开始"""
+        self._last_used = time.monotonic()
+
+    def _ping(self):
+        """发送一次轻量 HEAD 请求，只为建立/复用连接，忽略响应状态"""
+        try:
+            self.http_client.head(self.url)
+        except httpx.HTTPError:
+            pass
+
+    def ping_if_idle(self, min_idle: float = 5.0):
+        """连接空闲超过 min_idle 秒时在后台发送一次保活请求，不阻塞调用方"""
+        if time.monotonic() - self._last_used < min_idle:
+            return
+        self.touch()
+        threading.Thread(target=self._ping, daemon=True).start()
+
+    def prewarm(self):
+        """并发建立若干条连接，完成 DNS、TCP 与 TLS 握手"""
+        start = time.perf_counter()
+        threads = [threading.Thread(target=self._ping, daemon=True) for _ in range(self.connections)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.touch()
+        logger.info("LLM 连接预热完成 (%.0f ms)", (time.perf_counter() - start) * 1000)
+
+    def start(self):
+        """启动后台保活线程"""
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="llm-keepalive", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval / 2):
+            if time.monotonic() - self._last_used >= self.interval:
+                self._ping()
+                self.touch()
+
+    def stop(self):
+        """停止后台保活线程"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
@@ -2,16 +2,28 @@
 答案生成模块
 负责调用LLM获取题目答案
 """
-from openai import OpenAI
-from typing import Optional
+import re
+from openai import AsyncOpenAI, OpenAI
+from typing import List, Optional
 from src.core.base import AnswerGeneratorBase
+from src.generators.http_client import (
+    DEFAULT_HTTP_CONFIG, ConnectionWarmer, build_async_http_client, build_http_client
+)
+from src.generators.call_policy import Deadline, DeadlineCallPolicy
+from src.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# 多题合并请求中的题目与答案编号，如 <Question 2> / <Answer 2>
+_BATCH_ANSWER_RE = re.compile(r"<Answer\s*(\d+)>\s*(.*)")
 
 
 class AnswerGenerator(AnswerGeneratorBase):
     """答案生成器 - 使用LLM分析题目并给出答案"""
     
     def __init__(self, model: str = "gpt-4o", api_key: Optional[str] = None, 
-                 base_url: Optional[str] = None):
+                 base_url: Optional[str] = None, http_config: Optional[dict] = None,
+                 fallback_model: Optional[str] = None, policy_config: Optional[dict] = None):
         """
         初始化答案生成器
         
@@ -19,9 +31,16 @@ class AnswerGenerator(AnswerGeneratorBase):
             model: 使用的模型名称
             api_key: API密钥，如果为None则使用环境变量
             base_url: 自定义API端点 (如 https://api.deepseek.com/v1)
+            http_config: HTTP 传输配置（连接池、HTTP/2、超时、预热与保活），见 `llm.http`
+            fallback_model: 临近截止时间或主模型熔断时使用的更快的备用模型
+            policy_config: 调用策略配置（截止预算、重试、熔断），见 `llm.policy`
         """
-        # 初始化客户端配置
-        client_kwargs = {}
+        http_cfg = {**DEFAULT_HTTP_CONFIG, **(http_config or {})}
+
+        # 初始化客户端配置：共享一个调优后的长连接池
+        # 重试由调用策略在截止时间内统一负责，关闭 SDK 自带重试
+        self.http_client = build_http_client(http_cfg)
+        client_kwargs = {'http_client': self.http_client, 'max_retries': 0}
         if api_key:
             client_kwargs['api_key'] = api_key
         if base_url:
@@ -29,6 +48,23 @@ class AnswerGenerator(AnswerGeneratorBase):
             
         self.client = OpenAI(**client_kwargs)
         self.model = model
+        # 异步客户端在首次调用 get_answer_async 时创建，绑定到当时的事件循环
+        self._http_config = http_cfg
+        self._client_kwargs = {k: v for k, v in client_kwargs.items() if k != 'http_client'}
+        self.async_client: Optional[AsyncOpenAI] = None
+        self.fallback_model = fallback_model
+        self.policy = DeadlineCallPolicy.from_config(policy_config)
+
+        # 预热连接，避免第一道题承担 DNS/TCP/TLS 建连开销；空闲时定期保活
+        self.warmer = ConnectionWarmer(
+            self.http_client,
+            str(self.client.base_url),
+            interval=float(http_cfg["keepalive_interval"]),
+            connections=int(http_cfg["prewarm_connections"]),
+        )
+        if http_cfg["prewarm"]:
+            self.warmer.prewarm()
+        self.warmer.start()
         
         # 系统提示词
         self.system_prompt = (
@@ -51,6 +87,12 @@ class AnswerGenerator(AnswerGeneratorBase):
             "<Option>3. 散文\n"
         )
         self.example_answer = "<Answer>1. 诗歌"
+
+        # 多题合并请求时追加在系统提示词后的说明
+        self.batch_instruction = (
+            "- 本次输入包含多道题,每道题以 <Question 编号> 开头。请按编号逐题作答,"
+            "每题单独一行,格式为 <Answer 编号>选项编号. 选项内容,不能遗漏任何一题。\n"
+        )
     
     def get_answer(self, question_body: str) -> str:
         """
@@ -62,7 +104,82 @@ class AnswerGenerator(AnswerGeneratorBase):
         Returns:
             LLM返回的答案文本
         """
-        messages = [
+        messages = self._build_messages(question_body)
+        endpoints = self._endpoints()
+
+        def request(endpoint: str, timeout: float) -> str:
+            completion = self.client.chat.completions.create(
+                model=endpoints[endpoint],
+                messages=messages,
+                timeout=timeout
+            )
+            self.warmer.touch()
+            return completion.choices[0].message.content
+
+        return self.policy.call(list(endpoints), request)
+
+    def get_answers(self, question_bodies: List[str], deadline: Optional[Deadline] = None) -> List[Optional[str]]:
+        """
+        一次请求回答多道题，系统提示词与示例对话只发送一次
+
+        Args:
+            question_bodies: 格式化的题目字符串列表
+            deadline: 整批共享的截止时间，默认按调用策略的预算新建
+
+        Returns:
+            与 question_bodies 等长的答案文本列表，形如 "<Answer>2. 选项内容"；
+            模型漏答的题为 None
+        """
+        if len(question_bodies) == 1:
+            messages = self._build_messages(question_bodies[0])
+        else:
+            messages = self._build_batch_messages(question_bodies)
+        endpoints = self._endpoints()
+
+        def request(endpoint: str, timeout: float) -> str:
+            completion = self.client.chat.completions.create(
+                model=endpoints[endpoint],
+                messages=messages,
+                timeout=timeout
+            )
+            self.warmer.touch()
+            return completion.choices[0].message.content
+
+        content = self.policy.call(list(endpoints), request, deadline)
+        if len(question_bodies) == 1:
+            return [content]
+        return self._split_batch_answer(content, len(question_bodies))
+
+    async def get_answer_async(self, question_body: str) -> str:
+        """
+        get_answer 的 asyncio 版本，使用 AsyncOpenAI，等待期间不占用线程
+
+        Args:
+            question_body: 格式化的题目字符串
+
+        Returns:
+            LLM返回的答案文本
+        """
+        if self.async_client is None:
+            self.async_client = AsyncOpenAI(
+                http_client=build_async_http_client(self._http_config), **self._client_kwargs
+            )
+        messages = self._build_messages(question_body)
+        endpoints = self._endpoints()
+
+        async def request(endpoint: str, timeout: float) -> str:
+            completion = await self.async_client.chat.completions.create(
+                model=endpoints[endpoint],
+                messages=messages,
+                timeout=timeout
+            )
+            return completion.choices[0].message.content
+
+        return await self.policy.call_async(list(endpoints), request)
+
+    def _build_messages(self, question_body: str) -> list:
+        """组装系统提示词、示例对话与题目"""
+        return [
             {
                 "content": self.system_prompt,
                 "role": "system"
@@ -80,14 +197,56 @@ class AnswerGenerator(AnswerGeneratorBase):
                 "role": "user"
             }
         ]
-        
-        completion = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages
-        )
-        
-        return completion.choices[0].message.content
+
+    def _build_batch_messages(self, question_bodies: List[str]) -> list:
+        """多题合并请求：每道题的 <Question> 标记改为 <Question 编号>，示例对话同样带编号"""
+        def numbered(body: str, index: int) -> str:
+            return body.replace("<Question>", f"<Question {index}>", 1)
+
+        return [
+            {
+                "content": self.system_prompt + self.batch_instruction,
+                "role": "system"
+            },
+            {
+                "content": numbered(self.example_question, 1),
+                "role": "user"
+            },
+            {
+                "content": self.example_answer.replace("<Answer>", "<Answer 1>", 1),
+                "role": "assistant"
+            },
+            {
+                "content": "\n".join(numbered(body, i) for i, body in enumerate(question_bodies, 1)),
+                "role": "user"
+            }
+        ]
+
+    @staticmethod
+    def _split_batch_answer(content: str, count: int) -> List[Optional[str]]:
+        """把 "<Answer 编号>..." 逐行拆回各题，还原为单题格式 "<Answer>..." """
+        answers: List[Optional[str]] = [None] * count
+        for index, text in _BATCH_ANSWER_RE.findall(content or ""):
+            index = int(index)
+            if 1 <= index <= count and answers[index - 1] is None:
+                answers[index - 1] = f"<Answer>{text.strip()}"
+        return answers
+
+    def _endpoints(self) -> dict:
+        """{端点名: 模型名}，主模型在前，备用模型在后"""
+        endpoints = {self._endpoint_name(self.model): self.model}
+        if self.fallback_model and self.fallback_model != self.model:
+            endpoints[self._endpoint_name(self.fallback_model)] = self.fallback_model
+        return endpoints
+
+    def _endpoint_name(self, model: str) -> str:
+        """端点名：模型@主机，用于熔断与统计"""
+        return f"{model}@{self.client.base_url.host}"
     
+    def prefetch(self, question: str):
+        """题干已识别时调用：连接空闲过久则提前保活，选项到达后请求无需重新建连"""
+        self.warmer.ping_if_idle()
+
     def extract_option_number(self, answer: str) -> int:
         """
         从答案中提取选项编号
@@ -101,14 +260,13 @@ class AnswerGenerator(AnswerGeneratorBase):
         try:
             # 尝试从答案中提取数字
             # 格式如: "<Answer>1. 诗歌" 或 "1" 或 "选项1"
-            import re
             numbers = re.findall(r'\d+', answer)
             if numbers:
                 return int(numbers[0])
             else:
                 raise ValueError(f"无法从答案中提取选项编号: {answer}")
         except Exception as e:
-            print(f"提取选项编号失败: {e}")
+            logger.warning("提取选项编号失败: %s", e)
             return 1  # 默认返回选项1
     
     def set_model(self, model: str):
@@ -118,3 +276,19 @@ class AnswerGenerator(AnswerGeneratorBase):
     def set_system_prompt(self, prompt: str):
         """自定义系统提示词"""
         self.system_prompt = prompt
+
+    def get_stats(self) -> dict:
+        """返回各端点的调用统计"""
+        return self.policy.stats()
+
+    def close(self):
+        """停止连接保活并关闭连接池"""
+        self.warmer.stop()
+        self.http_client.close()
+
+    async def aclose(self):
+        """关闭异步客户端与同步连接池"""
+        if self.async_client is not None:
+            await self.async_client.close()
+            self.async_client = None
+        self.close()
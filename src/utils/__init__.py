@@ -1,6 +1,17 @@
 """
 工具包初始化
 """
-from src.utils.adb_helper import ADBHelper
+import importlib
 
-__all__ = ['ADBHelper']
+_LAZY = {
+    'ADBHelper': '.adb_helper',
+    'AnswerStore': '.answer_store',
+}
+
+__all__ = ['ADBHelper', 'AnswerStore']
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        return getattr(importlib.import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,213 @@
+"""
+本地答案库
+以 SQLite 持久化 (题目, 选项集合, 正确答案) 记录，供缓存命中与离线预热使用
+"""
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Iterator, List, Optional, Tuple
+
+from src.utils.text_normalize import normalize_key
+
+
+_QUESTION_RE = re.compile(r"<Question>(.*?)(?=\n<Option>|$)", re.S)
+_OPTION_RE = re.compile(r"<Option>\d+\.\s*(.*)")
+
+# 键的规范化规则版本，记录在 PRAGMA user_version 中；规则改变时打开旧库会按原文重新计算键
+KEY_VERSION = 1
+
+
+def options_key(options: List[str]) -> str:
+    """选项集合的键：与选项在屏幕上的顺序无关"""
+    return "\x1f".join(sorted(normalize_key(o) for o in options))
+
+
+def parse_question_body(question_body: str) -> Tuple[str, List[str]]:
+    """
+    将格式化题目拆回题干和选项列表
+
+    Args:
+        question_body: "<Question>...\\n<Option>1. ...\\n<Option>2. ..." 格式字符串
+
+    Returns:
+        (题干, [选项文本, ...])
+    """
+    match = _QUESTION_RE.search(question_body)
+    question = match.group(1).strip() if match else question_body.strip()
+    options = [m.group(1).strip() for m in _OPTION_RE.finditer(question_body)]
+    return question, options
+
+
+def match_option(answer: str, options: List[str]) -> Optional[int]:
+    """在选项中查找答案文本，返回 1 开始的选项编号，找不到返回 None"""
+    target = normalize_key(answer)
+    if not target:
+        return None
+    for idx, option in enumerate(options, 1):
+        if normalize_key(option) == target:
+            return idx
+    return None
+
+
+class AnswerStore:
+    """答案库 - 线程安全的 SQLite 存储
+
+    同一题干可能配不同的选项集合，因此主键为 (题干键, 选项集合键)。
+    已验证（点击后确认正确）的记录不会被未验证的记录覆盖。
+    """
+
+    def __init__(self, path: str = "answers.db"):
+        """
+        打开（或创建）答案库
+
+        Args:
+            path: SQLite 文件路径，":memory:" 表示仅在内存中
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS answers ("
+                " question_key TEXT NOT NULL,"
+                " options_key TEXT NOT NULL,"
+                " question TEXT NOT NULL,"
+                " options TEXT NOT NULL,"
+                " answer TEXT NOT NULL,"
+                " source TEXT NOT NULL,"
+                " verified INTEGER NOT NULL DEFAULT 0,"
+                " updated_at REAL NOT NULL,"
+                " PRIMARY KEY (question_key, options_key))"
+            )
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] < KEY_VERSION:
+                self._rekey()
+
+    def _rekey(self):
+        """按当前规范化规则重新计算全部记录的键（调用时持有锁并处于事务中）
+
+        规则变得更宽松后，原来不同的键可能合并为同一个；按已验证、更新时间的顺序重新写入，
+        冲突时保留已验证且最新的记录。
+        """
+        rows = self._conn.execute(
+            "SELECT question, options, answer, source, verified, updated_at FROM answers"
+            " ORDER BY verified, updated_at"
+        ).fetchall()
+        self._conn.execute("DELETE FROM answers")
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO answers (question_key, options_key, question, options,"
+            " answer, source, verified, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(normalize_key(question), options_key(json.loads(options)), question, options,
+              answer, source, verified, updated_at)
+             for question, options, answer, source, verified, updated_at in rows],
+        )
+        self._conn.execute(f"PRAGMA user_version = {KEY_VERSION}")
+
+    def lookup(self, question: str, options: List[str]) -> Optional[int]:
+        """
+        查找已知答案并映射为当前屏幕上的选项编号
+
+        先精确匹配题干与选项集合，再退化为仅按题干匹配（答案需出现在当前选项中）。
+
+        Returns:
+            1 开始的选项编号，未命中返回 None
+        """
+        return self.match_candidates(self.lookup_question(question), options, options_key(options))
+
+    def lookup_question(self, question: str) -> List[Tuple[str, str, int]]:
+        """
+        按题干查询全部候选记录，可在选项尚未识别完时提前执行
+
+        Returns:
+            [(选项集合键, 答案, 是否已验证), ...]，已验证的排在前面
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT options_key, answer, verified FROM answers"
+                " WHERE question_key = ? ORDER BY verified DESC, updated_at DESC",
+                (normalize_key(question),),
+            ).fetchall()
+        return rows
+
+    @staticmethod
+    def match_candidates(candidates: List[Tuple[str, str, int]], options: List[str],
+                         opts_key: Optional[str] = None) -> Optional[int]:
+        """从按题干查到的候选记录中挑出与当前选项匹配的答案编号"""
+        if not candidates or not options:
+            return None
+        if opts_key is None:
+            opts_key = options_key(options)
+        # 选项集合完全一致的记录优先
+        ordered = sorted(candidates, key=lambda row: row[0] != opts_key)
+        for _, answer, _ in ordered:
+            idx = match_option(answer, options)
+            if idx is not None:
+                return idx
+        return None
+
+    def put(self, question: str, options: List[str], answer: str,
+            source: str = "llm", verified: bool = False):
+        """
+        写入一条答案记录
+
+        Args:
+            question: 题干
+            options: 选项列表
+            answer: 正确选项的文本
+            source: 来源，如 llm / verified / prewarm
+            verified: 是否已在游戏中确认正确
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO answers (question_key, options_key, question, options,"
+                " answer, source, verified, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (question_key, options_key) DO UPDATE SET"
+                " answer = excluded.answer, source = excluded.source,"
+                " verified = excluded.verified, updated_at = excluded.updated_at"
+                " WHERE excluded.verified >= answers.verified",
+                (normalize_key(question), options_key(options), question,
+                 json.dumps(options, ensure_ascii=False), answer, source,
+                 int(verified), time.time()),
+            )
+
+    def discard(self, question: str, options: List[str], answer: str) -> bool:
+        """
+        删除该题干下答案为 answer 的未验证记录，用于作答后确认该答案错误
+
+        答案按规范化文本比较，且不限选项集合：仅按题干匹配命中的记录
+        （选项集合与当前屏幕不同）同样会被删除，不会在下次重复给出同一个错误答案。
+
+        Returns:
+            是否删除了记录
+        """
+        question_key = normalize_key(question)
+        target = normalize_key(answer)
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT options_key, answer FROM answers WHERE question_key = ? AND verified = 0",
+                (question_key,),
+            ).fetchall()
+            stale = [(question_key, opts_key) for opts_key, stored in rows if normalize_key(stored) == target]
+            self._conn.executemany(
+                "DELETE FROM answers WHERE question_key = ? AND options_key = ? AND verified = 0", stale)
+        return bool(stale)
+
+    def iter_records(self) -> Iterator[dict]:
+        """遍历全部记录，用于导出或构建只读题库"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT question, options, answer, source, verified, updated_at FROM answers"
+            ).fetchall()
+        for question, options, answer, source, verified, updated_at in rows:
+            yield {"question": question, "options": json.loads(options), "answer": answer,
+                   "source": source, "verified": bool(verified), "updated_at": updated_at}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,53 @@
+"""
+设备标定缓存
+答题区域、二值化阈值等按设备序列号与分辨率缓存在 JSON 文件中，同一设备再次运行时直接复用，
+只有校验失败时才重新标定
+"""
+import json
+import os
+import threading
+from typing import Tuple
+
+from src.core.base import AndroidControllerBase
+from src.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# 同一进程内多个会话写同一个文件时串行化读-改-写
+_lock = threading.Lock()
+
+
+def device_key(controller: AndroidControllerBase, size: Tuple[int, int]) -> str:
+    """缓存键 "设备序列号@宽x高"，回放时以录制目录代替序列号"""
+    serial = getattr(controller, "device_id", None) or getattr(controller, "directory", None)
+    serial = serial or type(controller).__name__
+    return f"{serial}@{size[0]}x{size[1]}"
+
+
+def load_entries(path: str) -> dict:
+    """读取全部条目，文件不存在或损坏时返回空字典"""
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning("标定缓存 %s 读取失败: %s", path, e)
+        return {}
+    return entries if isinstance(entries, dict) else {}
+
+
+def save_entry(path: str, key: str, entry: dict):
+    """写入一个条目（先写临时文件再替换，进程中断时不会留下半个文件）"""
+    if not path:
+        return
+    with _lock:
+        entries = load_entries(path)
+        entries[key] = entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("标定缓存 %s 写入失败: %s", path, e)
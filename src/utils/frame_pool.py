@@ -0,0 +1,83 @@
+"""
+帧缓冲池
+截图与预处理每帧都要分配若干整帧大小的缓冲区（解码后的截图、灰度、二值化、RGB 扩展），
+长时间运行时反复申请释放大块内存会造成碎片、RSS 持续上涨。缓冲池按 (形状, 类型) 保留
+用过的 NumPy 数组，控制器在其中原地写入，处理完一帧后归还复用
+
+用法:
+    pool = FramePool()
+    frame = pool.acquire((2400, 1080, 4))
+    ...
+    pool.release(frame)     # 也可以传入 frame 的切片或 reshape 视图
+"""
+import threading
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+Key = Tuple[Tuple[int, ...], str]
+
+
+class FramePool:
+    """按形状复用的 NumPy 缓冲池，线程安全"""
+
+    def __init__(self, max_per_shape: int = 4):
+        """
+        Args:
+            max_per_shape: 每种形状最多保留的空闲数组数，超出的归还后交给垃圾回收
+        """
+        self.max_per_shape = max_per_shape
+        self.allocations = 0
+        self.reuses = 0
+        self.discarded = 0
+        self._free: Dict[Key, List[np.ndarray]] = {}
+        self._in_use: Dict[int, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """借出一个数组，内容未初始化"""
+        shape = tuple(int(n) for n in shape)
+        key = (shape, np.dtype(dtype).str)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                arr = free.pop()
+                self.reuses += 1
+            else:
+                arr = np.empty(shape, dtype=dtype)
+                self.allocations += 1
+            self._in_use[id(arr)] = arr
+        return arr
+
+    def release(self, arr: np.ndarray):
+        """归还数组；传入视图时归还其所属的池中数组，不属于本池的数组忽略"""
+        with self._lock:
+            while arr is not None and id(arr) not in self._in_use:
+                arr = arr.base if isinstance(arr, np.ndarray) else None
+            if arr is None:
+                return
+            del self._in_use[id(arr)]
+            free = self._free.setdefault((arr.shape, arr.dtype.str), [])
+            if len(free) < self.max_per_shape:
+                free.append(arr)
+            else:
+                self.discarded += 1
+
+    def clear(self):
+        """丢弃全部空闲数组（分辨率改变后旧形状不再使用）"""
+        with self._lock:
+            self._free.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            free = sum(len(v) for v in self._free.values())
+            pooled = sum(a.nbytes for v in self._free.values() for a in v)
+            pooled += sum(a.nbytes for a in self._in_use.values())
+            return {
+                "allocations": self.allocations,
+                "reuses": self.reuses,
+                "discarded": self.discarded,
+                "in_use": len(self._in_use),
+                "free": free,
+                "pooled_mb": round(pooled / 1e6, 1),
+            }
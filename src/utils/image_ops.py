@@ -0,0 +1,174 @@
+"""
+截图预处理工具
+各控制器共用的按比例裁剪与二值化，以及从灰度直方图计算二值化阈值
+"""
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+
+def ratio_box(size: Tuple[int, int], crop_ratios: Tuple[float, float, float, float]) -> Tuple[int, int, int, int]:
+    """按 (左, 上, 右, 下) 比例计算 (宽, 高) 画面中的像素区域"""
+    left_ratio, top_ratio, right_ratio, bottom_ratio = crop_ratios
+    width, height = size
+    return int(left_ratio * width), int(top_ratio * height), int(right_ratio * width), int(bottom_ratio * height)
+
+
+def image_size(img) -> Tuple[int, int]:
+    """PIL 图像或 (高, 宽, 通道) 数组的 (宽, 高)"""
+    if isinstance(img, np.ndarray):
+        return img.shape[1], img.shape[0]
+    return img.size
+
+
+def as_image(img) -> Image.Image:
+    """数组（缓冲池中的截图）转换为 PIL 图像，PIL 图像原样返回"""
+    return Image.fromarray(img) if isinstance(img, np.ndarray) else img
+
+
+def crop_by_ratio(img: Image.Image, crop_ratios: Tuple[float, float, float, float]
+                  ) -> Tuple[Image.Image, Tuple[int, int, int, int]]:
+    """
+    根据比例裁剪图像
+
+    Args:
+        img: 输入图像
+        crop_ratios: (左, 上, 右, 下)比例
+
+    Returns:
+        (裁剪后的图像, (左, 上, 右, 下)相对坐标)
+    """
+    box = ratio_box(img.size, crop_ratios)
+    return img.crop(box), box
+
+
+@lru_cache(maxsize=64)
+def threshold_lut(threshold: int, invert: bool = False) -> Tuple[int, ...]:
+    """
+    二值化查找表：灰度大于 threshold 为白色（invert 时为黑色）
+
+    `Image.point` 传入函数时每次调用都要对 256 个灰度逐个求值，传入查找表则直接在 C 中映射
+    """
+    white = np.arange(256) > threshold
+    if invert:
+        white = ~white
+    return tuple(np.where(white, 255, 0).tolist())
+
+
+def binarize(img: Image.Image, threshold: int, invert: bool = False) -> Image.Image:
+    """
+    将图像转换为灰度后二值化，再扩展回 RGB 供 OCR 使用
+
+    Args:
+        img: 输入图像
+        threshold: 二值化阈值，大于该值为白色
+        invert: 反色（深色主题下浅色文字），使输出始终为白底黑字
+
+    Returns:
+        黑白 RGB 图像
+    """
+    return img.convert("L").point(threshold_lut(int(threshold), invert)).convert("RGB")
+
+
+def gray_histogram(img: Image.Image, step: int = 1) -> np.ndarray:
+    """灰度直方图（256 个计数），step 大于 1 时先按整数倍缩小，用于低成本抽样"""
+    if step > 1:
+        img = img.reduce(step)
+    return np.asarray(img.convert("L").histogram(), dtype=np.float64)
+
+
+def otsu_threshold(hist: Sequence[float]) -> int:
+    """
+    Otsu 阈值：使两类（<= t 与 > t）类间方差最大的灰度
+
+    Args:
+        hist: 256 个灰度计数
+    """
+    hist = np.asarray(hist, dtype=np.float64)
+    levels = np.arange(256, dtype=np.float64)
+    w0 = np.cumsum(hist)
+    total = w0[-1]
+    if total <= 0:
+        return 127
+    m0 = np.cumsum(hist * levels)
+    w1 = total - w0
+    # 类间方差（省略常数因子）: (μ·w0 - m0)² / (w0·w1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        between = (m0[-1] / total * w0 - m0) ** 2 / (w0 * w1)
+    between[~np.isfinite(between)] = 0
+    return int(np.argmax(between))
+
+
+def valley_threshold(hist: Sequence[float], min_distance: int = 64, smooth: int = 9) -> Optional[int]:
+    """
+    直方图谷底阈值：平滑后取相距至少 min_distance 的两个最高峰之间的最低点
+
+    白底上文字像素很少时，Otsu 容易偏向背景一侧，谷底更稳定；找不到双峰时返回 None
+    """
+    hist = np.asarray(hist, dtype=np.float64)
+    smoothed = np.convolve(hist, np.ones(smooth) / smooth, mode="same")
+    peaks = np.flatnonzero((smoothed[1:-1] >= smoothed[:-2]) & (smoothed[1:-1] > smoothed[2:])) + 1
+    if peaks.size < 2:
+        return None
+    first = peaks[np.argmax(smoothed[peaks])]
+    far = peaks[np.abs(peaks - first) >= min_distance]
+    if far.size == 0:
+        return None
+    second = far[np.argmax(smoothed[far])]
+    lo, hi = sorted((int(first), int(second)))
+    return lo + int(np.argmin(smoothed[lo:hi + 1]))
+
+
+def binarize_into(frame: np.ndarray, box: Tuple[int, int, int, int], threshold: int, invert: bool,
+                  pool, rows: int = 64) -> np.ndarray:
+    """
+    binarize 的原地版本：裁剪区域灰度化、二值化并扩展为三通道，全部写入缓冲池中的数组
+
+    结果与 `binarize(crop_by_ratio(...))` 逐字节相同（灰度系数与 Pillow 的 L 转换一致）。
+    按 rows 行分块计算，中间缓冲只有几十行大小，留在 CPU 缓存中。
+
+    Args:
+        frame: (高, 宽, 3 或 4) 的 RGB(A) 截图
+        box: 裁剪区域 (左, 上, 右, 下)
+        pool: FramePool，返回的数组由调用方归还
+
+    Returns:
+        (裁剪高, 裁剪宽, 3) 的黑白 RGB 数组
+    """
+    left, top, right, bottom = box
+    region = frame[top:bottom, left:right]
+    height, width = region.shape[:2]
+    out = pool.acquire((height, width, 3), np.uint8)
+    acc = pool.acquire((rows, width), np.uint32)
+    tmp = pool.acquire((rows, width), np.uint32)
+    gray = pool.acquire((rows, width), np.uint8)
+    # L = (R * 19595 + G * 38470 + B * 7471 + 0x8000) >> 16 与 Pillow 的定点系数相同，
+    # L > threshold 等价于 R * 19595 + G * 38470 + B * 7471 >= limit，省去移位与查表
+    limit = ((int(threshold) + 1) << 16) - 0x8000
+    compare = np.less if invert else np.greater_equal
+    try:
+        for y in range(0, height, rows):
+            n = min(rows, height - y)
+            src, a, t, g = region[y:y + n], acc[:n], tmp[:n], gray[:n]
+            np.multiply(src[..., 0], 19595, out=a, dtype=np.uint32)
+            np.multiply(src[..., 1], 38470, out=t, dtype=np.uint32)
+            a += t
+            np.multiply(src[..., 2], 7471, out=t, dtype=np.uint32)
+            a += t
+            compare(a, limit, out=g.view(np.bool_))
+            g *= 255
+            # 逐通道写入比广播 gray[..., None] 快数倍
+            dst = out[y:y + n]
+            dst[..., 0] = g
+            dst[..., 1] = g
+            dst[..., 2] = g
+    except BaseException:
+        pool.release(out)
+        raise
+    finally:
+        pool.release(acc)
+        pool.release(tmp)
+        pool.release(gray)
+    return out
@@ -0,0 +1,148 @@
+"""
+结构化日志模块
+基于标准库 logging：按级别过滤、%-风格惰性格式化，记录经有界队列交给后台线程输出，
+答题循环不会因终端或管道写入缓慢而阻塞
+
+用法:
+    from src.utils.log import get_logger, fields
+    logger = get_logger(__name__)
+    logger.debug("OCR 结果: %s", results)                  # 未启用 DEBUG 时不会格式化 results
+    logger.info("作答完成", extra=fields(option=2, llm_ms=812.4))
+
+附加字段在 text 格式下以 key=value 追加在消息后，在 json 格式下作为顶层键输出。
+注意：格式化在后台线程中进行，传给日志的参数在记录之后不应再被修改。
+"""
+import json
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+ROOT_LOGGER = "quizbot"
+
+DEFAULT_LOGGING_CONFIG = {
+    "level": "INFO",
+    "format": "text",        # text 或 json
+    "file": None,            # 额外写入的日志文件
+    "queue_size": 10000,     # 队列满时丢弃新记录而不是阻塞调用方
+}
+
+
+def get_logger(name: str) -> logging.Logger:
+    """返回 quizbot 命名空间下的 logger，name 通常为 __name__"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def fields(**kwargs) -> dict:
+    """构造 logging 的 extra 参数，附加结构化字段"""
+    return {"fields": kwargs}
+
+
+class TextFormatter(logging.Formatter):
+    """人类可读格式：时间 级别 消息 key=value ..."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname).1s %(message)s", datefmt="%H:%M:%S")
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        extra = getattr(record, "fields", None)
+        if extra:
+            text += "  " + " ".join(f"{k}={v}" for k, v in extra.items())
+        return text
+
+
+class JsonFormatter(logging.Formatter):
+    """每条记录一行 JSON，附加字段作为顶层键"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        extra = getattr(record, "fields", None)
+        if extra:
+            payload.update(extra)
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """不在调用线程格式化、队列满时丢弃的 QueueHandler"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 标准实现会在这里调用 format()，即在答题线程中格式化；交给监听线程处理
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[_DroppingQueueHandler] = None
+
+
+def setup_logging(logging_config: Optional[dict] = None):
+    """
+    根据 `logging` 配置初始化 quizbot 日志，可重复调用
+
+    Args:
+        logging_config: {level, format, file, queue_size}
+    """
+    global _listener, _queue_handler
+    cfg = {**DEFAULT_LOGGING_CONFIG, **(logging_config or {})}
+    shutdown_logging()
+
+    formatter = JsonFormatter() if cfg["format"] == "json" else TextFormatter()
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if cfg.get("file"):
+        handlers.append(logging.FileHandler(cfg["file"], encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    _queue_handler = _DroppingQueueHandler(queue.Queue(maxsize=int(cfg["queue_size"])))
+    _listener = QueueListener(_queue_handler.queue, *handlers, respect_handler_level=False)
+    _listener.start()
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.handlers = [_queue_handler]
+    root.setLevel(str(cfg["level"]).upper())
+    root.propagate = False
+
+
+def shutdown_logging():
+    """停止后台输出线程，输出队列中剩余的记录"""
+    global _listener, _queue_handler
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        if _queue_handler is not None and _queue_handler.dropped:
+            sys.stderr.write(f"日志队列已满，丢弃了 {_queue_handler.dropped} 条记录\n")
+        _listener = None
+    root = logging.getLogger(ROOT_LOGGER)
+    if _queue_handler is not None and _queue_handler in root.handlers:
+        root.removeHandler(_queue_handler)
+    _queue_handler = None
+
+
+def ms(seconds: float) -> float:
+    """秒转为保留一位小数的毫秒，用于日志字段"""
+    return round(seconds * 1000, 1)
+
+
+def timing_fields(timings: dict) -> dict:
+    """阶段耗时 {阶段: 秒} 转为日志字段 {阶段_ms: 毫秒}"""
+    return {f"{stage}_ms": ms(seconds) for stage, seconds in timings.items()}
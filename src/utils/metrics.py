@@ -0,0 +1,315 @@
+"""
+阶段耗时统计模块
+HDR 风格的对数-线性直方图，滚动窗口分位数，以及 JSONL / Prometheus 文本导出
+
+用法:
+    from src.utils import metrics
+    with metrics.timer("ocr.inference"):
+        ...
+
+未启用时 `timer` 返回共享的空上下文管理器，开销可以忽略。
+"""
+import json
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from src.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class Histogram:
+    """对数-线性直方图（HDR 风格）
+
+    以微秒整数记录，小于 2^p 的值精确存储，更大的值每个二次幂区间分成 2^(p-1) 个桶，
+    相对误差约为 2^-(p-1)（p=7 时约 1.6%）。桶以字典稀疏存储。
+    """
+
+    def __init__(self, precision_bits: int = 7):
+        self.p = precision_bits
+        self.half = 1 << (precision_bits - 1)
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _index(self, us: int) -> int:
+        if us < (1 << self.p):
+            return us
+        shift = us.bit_length() - self.p
+        return shift * self.half + (us >> shift)
+
+    def _value(self, index: int) -> float:
+        """桶的中点（微秒）"""
+        if index < (1 << self.p):
+            return float(index)
+        shift = index // self.half - 1
+        mantissa = index - shift * self.half
+        return ((mantissa << shift) + (1 << shift) / 2)
+
+    def record(self, seconds: float):
+        us = max(0, int(seconds * 1_000_000))
+        idx = self._index(us)
+        self.counts[idx] = self.counts.get(idx, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "Histogram"):
+        for idx, n in other.counts.items():
+            self.counts[idx] = self.counts.get(idx, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, pct: float) -> float:
+        """返回分位数（秒）"""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, int(round(pct / 100 * self.count)))
+        seen = 0
+        for idx in sorted(self.counts):
+            seen += self.counts[idx]
+            if seen >= rank:
+                return min(self._value(idx) / 1_000_000, self.max)
+        return self.max
+
+
+class _Metric:
+    """单个指标：累计直方图 + 按时间片滚动的窗口直方图"""
+
+    def __init__(self, window: float, slices: int = 6):
+        self.cumulative = Histogram()
+        self.slice_length = window / slices
+        self.slices: Deque[Tuple[float, Histogram]] = deque(maxlen=slices)
+        self.lock = threading.Lock()
+
+    def record(self, seconds: float):
+        now = time.monotonic()
+        with self.lock:
+            self.cumulative.record(seconds)
+            if not self.slices or now - self.slices[-1][0] >= self.slice_length:
+                self.slices.append((now, Histogram()))
+            self.slices[-1][1].record(seconds)
+
+    def rolling(self) -> Histogram:
+        horizon = time.monotonic() - self.slice_length * self.slices.maxlen
+        merged = Histogram()
+        with self.lock:
+            for started, hist in self.slices:
+                if started >= horizon:
+                    merged.merge(hist)
+        return merged
+
+
+class _Timer:
+    __slots__ = ("metric", "into", "name", "start")
+
+    def __init__(self, metric: Optional[_Metric], into: Optional[dict] = None, name: str = ""):
+        self.metric = metric
+        self.into = into
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        if self.metric is not None:
+            self.metric.record(elapsed)
+        if self.into is not None:
+            self.into[self.name] = elapsed
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    """指标注册表"""
+
+    def __init__(self, enabled: bool = False, window: float = 60.0):
+        self.enabled = enabled
+        self.window = window
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _metric(self, name: str) -> _Metric:
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(name, _Metric(self.window))
+        return metric
+
+    def timer(self, name: str, into: Optional[dict] = None):
+        """
+        计时上下文管理器；未启用且未提供 into 时返回空操作对象
+
+        Args:
+            name: 指标名
+            into: 提供时同时把本次耗时（秒）写入 into[name]，例如用于单题日志字段
+        """
+        if not self.enabled:
+            return _NULL_TIMER if into is None else _Timer(None, into, name)
+        return _Timer(self._metric(name), into, name)
+
+    def observe(self, name: str, seconds: float):
+        if self.enabled:
+            self._metric(name).record(seconds)
+
+    def snapshot(self) -> Dict[str, dict]:
+        """各指标滚动窗口内的分位数（毫秒）"""
+        result = {}
+        for name, metric in list(self._metrics.items()):
+            hist = metric.rolling()
+            result[name] = {
+                "count": hist.count,
+                "p50_ms": round(hist.percentile(50) * 1000, 2),
+                "p95_ms": round(hist.percentile(95) * 1000, 2),
+                "p99_ms": round(hist.percentile(99) * 1000, 2),
+                "max_ms": round(hist.max * 1000, 2),
+            }
+        return result
+
+    def prometheus_text(self) -> str:
+        """Prometheus 文本格式：滚动分位数 + 累计 sum/count"""
+        lines = [
+            "# HELP quizbot_stage_seconds Per-stage latency of the quiz bot",
+            "# TYPE quizbot_stage_seconds summary",
+        ]
+        for name, metric in sorted(self._metrics.items()):
+            hist = metric.rolling()
+            for q in (0.5, 0.95, 0.99):
+                lines.append(f'quizbot_stage_seconds{{stage="{name}",quantile="{q}"}} '
+                             f'{hist.percentile(q * 100):.6f}')
+            lines.append(f'quizbot_stage_seconds_sum{{stage="{name}"}} {metric.cumulative.total:.6f}')
+            lines.append(f'quizbot_stage_seconds_count{{stage="{name}"}} {metric.cumulative.count}')
+        return "\n".join(lines) + "\n"
+
+
+class JsonlExporter:
+    """定期将滚动分位数追加写入 JSONL 文件"""
+
+    def __init__(self, registry: MetricsRegistry, path: str, interval: float = 10.0):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-jsonl", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def flush(self):
+        snapshot = self.registry.snapshot()
+        if not snapshot:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"ts": round(time.time(), 3), "metrics": snapshot}, ensure_ascii=False) + "\n")
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        self.flush()
+
+
+class PrometheusExporter:
+    """在本机端口提供 /metrics 文本端点"""
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9108):
+        # 只在启用端点时导入，不拖慢 `src` 的导入
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry_ref = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.rstrip("/") != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry_ref.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="metrics-http", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        host, port = self._httpd.server_address[:2]
+        logger.info("Prometheus 指标端点: http://%s:%s/metrics", host, port)
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+_registry = MetricsRegistry()
+_exporters: list = []
+
+
+def get_registry() -> MetricsRegistry:
+    return _registry
+
+
+def timer(name: str, into: Optional[dict] = None):
+    """全局注册表的计时上下文管理器"""
+    return _registry.timer(name, into)
+
+
+def observe(name: str, seconds: float):
+    _registry.observe(name, seconds)
+
+
+def configure(metrics_config: Optional[dict] = None) -> MetricsRegistry:
+    """
+    根据 `metrics` 配置启用统计并启动导出器
+
+    Args:
+        metrics_config: {enabled, window, jsonl_path, interval, prometheus_port}
+    """
+    cfg = metrics_config or {}
+    shutdown()
+    _registry.enabled = bool(cfg.get("enabled", False))
+    _registry.window = float(cfg.get("window", 60.0))
+    if not _registry.enabled:
+        return _registry
+
+    if cfg.get("jsonl_path"):
+        _exporters.append(JsonlExporter(_registry, cfg["jsonl_path"], float(cfg.get("interval", 10.0))))
+    if cfg.get("prometheus_port"):
+        _exporters.append(PrometheusExporter(_registry, port=int(cfg["prometheus_port"])))
+    for exporter in _exporters:
+        exporter.start()
+    return _registry
+
+
+def shutdown():
+    """停止所有导出器（JSONL 会写出最后一次快照）"""
+    while _exporters:
+        _exporters.pop().stop()
@@ -0,0 +1,221 @@
+"""
+作答结果检测模块
+点击之后截取原始彩色画面，检查各选项按钮的高亮颜色：绿色表示正确、红色表示错误。
+确认了正确选项时通过 `AnswerGeneratorBase.record_outcome` 反馈给生成器，
+带答案库的生成器据此写入已验证记录，之后同一题直接命中答案库，无需再调用 LLM
+
+需要控制器实现 `capture_raw`（ADB、回放），OCR 坐标加上裁剪偏移即为原始画面坐标。
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from src.core.base import AndroidControllerBase, AnswerGeneratorBase
+from src.utils.log import fields, get_logger
+
+logger = get_logger(__name__)
+
+CORRECT = "correct"
+INCORRECT = "incorrect"
+
+DEFAULT_OUTCOME_CONFIG = {
+    "enabled": False,
+    "delay": 0.4,                  # 点击后等待高亮出现的时间（秒）
+    "retries": 2,                  # 未检测到高亮时再截图的次数
+    "retry_interval": 0.2,         # 重试间隔（秒）
+    "correct_hue": [80, 160],      # 正确高亮的色相范围（度）
+    "incorrect_hue": [330, 20],    # 错误高亮的色相范围（度），起点大于终点表示跨过 0 度
+    "min_saturation": 0.35,        # 饱和度低于该值的像素视为未高亮（白底、灰底、文字）
+    "min_fraction": 0.3,           # 按钮区域内高亮像素占比超过该值才算高亮
+}
+
+
+def _hue_mask(hue, lo: float, hi: float):
+    """PIL HSV 色相为 0-255，把角度区间转换后取掩码；lo > hi 表示跨过 0 度"""
+    lo, hi = lo / 360 * 255, hi / 360 * 255
+    return (hue >= lo) & (hue <= hi) if lo <= hi else (hue >= lo) | (hue <= hi)
+
+
+class Outcome:
+    """一次作答的检测结果"""
+
+    __slots__ = ("tapped", "correct", "states")
+
+    def __init__(self, tapped: int, correct: Optional[int], states: List[Optional[str]]):
+        self.tapped = tapped
+        self.correct = correct        # 已确认的正确选项编号，无法确认时为 None
+        self.states = states          # 各选项的高亮状态：correct / incorrect / None
+
+    @property
+    def is_correct(self) -> Optional[bool]:
+        """所选选项是否正确，未检测到高亮时为 None"""
+        state = self.states[self.tapped - 1] if 0 < self.tapped <= len(self.states) else None
+        if state is None:
+            return None
+        return state == CORRECT
+
+
+class OutcomeDetector:
+    """点击后的作答结果检测器，统计作答正确率与写入的已验证记录数"""
+
+    def __init__(self, delay: float = 0.4, retries: int = 2, retry_interval: float = 0.2,
+                 correct_hue: Tuple[float, float] = (80, 160), incorrect_hue: Tuple[float, float] = (330, 20),
+                 min_saturation: float = 0.35, min_fraction: float = 0.3):
+        self.delay = delay
+        self.retries = retries
+        self.retry_interval = retry_interval
+        self.correct_hue = tuple(correct_hue)
+        self.incorrect_hue = tuple(incorrect_hue)
+        self.min_saturation = min_saturation
+        self.min_fraction = min_fraction
+        self.checked = 0
+        self.correct = 0
+        self.incorrect = 0
+        self.unknown = 0
+        self.recorded = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def from_config(cls, outcome_config: Optional[dict] = None) -> "OutcomeDetector":
+        """根据 `outcome` 配置创建检测器"""
+        cfg = {**DEFAULT_OUTCOME_CONFIG, **(outcome_config or {})}
+        return cls(
+            delay=float(cfg["delay"]),
+            retries=int(cfg["retries"]),
+            retry_interval=float(cfg["retry_interval"]),
+            correct_hue=tuple(float(v) for v in cfg["correct_hue"]),
+            incorrect_hue=tuple(float(v) for v in cfg["incorrect_hue"]),
+            min_saturation=float(cfg["min_saturation"]),
+            min_fraction=float(cfg["min_fraction"]),
+        )
+
+    @staticmethod
+    def supports(controller: AndroidControllerBase) -> bool:
+        """控制器能否提供未裁剪的彩色截图"""
+        return type(controller).capture_raw is not AndroidControllerBase.capture_raw
+
+    def _region(self, img: Image.Image, bbox: list, offset: Tuple[int, int]) -> Tuple[int, int, int, int]:
+        """选项文字框向外扩展到按钮底色部分，换算为原始画面坐标"""
+        xs = [p[0] for p in bbox]
+        ys = [p[1] for p in bbox]
+        x1, y1, x2, y2 = min(xs) + offset[0], min(ys) + offset[1], max(xs) + offset[0], max(ys) + offset[1]
+        pad = max(4, (y2 - y1) // 2)
+        return (max(0, int(x1 - pad)), max(0, int(y1 - pad // 2)),
+                min(img.width, int(x2 + pad)), min(img.height, int(y2 + pad // 2)))
+
+    def classify_region(self, img: Image.Image, box: Tuple[int, int, int, int]) -> Optional[str]:
+        """
+        判断区域的高亮状态
+
+        Returns:
+            correct、incorrect，或 None（未高亮）
+        """
+        if box[2] <= box[0] or box[3] <= box[1]:
+            return None
+        hsv = np.asarray(img.crop(box).convert("RGB").convert("HSV"))
+        hue, sat, val = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+        # 只看饱和且不太暗的像素：白底、灰底与黑色文字都不算
+        colored = (sat >= self.min_saturation * 255) & (val >= 64)
+        total = hue.size
+        if np.count_nonzero(colored) < self.min_fraction * total:
+            return None
+        green = np.count_nonzero(colored & _hue_mask(hue, *self.correct_hue))
+        red = np.count_nonzero(colored & _hue_mask(hue, *self.incorrect_hue))
+        if max(green, red) < self.min_fraction * total:
+            return None
+        return CORRECT if green >= red else INCORRECT
+
+    def inspect(self, img: Image.Image, ocr_results: list, tapped: int, offset: Tuple[int, int]) -> Outcome:
+        """
+        在一帧点击后的原始画面上检查所有选项
+
+        Args:
+            img: 原始彩色截图
+            ocr_results: OCR 结果，第 0 项为题干，之后为选项 (bbox, ...)
+            tapped: 点击的选项编号（从 1 开始）
+            offset: OCR 坐标到原始画面坐标的偏移（裁剪区域左上角）
+        """
+        states = [self.classify_region(img, self._region(img, item[0], offset)) for item in ocr_results[1:]]
+        correct = None
+        if tapped <= len(states) and states[tapped - 1] == CORRECT:
+            correct = tapped
+        else:
+            # 选错时游戏通常同时把正确选项标为绿色
+            greens = [i for i, state in enumerate(states, 1) if state == CORRECT]
+            if len(greens) == 1:
+                correct = greens[0]
+        return Outcome(tapped, correct, states)
+
+    def detect(self, controller: AndroidControllerBase, ocr_results: list, tapped: int,
+               offset: Tuple[int, int]) -> Outcome:
+        """点击后等待高亮出现并截图检查，未检测到时重试"""
+        time.sleep(self.delay)
+        outcome = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.retry_interval)
+            outcome = self.inspect(controller.capture_raw(), ocr_results, tapped, offset)
+            if outcome.is_correct is not None:
+                break
+        return outcome
+
+    def verify(self, controller: AndroidControllerBase, generator: AnswerGeneratorBase,
+               question_body: str, ocr_results: list, tapped: int, offset: Tuple[int, int]) -> Optional[Outcome]:
+        """
+        检测作答结果并反馈给生成器
+
+        确认正确选项时调用 record_outcome；确认选错但看不出正确选项时调用 record_incorrect，
+        避免答案库继续用错误答案命中。
+        """
+        try:
+            outcome = self.detect(controller, ocr_results, tapped, offset)
+        except Exception as e:
+            logger.warning("作答结果检测失败: %s", e)
+            return None
+
+        with self._lock:
+            self.checked += 1
+            if outcome.is_correct is None:
+                self.unknown += 1
+            elif outcome.is_correct:
+                self.correct += 1
+            else:
+                self.incorrect += 1
+            if outcome.correct is not None:
+                self.recorded += 1
+
+        if outcome.correct is not None:
+            generator.record_outcome(question_body, outcome.correct)
+        elif outcome.is_correct is False:
+            generator.record_incorrect(question_body, tapped)
+        logger.info("作答结果: %s", {True: "正确", False: "错误", None: "未知"}[outcome.is_correct],
+                    extra=fields(tapped=tapped, correct=outcome.correct, states=outcome.states))
+        return outcome
+
+    def submit(self, *args):
+        """在后台线程中执行 verify，参数相同；用于不应阻塞的流水线阶段"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="outcome")
+        return self._executor.submit(self.verify, *args)
+
+    def stats(self) -> dict:
+        with self._lock:
+            judged = self.correct + self.incorrect
+            return {
+                "checked": self.checked,
+                "correct": self.correct,
+                "incorrect": self.incorrect,
+                "unknown": self.unknown,
+                "accuracy": round(self.correct / judged, 4) if judged else None,
+                "recorded": self.recorded,
+            }
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,179 @@
+"""
+只读题库
+把答案库导出为紧凑的只读文件，用 mmap 打开：同一台机器上的多个 QuizBot 进程共享同一份页缓存，
+打开时不解析、不建字典，几乎不占启动时间；按题干查询为开放寻址哈希表上的 O(1) 查找
+
+文件格式（小端）:
+    头部      magic "QBANK\\0\\0\\1" | 键规范化版本 u32 | 槽位数 u32 | 记录数 u32 | 记录表偏移 u64 | 字符串区偏移 u64
+    槽位表    槽位数 x (题干键哈希 u64, 首条记录序号 u32, 记录条数 u32)，哈希为 0 表示空槽，线性探测
+    记录表    记录数 x (题干键偏移, 长度, 选项集合键偏移, 长度, 答案偏移, 长度, 是否已验证) 各 u32，
+              同一题干的记录连续存放，已验证、更新时间新的在前
+    字符串区  UTF-8 文本
+
+查询结果与 `AnswerStore.lookup_question` 相同，可以直接交给 `AnswerStore.match_candidates`。
+生成文件见 tools/build_question_bank.py。
+
+用法:
+    bank = QuestionBank("question_bank.qbk")
+    option_number = AnswerStore.match_candidates(bank.lookup_question(question), options)
+"""
+import hashlib
+import mmap
+import os
+import struct
+from typing import Iterable, List, Optional, Tuple
+
+from src.utils.answer_store import KEY_VERSION, options_key
+from src.utils.text_normalize import normalize_key
+
+MAGIC = b"QBANK\0\0\1"
+_HEADER = struct.Struct("<8sIIIQQ")
+_SLOT = struct.Struct("<QII")
+_RECORD = struct.Struct("<7I")
+
+
+def key_hash(key: bytes) -> int:
+    """题干键的 64 位哈希，与进程无关（不受 PYTHONHASHSEED 影响），0 保留给空槽"""
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little") or 1
+
+
+class QuestionBank:
+    """mmap 打开的只读题库，线程安全，可在多个进程中同时打开同一个文件"""
+
+    def __init__(self, path: str):
+        """
+        Raises:
+            ValueError: 文件格式或键规范化版本不符，需要用 tools.build_question_bank 重新生成
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, key_version, self.slots, self.records, records_offset, blob_offset = \
+            _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} 不是题库文件")
+        if key_version != KEY_VERSION:
+            self.close()
+            raise ValueError(f"{path} 的键规范化版本为 {key_version}，当前为 {KEY_VERSION}，请重新生成题库")
+        self._mask = self.slots - 1
+        self._records_offset = records_offset
+        self._blob_offset = blob_offset
+
+    def _text(self, offset: int, length: int) -> str:
+        start = self._blob_offset + offset
+        return self._mm[start:start + length].decode("utf-8")
+
+    def lookup_question(self, question: str) -> List[Tuple[str, str, int]]:
+        """
+        按题干查询全部候选记录
+
+        Returns:
+            [(选项集合键, 答案, 是否已验证), ...]，已验证的排在前面；未收录时为空列表
+        """
+        key = normalize_key(question).encode("utf-8")
+        h = key_hash(key)
+        mm = self._mm
+        index = h & self._mask
+        while True:
+            slot_hash, first, count = _SLOT.unpack_from(mm, _HEADER.size + index * _SLOT.size)
+            if slot_hash == 0:
+                return []
+            if slot_hash == h:
+                rows = []
+                for i in range(first, first + count):
+                    key_off, key_len, opts_off, opts_len, ans_off, ans_len, verified = \
+                        _RECORD.unpack_from(mm, self._records_offset + i * _RECORD.size)
+                    start = self._blob_offset + key_off
+                    if mm[start:start + key_len] != key:
+                        # 64 位哈希碰撞，继续探测
+                        break
+                    rows.append((self._text(opts_off, opts_len), self._text(ans_off, ans_len), verified))
+                if rows:
+                    return rows
+            index = (index + 1) & self._mask
+
+    def __len__(self) -> int:
+        return self.records
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self) -> "QuestionBank":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def build(records: Iterable[dict], path: str) -> int:
+        """
+        由记录生成题库文件（先写临时文件再替换；类 Unix 系统上正在使用旧文件的进程不受影响）
+
+        Args:
+            records: {"question", "options", "answer", "verified"?, "updated_at"?} 字典，
+                     与 `AnswerStore.iter_records` 的输出相同；答案为选项文本
+            path: 输出文件路径
+
+        Returns:
+            写入的记录数（同一题干与选项集合只保留已验证、较新的一条）
+        """
+        # (题干键, 选项集合键) -> (是否已验证, 更新时间, 答案)
+        best = {}
+        for order, record in enumerate(records):
+            qkey = normalize_key(record["question"])
+            okey = options_key(record["options"])
+            if not qkey or not record["answer"]:
+                continue
+            rank = (int(bool(record.get("verified"))), record.get("updated_at", order))
+            current = best.get((qkey, okey))
+            if current is None or rank >= current[:2]:
+                best[(qkey, okey)] = (*rank, record["answer"])
+
+        by_question = {}
+        for (qkey, okey), (verified, updated_at, answer) in best.items():
+            by_question.setdefault(qkey, []).append((-verified, -updated_at, okey, answer))
+
+        # 装载因子不超过 0.5，线性探测的平均探测长度接近 1
+        slots = 1
+        while slots < max(2, len(by_question) * 2):
+            slots *= 2
+        slot_table = [(0, 0, 0)] * slots
+        blob = bytearray()
+        record_table = []
+
+        def add(text: str) -> Tuple[int, int]:
+            data = text.encode("utf-8")
+            blob.extend(data)
+            return len(blob) - len(data), len(data)
+
+        for qkey, rows in by_question.items():
+            key_bytes = qkey.encode("utf-8")
+            h = key_hash(key_bytes)
+            index = h & (slots - 1)
+            while slot_table[index][0] != 0:
+                index = (index + 1) & (slots - 1)
+            slot_table[index] = (h, len(record_table), len(rows))
+            key_off, key_len = add(qkey)
+            for neg_verified, _, okey, answer in sorted(rows):
+                record_table.append((key_off, key_len, *add(okey), *add(answer), -neg_verified))
+
+        records_offset = _HEADER.size + slots * _SLOT.size
+        blob_offset = records_offset + len(record_table) * _RECORD.size
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, KEY_VERSION, slots, len(record_table), records_offset, blob_offset))
+            for slot in slot_table:
+                f.write(_SLOT.pack(*slot))
+            for record in record_table:
+                f.write(_RECORD.pack(*record))
+            f.write(blob)
+        os.replace(tmp_path, path)
+        return len(record_table)
+
+
+def open_bank(path: Optional[str]) -> Optional[QuestionBank]:
+    """打开题库；未配置或文件不存在时返回 None"""
+    if not path or not os.path.exists(path):
+        return None
+    return QuestionBank(path)
@@ -0,0 +1,178 @@
+"""
+截图录制目录格式
+SessionRecorder 录制、ReplayController 回放与合成画面生成器共用
+
+录制目录格式:
+    manifest.jsonl   每行一个事件
+        {"type": "frame", "t": 0.000, "file": "frame_00001.png", "format": "png"}
+        {"type": "frame", "t": 1.532, "file": "frame_00002.raw", "format": "raw",
+         "width": 1080, "height": 2400, "mode": "RGB"}
+        {"type": "tap", "t": 2.104, "x": 540, "y": 1320}
+    frame_*.png / frame_*.raw   原始全屏截图（未裁剪、未二值化），raw 为 Image.tobytes()
+"""
+import json
+import os
+import re
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from PIL import Image
+
+MANIFEST_NAME = "manifest.jsonl"
+
+_FRAME_NUMBER_RE = re.compile(r"frame_(\d+)\.")
+# 续录时两段录制之间的时间间隔（秒）
+_RESUME_GAP = 1.0
+
+
+def write_frame(directory: str, name: str, img: Image.Image, frame_format: str) -> dict:
+    """将一帧写入目录，返回清单中的帧事件（不含时间戳）"""
+    event = {"type": "frame", "file": name, "format": frame_format}
+    if frame_format == "png":
+        # 低压缩级别：录制不能拖慢截图，体积稍大可以接受
+        img.save(os.path.join(directory, name), compress_level=1)
+    else:
+        with open(os.path.join(directory, name), "wb") as f:
+            f.write(img.tobytes())
+        event.update(width=img.width, height=img.height, mode=img.mode)
+    return event
+
+
+def load_frame(directory: str, event: dict) -> Image.Image:
+    """按帧事件读取一帧图像"""
+    path = os.path.join(directory, event["file"])
+    if event.get("format") == "raw":
+        with open(path, "rb") as f:
+            return Image.frombytes(event.get("mode", "RGB"), (event["width"], event["height"]), f.read())
+    img = Image.open(path)
+    img.load()
+    return img
+
+
+def load_frame_into(directory: str, event: dict, pool):
+    """
+    按帧事件读取一帧为 (高, 宽, 通道) uint8 数组，调用方用 pool.release 归还
+
+    raw 帧直接 readinto 到缓冲池借出的数组中，没有中间缓冲区；png 帧的解码本身就要分配，
+    解码结果转换为数组后直接返回（不属于缓冲池，归还时忽略），省去再复制一次。
+    """
+    import numpy as np
+
+    path = os.path.join(directory, event["file"])
+    if event.get("format") == "raw" and event.get("mode", "RGB") in ("RGB", "RGBA"):
+        channels = 4 if event.get("mode") == "RGBA" else 3
+        frame = pool.acquire((event["height"], event["width"], channels), np.uint8)
+        try:
+            with open(path, "rb") as f:
+                if f.readinto(memoryview(frame).cast("B")) != frame.nbytes:
+                    raise ValueError(f"帧文件不完整: {path}")
+        except BaseException:
+            pool.release(frame)
+            raise
+        return frame
+    img = load_frame(directory, event)
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGB")
+    return np.asarray(img)
+
+
+def load_manifest(directory: str) -> Tuple[List[dict], List[dict]]:
+    """读取录制目录，返回 (帧事件列表, 点击事件列表)"""
+    frames, taps = [], []
+    with open(os.path.join(directory, MANIFEST_NAME), encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                # 录制中断时写了一半的行
+                continue
+            if event.get("type") == "frame":
+                frames.append(event)
+            elif event.get("type") == "tap":
+                taps.append(event)
+    return frames, taps
+
+
+def _resume_point(path: str) -> Tuple[int, float]:
+    """已有清单中最大的帧序号与最后的时间戳，清单不存在时为 (0, 0.0)"""
+    last_frame, last_t = 0, 0.0
+    if not os.path.exists(path):
+        return last_frame, last_t
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                # 上次录制中断时写了一半的行
+                continue
+            last_t = max(last_t, float(event.get("t", 0.0)))
+            match = _FRAME_NUMBER_RE.match(event.get("file", ""))
+            if match:
+                last_frame = max(last_frame, int(match.group(1)))
+    return last_frame, last_t
+
+
+class SessionRecorder:
+    """将截图与点击录制为回放目录
+
+    目录中已有录制时接在其后继续：帧序号从已有的最大序号往后编号，
+    时间戳整体后移到已有时间线末尾之后，回放时两段依次播放。
+    """
+
+    def __init__(self, directory: str, frame_format: str = "png"):
+        """
+        Args:
+            directory: 输出目录，不存在时创建
+            frame_format: "png" 体积小；"raw" 回放时无需解码，适合测量下游阶段
+        """
+        if frame_format not in ("png", "raw"):
+            raise ValueError(f"未知的帧格式: {frame_format}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.frame_format = frame_format
+        manifest_path = os.path.join(directory, MANIFEST_NAME)
+        self.frames, last_t = _resume_point(manifest_path)
+        self._offset = last_t + _RESUME_GAP if self.frames or last_t else 0.0
+        self._start = time.monotonic()
+        self._lock = threading.Lock()
+        self._manifest = open(manifest_path, "a", encoding="utf-8")
+        if self._manifest.tell() > 0:
+            # 上次中断时最后一行可能没有换行，另起一行以免与新事件粘连
+            with open(manifest_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._manifest.write("\n")
+
+    def _write(self, event: dict, t: Optional[float] = None):
+        elapsed = time.monotonic() - self._start if t is None else t
+        event["t"] = round(self._offset + elapsed, 4)
+        self._manifest.write(json.dumps(event, ensure_ascii=False) + "\n")
+        self._manifest.flush()
+
+    def frame(self, img: Image.Image, t: Optional[float] = None, **extra):
+        """
+        录制一帧
+
+        Args:
+            img: 原始全屏截图
+            t: 时间戳（秒），None 表示距录制开始的实际时间
+            extra: 附加到帧事件中的字段，例如合成画面的真实标注
+        """
+        with self._lock:
+            self.frames += 1
+            event = write_frame(self.directory, f"frame_{self.frames:05d}.{self.frame_format}",
+                                img, self.frame_format)
+            event.update(extra)
+            self._write(event, t)
+
+    def tap(self, x: int, y: int):
+        with self._lock:
+            self._write({"type": "tap", "x": int(x), "y": int(y)})
+
+    def close(self):
+        with self._lock:
+            self._manifest.close()
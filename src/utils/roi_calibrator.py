@@ -0,0 +1,309 @@
+"""
+答题区域（ROI）自动标定模块
+用原始截图的行/列投影找出题干与选项所在的最小矩形，按设备序列号与分辨率缓存，
+替代手工调整的 `screenshot.crop_ratios`，使 OCR 在各种屏幕比例下只处理必要的像素
+
+标定（均在宽度为 width 的灰度缩略图上计算）:
+    1. 相邻像素灰度跳变足够密集的行为文字行，连续的文字行聚成文本块
+    2. 中心落在先验区域（配置中的 crop_ratios）内的文本块为种子；
+       向下继续收入间距不超过 max_gap 的文本块，避免选项被先验区域截断
+    3. 种子到最后一个文本块之间按列投影得到左右边界
+    4. OCR 确认是答题页的 frames 帧取并集，加上边距后写入控制器
+
+校验：标定完成后每隔 check_every 帧复查一次，选项更多、题干更长的题超出当前区域时扩大区域；
+OCR 文本框贴住裁剪边缘（被截断）或连续没有识别出题目 max_failures 次时重新标定。
+"""
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from src.core.base import AndroidControllerBase
+from src.utils.device_cache import device_key, load_entries, save_entry
+from src.utils.image_ops import as_image, image_size
+from src.utils.log import fields, get_logger
+
+logger = get_logger(__name__)
+
+Ratios = Tuple[float, float, float, float]
+
+DEFAULT_ROI_CONFIG = {
+    "enabled": False,
+    "cache_path": "roi_cache.json",   # 标定结果缓存，键为 "设备序列号@宽x高"
+    "frames": 5,                      # 取并集的答题页帧数
+    "width": 270,                     # 缩略图宽度
+    "edge_delta": 48,                 # 相邻像素灰度差超过该值记为一次跳变
+    "row_density": 0.02,              # 跳变占比超过该值的行视为文字行
+    "col_density": 0.02,              # 答题区域内跳变占比超过该值的列视为有文字
+    "min_bands": 3,                   # 答题区域至少的文本块数（题干 + 2 个选项）
+    "max_gap": 0.06,                  # 先验区域以下继续收入文本块的最大间距（占画面高度）
+    "padding": [0.02, 0.01],          # 左右、上下边距（占画面宽、高）
+    "edge_margin": 2,                 # OCR 文本框距裁剪边缘不超过该像素数视为被截断
+    "max_failures": 3,                # 连续校验失败多少次后重新标定
+    "check_every": 30,                # 标定后每隔多少帧复查一次，题目版式超出当前区域时扩大
+}
+
+
+def _bands(rows: np.ndarray) -> List[Tuple[int, int]]:
+    """文字行聚成的文本块 [(起始行, 结束行)]，结束行不含；允许一行的断开"""
+    filled = rows.copy()
+    filled[1:-1] |= rows[:-2] & rows[2:]
+    padded = np.concatenate(([False], filled, [False]))
+    changes = np.flatnonzero(padded[1:] != padded[:-1])
+    return [(int(a), int(b)) for a, b in zip(changes[::2], changes[1::2])]
+
+
+class RoiCandidate:
+    """一帧原始截图上测得的答题区域，等 OCR 确认是答题页后才计入标定"""
+
+    __slots__ = ("key", "ratios")
+
+    def __init__(self, key: str, ratios: Ratios):
+        self.key = key
+        self.ratios = ratios
+
+
+class RoiCalibrator:
+    """单个控制器的答题区域标定与校验
+
+    调用顺序：每帧预处理之前 `prepare(原始截图)`，OCR 之后 `feedback(候选, OCR 结果, 裁剪后尺寸)`。
+    两者可以在不同线程中调用（流水线运行器）。
+    """
+
+    def __init__(self, controller: AndroidControllerBase, prior: Ratios = (0.0, 0.2, 1.0, 0.7),
+                 cache_path: Optional[str] = "roi_cache.json", frames: int = 5, width: int = 270,
+                 edge_delta: int = 48, row_density: float = 0.02, col_density: float = 0.02,
+                 min_bands: int = 3, max_gap: float = 0.06, padding: Tuple[float, float] = (0.02, 0.01),
+                 edge_margin: int = 2, max_failures: int = 3, check_every: int = 30,
+                 on_change: Optional[Callable[[Ratios], None]] = None):
+        self.controller = controller
+        self.prior = tuple(prior)
+        self.cache_path = cache_path
+        self.frames = frames
+        self.width = width
+        self.edge_delta = edge_delta
+        self.row_density = row_density
+        self.col_density = col_density
+        self.min_bands = min_bands
+        self.max_gap = max_gap
+        self.padding = tuple(padding)
+        self.edge_margin = edge_margin
+        self.max_failures = max_failures
+        self.check_every = check_every
+        self.on_change = on_change
+        self.key: Optional[str] = None
+        self.ratios: Optional[Ratios] = None
+        self.calibrating = True
+        self.calibrations = 0
+        self.expansions = 0
+        self.recalibrations = 0
+        self._measured: Optional[Ratios] = None    # 不含边距的区域，复查时在此基础上扩大
+        self._samples: List[Ratios] = []
+        self._failures = 0
+        self._frame_count = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, controller: AndroidControllerBase, roi_config: Optional[dict] = None,
+                    prior: Ratios = (0.0, 0.2, 1.0, 0.7),
+                    on_change: Optional[Callable[[Ratios], None]] = None) -> "RoiCalibrator":
+        """根据 `roi_calibration` 配置创建标定器，prior 为配置中的 crop_ratios"""
+        cfg = {**DEFAULT_ROI_CONFIG, **(roi_config or {})}
+        return cls(
+            controller,
+            prior=prior,
+            cache_path=cfg["cache_path"],
+            frames=int(cfg["frames"]),
+            width=int(cfg["width"]),
+            edge_delta=int(cfg["edge_delta"]),
+            row_density=float(cfg["row_density"]),
+            col_density=float(cfg["col_density"]),
+            min_bands=int(cfg["min_bands"]),
+            max_gap=float(cfg["max_gap"]),
+            padding=tuple(float(v) for v in cfg["padding"]),
+            edge_margin=int(cfg["edge_margin"]),
+            max_failures=int(cfg["max_failures"]),
+            check_every=int(cfg["check_every"]),
+            on_change=on_change,
+        )
+
+    @staticmethod
+    def supports(controller: AndroidControllerBase) -> bool:
+        """控制器能否提供原始截图并设置裁剪比例"""
+        cls = type(controller)
+        return (cls.capture_raw is not AndroidControllerBase.capture_raw
+                and cls.preprocess is not AndroidControllerBase.preprocess
+                and cls.set_crop_ratios is not AndroidControllerBase.set_crop_ratios)
+
+    # ---- 测量 ----
+
+    def measure(self, img: Image.Image) -> Optional[Ratios]:
+        """
+        在一帧原始截图上测量答题区域（不含边距）
+
+        Returns:
+            (左, 上, 右, 下) 比例，找不到足够的文本块时返回 None
+        """
+        height = max(8, round(img.height * self.width / max(1, img.width)))
+        small = np.asarray(img.convert("L").resize((self.width, height), Image.BOX), dtype=np.int16)
+        edges = np.abs(np.diff(small, axis=1)) > self.edge_delta
+
+        bands = _bands(edges.mean(axis=1) > self.row_density)
+        top, bottom = self.prior[1] * height, self.prior[3] * height
+        seeds = [i for i, (a, b) in enumerate(bands) if top <= (a + b) / 2 <= bottom]
+        if not seeds:
+            return None
+        last = seeds[-1]
+        while last + 1 < len(bands) and bands[last + 1][0] - bands[last][1] <= self.max_gap * height:
+            last += 1
+        if last - seeds[0] + 1 < self.min_bands:
+            return None
+
+        r0, r1 = bands[seeds[0]][0], bands[last][1]
+        cols = np.flatnonzero(edges[r0:r1].mean(axis=0) > self.col_density)
+        if cols.size == 0:
+            return None
+        # diff 后第 i 列是第 i 与 i+1 像素之间的跳变
+        return (float(cols[0] / self.width), r0 / height, float((cols[-1] + 2) / self.width), r1 / height)
+
+    @staticmethod
+    def _union(samples: List[Ratios]) -> Ratios:
+        return (min(s[0] for s in samples), min(s[1] for s in samples),
+                max(s[2] for s in samples), max(s[3] for s in samples))
+
+    def _pad(self, measured: Ratios) -> Ratios:
+        """加上边距并限制在画面内"""
+        pad_x, pad_y = self.padding
+        return (round(max(0.0, measured[0] - pad_x), 4), round(max(0.0, measured[1] - pad_y), 4),
+                round(min(1.0, measured[2] + pad_x), 4), round(min(1.0, measured[3] + pad_y), 4))
+
+    # ---- 运行时 ----
+
+    def prepare(self, raw: Image.Image) -> Optional[RoiCandidate]:
+        """
+        预处理之前调用：分辨率变化时查缓存；标定中或到了复查间隔时测量本帧
+
+        raw 也可以是缓冲池中的 (高, 宽, 通道) 数组，只在需要测量时转换为 PIL 图像。
+
+        Returns:
+            本帧的候选区域，交给 feedback；无需测量时返回 None
+        """
+        key = device_key(self.controller, image_size(raw))
+        if key != self.key:
+            self._switch(key)
+        with self._lock:
+            self._frame_count += 1
+            due = self.calibrating or (self.check_every and self._frame_count % self.check_every == 0)
+        if not due:
+            return None
+        ratios = self.measure(as_image(raw))
+        return RoiCandidate(key, ratios) if ratios is not None else None
+
+    def feedback(self, candidate: Optional[RoiCandidate], ocr_results: list, size: Tuple[int, int]):
+        """
+        OCR 之后调用
+
+        标定中：识别出题目的帧计入标定。标定后：复查帧测得的区域超出当前区域（如选项更多的题）时扩大区域；
+        文本框被截断或识别不到题目连续 max_failures 次时重新标定。
+
+        Args:
+            candidate: 同一帧 prepare 的返回值
+            ocr_results: OCR 结果，第 0 项为题干，之后为选项 (bbox, ...)
+            size: 交给 OCR 的裁剪后图像尺寸
+        """
+        found = bool(ocr_results) and len(ocr_results) >= 2
+        usable = candidate is not None and found and candidate.key == self.key
+        with self._lock:
+            if self.calibrating:
+                if not usable:
+                    return
+                self._samples.append(candidate.ratios)
+                if len(self._samples) < self.frames:
+                    return
+                measured, source = self._union(self._samples), "calibrated"
+                self._samples = []
+            elif usable and self._measured is not None and \
+                    self._union([self._measured, candidate.ratios]) != self._measured:
+                measured, source = self._union([self._measured, candidate.ratios]), "expanded"
+            else:
+                if found and not self._truncated(ocr_results, size):
+                    self._failures = 0
+                    return
+                self._failures += 1
+                if self._failures >= self.max_failures:
+                    logger.warning("答题区域校验连续失败 %d 次，重新标定", self._failures,
+                                   extra=fields(device=self.key, crop_ratios=list(self.ratios or ())))
+                    self.recalibrations += 1
+                    self._failures = 0
+                    self._samples = []
+                    self.calibrating = True
+                return
+        self._apply(measured, source)
+        self._save(self.key, measured)
+
+    def _truncated(self, ocr_results: list, size: Tuple[int, int]) -> bool:
+        """文本框贴住裁剪边缘，说明区域过小截断了文字"""
+        width, height = size
+        m = self.edge_margin
+        for item in ocr_results:
+            xs = [p[0] for p in item[0]]
+            ys = [p[1] for p in item[0]]
+            if min(xs) <= m or min(ys) <= m or max(xs) >= width - m or max(ys) >= height - m:
+                return True
+        return False
+
+    def _switch(self, key: str):
+        """切换到新的设备/分辨率：命中缓存时直接应用，否则开始标定"""
+        measured = self._load().get(key)
+        with self._lock:
+            self.key = key
+            self._samples = []
+            self._failures = 0
+            self._measured = None
+            self.calibrating = measured is None
+        if measured is not None:
+            self._apply(tuple(measured), source="cache")
+        else:
+            logger.info("开始标定答题区域", extra=fields(device=key))
+
+    def _apply(self, measured: Ratios, source: str):
+        ratios = self._pad(measured)
+        with self._lock:
+            self._measured = measured
+            self.ratios = ratios
+            self.calibrating = False
+            if source == "calibrated":
+                self.calibrations += 1
+            elif source == "expanded":
+                self.expansions += 1
+        self.controller.set_crop_ratios(*ratios)
+        logger.info("答题区域: %s", {"calibrated": "已标定", "expanded": "已扩大", "cache": "使用缓存"}[source],
+                    extra=fields(device=self.key, crop_ratios=list(ratios),
+                                 area=round((ratios[2] - ratios[0]) * (ratios[3] - ratios[1]), 4)))
+        if self.on_change is not None:
+            self.on_change(ratios)
+
+    # ---- 缓存 ----
+
+    def _load(self) -> dict:
+        """缓存中各设备测得的区域（不含边距，边距按当前配置重新计算）"""
+        return {key: entry["measured"] for key, entry in load_entries(self.cache_path).items()
+                if isinstance(entry, dict) and "measured" in entry}
+
+    def _save(self, key: str, measured: Ratios):
+        save_entry(self.cache_path, key, {"measured": [round(v, 4) for v in measured],
+                                          "crop_ratios": list(self._pad(measured)),
+                                          "calibrated_at": round(time.time())})
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "device": self.key,
+                "crop_ratios": list(self.ratios) if self.ratios else None,
+                "calibrating": self.calibrating,
+                "calibrations": self.calibrations,
+                "expansions": self.expansions,
+                "recalibrations": self.recalibrations,
+            }
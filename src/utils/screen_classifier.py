@@ -0,0 +1,227 @@
+"""
+画面分类模块
+在 OCR 之前用缩小后的截图判断当前画面是答题页、过渡画面（加载、切换动画）还是结果页，
+只有答题页才交给 OCR，避免在非答题画面上浪费一次推理
+
+特征（均在宽度为 width 的灰度缩略图上计算，1080p 截图耗时约 3-4 ms）:
+    white_ratio   亮像素占比
+    text_rows     含文字的行占比：相邻像素灰度跳变足够密集的行视为文字行
+    bands         文字行聚成的文本块数，答题页至少有题干 + 两个选项
+    similarity    文字行分布与答题页版式模板的余弦相似度，模板从 OCR 成功的画面在线学习
+"""
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+from PIL import Image
+
+from src.utils.log import fields, get_logger
+
+logger = get_logger(__name__)
+
+QUESTION = "question"
+TRANSITION = "transition"
+RESULT = "result"
+LABELS = (QUESTION, TRANSITION, RESULT)
+
+DEFAULT_CLASSIFIER_CONFIG = {
+    "enabled": False,
+    "width": 160,                 # 缩略图宽度
+    "edge_delta": 48,             # 相邻像素灰度差超过该值记为一次跳变
+    "row_density": 0.02,          # 跳变占比超过该值的行视为文字行
+    "min_text_rows": 0.02,        # 文字行占比低于该值视为过渡画面
+    "blank_ratio": 0.998,         # 亮像素（或暗像素）占比超过该值视为过渡画面（几乎空白）
+    "min_bands": 3,               # 答题页至少的文本块数（题干 + 2 个选项）
+    "template_bins": 32,          # 版式模板的纵向分箱数
+    "template_min_samples": 5,    # 模板学习到多少帧后才参与判断
+    "template_threshold": 0.6,    # 与模板的相似度低于该值视为结果页
+    "probe_every": 20,            # 连续跳过这么多帧后放行一帧做 OCR，防止分类器误判导致卡住
+}
+
+
+class ScreenClassifier:
+    """基于缩略图统计特征的答题画面分类器"""
+
+    def __init__(self, width: int = 160, edge_delta: int = 48, row_density: float = 0.02,
+                 min_text_rows: float = 0.02, blank_ratio: float = 0.998, min_bands: int = 3,
+                 template_bins: int = 32, template_min_samples: int = 5, template_threshold: float = 0.6):
+        self.width = width
+        self.edge_delta = edge_delta
+        self.row_density = row_density
+        self.min_text_rows = min_text_rows
+        self.blank_ratio = blank_ratio
+        self.min_bands = min_bands
+        self.template_bins = template_bins
+        self.template_min_samples = template_min_samples
+        self.template_threshold = template_threshold
+        self.template = np.zeros(template_bins, dtype=np.float64)
+        self.template_samples = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, classifier_config: Optional[dict] = None) -> "ScreenClassifier":
+        """根据 `screen_classifier` 配置创建分类器"""
+        cfg = {**DEFAULT_CLASSIFIER_CONFIG, **(classifier_config or {})}
+        return cls(
+            width=int(cfg["width"]),
+            edge_delta=int(cfg["edge_delta"]),
+            row_density=float(cfg["row_density"]),
+            min_text_rows=float(cfg["min_text_rows"]),
+            blank_ratio=float(cfg["blank_ratio"]),
+            min_bands=int(cfg["min_bands"]),
+            template_bins=int(cfg["template_bins"]),
+            template_min_samples=int(cfg["template_min_samples"]),
+            template_threshold=float(cfg["template_threshold"]),
+        )
+
+    def features(self, img: Image.Image) -> Dict[str, object]:
+        """
+        计算分类特征
+
+        Returns:
+            {white_ratio, text_rows, bands, profile}，profile 为各纵向分箱内文字行占比
+        """
+        height = max(8, round(img.height * self.width / max(1, img.width)))
+        small = np.asarray(img.convert("L").resize((self.width, height), Image.BOX), dtype=np.int16)
+
+        text = (np.abs(np.diff(small, axis=1)) > self.edge_delta).mean(axis=1) > self.row_density
+        # 文本块：连续的文字行，允许一行的断开（行内笔画稀疏处）
+        filled = text.copy()
+        filled[1:-1] |= text[:-2] & text[2:]
+        bands = int(np.count_nonzero(filled[1:] & ~filled[:-1]) + filled[0])
+
+        edges = np.linspace(0, height, self.template_bins + 1).astype(int)
+        profile = np.array([text[a:b].mean() if b > a else 0.0 for a, b in zip(edges[:-1], edges[1:])])
+        return {
+            "white_ratio": round(float((small > 127).mean()), 4),
+            "text_rows": round(float(text.mean()), 4),
+            "bands": bands,
+            "profile": profile,
+        }
+
+    def similarity(self, profile: np.ndarray) -> Optional[float]:
+        """与版式模板的余弦相似度，模板样本不足时返回 None"""
+        with self._lock:
+            if self.template_samples < self.template_min_samples:
+                return None
+            template = self.template.copy()
+        denom = np.linalg.norm(template) * np.linalg.norm(profile)
+        return float(template @ profile / denom) if denom > 0 else 0.0
+
+    def classify(self, img: Image.Image) -> "ScreenVerdict":
+        """判断画面类别"""
+        feats = self.features(img)
+        similarity = None
+        blank = max(feats["white_ratio"], 1 - feats["white_ratio"]) > self.blank_ratio
+        if blank or feats["text_rows"] < self.min_text_rows or feats["bands"] == 0:
+            label = TRANSITION
+        elif feats["bands"] < self.min_bands:
+            label = RESULT
+        else:
+            similarity = self.similarity(feats["profile"])
+            label = RESULT if similarity is not None and similarity < self.template_threshold else QUESTION
+        return ScreenVerdict(label, feats, similarity)
+
+    def learn(self, profile: np.ndarray):
+        """把一帧已确认的答题页加入版式模板（累计平均）"""
+        with self._lock:
+            self.template_samples += 1
+            self.template += (profile - self.template) / self.template_samples
+
+    def reset(self):
+        """清空版式模板，裁剪区域改变后重新学习"""
+        with self._lock:
+            self.template = np.zeros(self.template_bins, dtype=np.float64)
+            self.template_samples = 0
+
+
+class ScreenVerdict:
+    """一帧的分类结果；ocr 表示是否交给 OCR"""
+
+    __slots__ = ("label", "features", "similarity", "ocr", "probe")
+
+    def __init__(self, label: str, features: Optional[dict] = None, similarity: Optional[float] = None):
+        self.label = label
+        self.features = features or {}
+        self.similarity = similarity
+        self.ocr = label == QUESTION
+        self.probe = False
+
+    def log_fields(self) -> dict:
+        """用于日志的特征字段（不含分箱数组）"""
+        extra = {k: v for k, v in self.features.items() if k != "profile"}
+        if self.similarity is not None:
+            extra["similarity"] = round(self.similarity, 3)
+        return fields(screen=self.label, **extra)
+
+
+class ScreenGate:
+    """OCR 之前的画面筛选与浪费统计
+
+    未提供分类器时所有画面都交给 OCR，仍然统计 OCR 调用中有多少没有得到题目（浪费）。
+    连续跳过 probe_every 帧后放行一帧，若其实是答题页则记为漏判并学习其版式。
+    多个运行器线程或会话可以共享同一个实例。
+    """
+
+    def __init__(self, classifier: Optional[ScreenClassifier] = None, probe_every: int = 20):
+        self.classifier = classifier
+        self.probe_every = probe_every
+        self.frames = {label: 0 for label in LABELS}
+        self.ocr_calls = 0
+        self.wasted_ocr = 0
+        self.skipped_ocr = 0
+        self.probes = 0
+        self.missed = 0
+        self._consecutive_skips = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, classifier_config: Optional[dict] = None) -> "ScreenGate":
+        cfg = {**DEFAULT_CLASSIFIER_CONFIG, **(classifier_config or {})}
+        classifier = ScreenClassifier.from_config(cfg) if cfg["enabled"] else None
+        return cls(classifier, probe_every=int(cfg["probe_every"]))
+
+    def check(self, img: Image.Image) -> ScreenVerdict:
+        """分类一帧并决定是否交给 OCR"""
+        verdict = self.classifier.classify(img) if self.classifier else ScreenVerdict(QUESTION)
+        with self._lock:
+            self.frames[verdict.label] += 1
+            if verdict.ocr:
+                self._consecutive_skips = 0
+            elif self.probe_every and self._consecutive_skips + 1 >= self.probe_every:
+                self._consecutive_skips = 0
+                verdict.ocr = verdict.probe = True
+                self.probes += 1
+            else:
+                self._consecutive_skips += 1
+                self.skipped_ocr += 1
+        return verdict
+
+    def record_ocr(self, verdict: ScreenVerdict, found_question: bool):
+        """记录一次 OCR 的结果：未得到题目即为浪费；得到题目时更新版式模板"""
+        with self._lock:
+            self.ocr_calls += 1
+            if not found_question:
+                self.wasted_ocr += 1
+            elif verdict.probe:
+                self.missed += 1
+        if found_question and self.classifier is not None and "profile" in verdict.features:
+            if verdict.probe:
+                logger.warning("画面分类漏判: 判为 %s 的画面识别出了题目", verdict.label, extra=verdict.log_fields())
+            self.classifier.learn(verdict.features["profile"])
+
+    def reset_template(self):
+        """裁剪区域改变后版式模板不再适用"""
+        if self.classifier is not None:
+            self.classifier.reset()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **{f"{label}_frames": count for label, count in self.frames.items()},
+                "ocr_calls": self.ocr_calls,
+                "wasted_ocr": self.wasted_ocr,
+                "skipped_ocr": self.skipped_ocr,
+                "probes": self.probes,
+                "missed": self.missed,
+            }
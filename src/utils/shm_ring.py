@@ -0,0 +1,188 @@
+"""
+共享内存帧环
+截图与 OCR 分在不同进程时，经 multiprocessing.Queue 传递整帧需要在发送端 pickle、
+经管道复制、在接收端再反序列化一次。这里在 `multiprocessing.shared_memory` 上划出固定大小的
+槽位环，像素只写一次；队列中只传槽位编号、形状与元数据，接收端直接把槽位包装成 NumPy 视图
+
+写入端的 `acquire` / `release` 与 FramePool 接口相同，可以直接交给控制器的
+`capture_frame(pool)`，截图数据从 adb 管道 readinto 后即位于共享内存中。
+
+用法:
+    ring = SharedFrameRing(slots=4, slot_size=2400 * 1080 * 4 + 4)
+    # 截图进程
+    frame = controller.capture_frame(ring)
+    ring.send(frame, t=time.time())
+    # OCR 进程（ring 作为 Process 参数传入）
+    with ring.receive() as shared:
+        extractor.extract_question(shared.array)
+    # 结束
+    ring.send_eof(); ring.close(); ring.unlink()
+"""
+import multiprocessing
+import queue
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class SharedFrame:
+    """接收端拿到的一帧，array 是共享内存的视图，用完后 release 归还槽位"""
+
+    __slots__ = ("index", "array", "meta", "_ring")
+
+    def __init__(self, ring: "SharedFrameRing", index: int, array: np.ndarray, meta: dict):
+        self._ring = ring
+        self.index = index
+        self.array = array
+        self.meta = meta
+
+    def release(self):
+        if self._ring is not None:
+            self.array = None
+            self._ring._free.put(self.index)
+            self._ring = None
+
+    def __enter__(self) -> "SharedFrame":
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class SharedFrameRing:
+    """共享内存上的固定槽位环，一个写入进程、一个或多个读取进程
+
+    空闲槽位编号放在 free 队列中，写好的槽位经 ready 队列发给读取端，读取端用完后放回 free；
+    槽位全部被占用时写入端阻塞（背压）。对象可以作为 Process 参数传给子进程，
+    子进程中按名称重新打开同一块共享内存。
+    """
+
+    def __init__(self, slots: int = 4, slot_size: int = 1920 * 1080 * 4, ctx=None):
+        """
+        Args:
+            slots: 槽位数，即同时在途的最大帧数
+            slot_size: 每个槽位的字节数，应不小于最大一帧（ADB 原始截图为 宽*高*4+4）
+            ctx: multiprocessing 上下文，默认使用当前的启动方式
+        """
+        ctx = ctx or multiprocessing
+        # 按 64 字节对齐，每个槽位的起始地址都适合向量化读取
+        self.slot_size = (int(slot_size) + 63) // 64 * 64
+        self.slots = slots
+        self._shm = shared_memory.SharedMemory(create=True, size=self.slots * self.slot_size)
+        self._owner = True
+        self._free = ctx.Queue()
+        self._ready = ctx.Queue()
+        for index in range(slots):
+            self._free.put(index)
+        self._map()
+
+    def _map(self):
+        self._all = np.ndarray((self.slots * self.slot_size,), dtype=np.uint8, buffer=self._shm.buf)
+        self._base = self._all.ctypes.data
+        self.sent = 0
+        self.received = 0
+
+    def __getstate__(self):
+        return {"name": self._shm.name, "slots": self.slots, "slot_size": self.slot_size,
+                "free": self._free, "ready": self._ready}
+
+    def __setstate__(self, state):
+        self.slots = state["slots"]
+        self.slot_size = state["slot_size"]
+        self._free = state["free"]
+        self._ready = state["ready"]
+        # 子进程与创建进程共用同一个 resource_tracker，重复登记无害，删除仍由创建进程负责
+        self._shm = shared_memory.SharedMemory(name=state["name"])
+        self._owner = False
+        self._map()
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def _slot_of(self, arr: np.ndarray) -> Tuple[int, int]:
+        """数组所在的 (槽位编号, 槽位内偏移)"""
+        offset = arr.__array_interface__["data"][0] - self._base
+        if not 0 <= offset < self.slots * self.slot_size:
+            raise ValueError("数组不在本共享内存环中")
+        return divmod(offset, self.slot_size)
+
+    # ---- 写入端 ----
+
+    def acquire(self, shape: Tuple[int, ...], dtype=np.uint8, timeout: Optional[float] = None) -> np.ndarray:
+        """
+        借出一个空闲槽位，返回位于其中的数组（内容未初始化）
+
+        Raises:
+            ValueError: 一帧超过槽位大小
+            TimeoutError: timeout 秒内没有空闲槽位
+        """
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        if nbytes > self.slot_size:
+            raise ValueError(f"帧大小 {nbytes} 字节超过槽位大小 {self.slot_size}")
+        try:
+            index = self._free.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("没有空闲的共享内存槽位") from None
+        return np.ndarray(shape, dtype=dtype, buffer=self._shm.buf, offset=index * self.slot_size)
+
+    def release(self, arr: np.ndarray):
+        """归还借出但不发送的槽位（如截图失败、画面被丢弃）"""
+        index, _ = self._slot_of(arr)
+        self._free.put(index)
+
+    def send(self, arr: np.ndarray, **meta):
+        """
+        把槽位中的数组发给读取端，之后写入端不应再修改它
+
+        arr 可以是 acquire 返回数组的连续视图（如 ADB 截图跳过头部后的 reshape）。
+        """
+        if not arr.flags.c_contiguous:
+            raise ValueError("只能发送连续的数组")
+        index, offset = self._slot_of(arr)
+        self._ready.put((index, offset, arr.shape, arr.dtype.str, meta))
+        self.sent += 1
+
+    def send_eof(self, readers: int = 1):
+        """通知读取端不再有新帧，每个读取进程一个结束标记"""
+        for _ in range(readers):
+            self._ready.put(None)
+
+    # ---- 读取端 ----
+
+    def receive(self, timeout: Optional[float] = None) -> Optional[SharedFrame]:
+        """
+        取下一帧，数组是共享内存的只读视图，不复制
+
+        Returns:
+            SharedFrame；写入端调用 send_eof 后返回 None
+
+        Raises:
+            TimeoutError: timeout 秒内没有新帧
+        """
+        try:
+            item = self._ready.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("等待新帧超时") from None
+        if item is None:
+            return None
+        index, offset, shape, dtype, meta = item
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=self._shm.buf,
+                           offset=index * self.slot_size + offset)
+        array.flags.writeable = False
+        self.received += 1
+        return SharedFrame(self, index, array, meta)
+
+    # ---- 清理 ----
+
+    def close(self):
+        """关闭本进程中的映射；之前取得的数组视图必须已全部释放"""
+        self._all = None
+        self._shm.close()
+
+    def unlink(self):
+        """删除共享内存，只在创建它的进程中、所有进程都 close 之后调用"""
+        if self._owner:
+            self._shm.unlink()
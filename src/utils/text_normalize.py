@@ -0,0 +1,107 @@
+"""
+OCR 文本规范化
+答案库的缓存键、选项匹配与流水线去重都需要把 OCR 文本规范为同一形式：同一道题在不同帧、
+不同设备上可能识别出全角/半角不同的字母数字、中英文标点、有无书名号、前面带不带 A/B/C/D 标记。
+
+所有替换与删除预先合并为一张映射表。纯 ASCII 文本直接 `str.translate`（CPython 对 ASCII 有快速路径）；
+含中文的文本上 translate 要为每个字符查一次表，这里改为先 `str.lower`，再用预编译的正则找出
+真正需要替换的少数字符逐个 `str.replace`，通常快一倍。选项标记同样用预编译的正则处理。
+
+    normalize_key("Ａ．《红楼梦》 ")   -> "红楼梦"
+    normalize_key("下列哪个是 CPU？")  -> "下列哪个是cpu?"
+"""
+import re
+from functools import lru_cache
+
+# 全角标点与符号 -> 半角
+_PUNCTUATION = {
+    "，": ",", "。": ".", "．": ".", "、": ",", "：": ":", "；": ";", "？": "?", "！": "!",
+    "（": "(", "）": ")", "【": "[", "】": "]", "［": "[", "］": "]", "｛": "{", "｝": "}",
+    "—": "-", "－": "-", "–": "-", "～": "~", "・": "·", "•": "·",
+    "…": "...",
+}
+
+# 删除的字符：书名号与引号（OCR 时有时无）
+_DELETE = "《》〈〉<>「」『』“”‘’\"'`"
+
+# 删除的空白：str.isspace 为真的全部字符，外加 OCR 偶尔输出的零宽字符
+_WHITESPACE = ("\t\n\v\f\r\x1c\x1d\x1e\x1f \x85\xa0\u1680" + "".join(map(chr, range(0x2000, 0x200b)))
+               + "\u2028\u2029\u202f\u205f\u3000" + "\u200b\u200c\u200d\u2060\ufeff")
+
+
+def _build_map() -> dict:
+    """{字符: 替换文本}，删除的字符映射为空串；大写字母由 str.lower 处理，不在表中"""
+    mapping = {}
+    # 全角 ASCII（！到～）-> 半角，全角大写字母先经 str.lower 变为全角小写
+    for code in range(0xFF01, 0xFF5F):
+        if not 0xFF21 <= code <= 0xFF3A:
+            mapping[chr(code)] = chr(code - 0xFEE0)
+    mapping.update(_PUNCTUATION)
+    for ch in _DELETE + _WHITESPACE:
+        mapping[ch] = ""
+    return mapping
+
+
+_MAP = _build_map()
+# ASCII 文本用的 translate 表，同时完成小写
+_ASCII_TABLE = str.maketrans({**{ch: dst for ch, dst in _MAP.items() if ch.isascii()},
+                              **{chr(c): chr(c).lower() for c in range(ord("A"), ord("Z") + 1)}})
+_SPECIAL_FINDALL = re.compile("[" + re.escape("".join(_MAP)) + "]").findall
+
+# 选项标记：A-H（含全角），可带括号，后跟分隔符；规范化之前的原始文本上使用
+_MARKER_ONLY_RE = re.compile(r"\s*[(\[（【]?[A-Ha-hＡ-Ｈａ-ｈ][)\]）】]?[.．、,，:：]?\s*")
+# 其后紧跟 "字母." 时是 A.I. 这类缩写，不是标记
+_MARKER_PREFIX_RE = re.compile(
+    r"\s*(?:[A-Ha-hＡ-Ｈａ-ｈ][.．、,，:：]|[(\[（【][A-Ha-hＡ-Ｈａ-ｈ][)\]）】]:?)\s*(?![A-Za-z0-9][.．])")
+# 规范化之后的文本上使用：此时分隔符与括号均已是半角，字母已是小写
+_KEY_MARKER_RE = re.compile(r"(?:[a-h][.,:]|\([a-h]\)|\[[a-h]\])(?![a-z0-9]\.)")
+
+
+def fold(text: str) -> str:
+    """全角转半角、中文标点转英文标点、字母转小写，删除空白、书名号与引号"""
+    if text.isascii():
+        return text.translate(_ASCII_TABLE)
+    text = text.lower()
+    for ch in _SPECIAL_FINDALL(text):
+        text = text.replace(ch, _MAP[ch])
+    return text
+
+
+def is_option_marker(text: str) -> bool:
+    """text 是否只是一个单独的选项标记，如 "A"、"B."、"（C）"、"Ｄ、" """
+    return _MARKER_ONLY_RE.fullmatch(text) is not None
+
+
+def strip_option_marker(text: str) -> str:
+    """
+    去掉开头的选项标记，如 "A.红楼梦" / "B、红楼梦" / "(C)红楼梦" -> "红楼梦"
+
+    标记后必须有分隔符或括号，"A型血" 这类以字母开头的选项保持不变。
+    """
+    match = _MARKER_PREFIX_RE.match(text)
+    if match is None or match.end() == len(text):
+        return text
+    return text[match.end():]
+
+
+@lru_cache(maxsize=8192)
+def normalize_key(text: str) -> str:
+    """
+    缓存键与选项匹配用的规范化文本
+
+    在 `fold` 的基础上去掉开头的选项标记。同一道题在一局内会被多次规范化
+    （预取、查询、写入、去重），结果按文本缓存。
+    """
+    # 与 fold 相同，内联以省去一次函数调用
+    if text.isascii():
+        key = text.translate(_ASCII_TABLE)
+    else:
+        key = text.lower()
+        for ch in _SPECIAL_FINDALL(key):
+            key = key.replace(ch, _MAP[ch])
+    # 先按前两个字符排除绝大多数不带标记的文本，再交给正则
+    if len(key) > 2 and (key[1] in ".,:" or key[0] in "(["):
+        match = _KEY_MARKER_RE.match(key)
+        if match is not None and match.end() < len(key):
+            key = key[match.end():]
+    return key
@@ -0,0 +1,242 @@
+"""
+二值化阈值自动标定模块
+固定的 `bw_threshold` 在偏暗的设备或深色主题下会把文字和背景一起变黑（或变白），OCR 识别失败后反复重试。
+这里在每个会话的前几帧上用裁剪区域的灰度直方图计算 Otsu（或谷底）阈值，取中位数写入控制器，
+按设备序列号与分辨率缓存；之后每隔 check_every 帧抽样一次直方图，阈值漂移时重新标定
+
+背景为深色（亮像素不足一半）时同时启用反色，使交给 OCR 的图像始终是白底黑字。
+"""
+import statistics
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from src.core.base import AndroidControllerBase
+from src.utils.device_cache import device_key, load_entries, save_entry
+from src.utils.image_ops import as_image, gray_histogram, image_size, otsu_threshold, valley_threshold
+from src.utils.log import fields, get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_THRESHOLD_CONFIG = {
+    "enabled": False,
+    "method": "otsu",                     # otsu 或 valley（直方图谷底，找不到双峰时退回 otsu）
+    "cache_path": "threshold_cache.json", # 标定结果缓存，键为 "设备序列号@宽x高"
+    "frames": 3,                          # 取中位数的帧数
+    "sample_step": 4,                     # 直方图抽样时的整数缩小倍数
+    "min_separability": 0.6,              # 类间方差占总方差的比例低于该值（非双峰画面）时不采样
+    "check_every": 50,                    # 标定后每隔多少帧复查一次
+    "drift": 24,                          # 复查阈值与当前阈值相差超过该值记为一次漂移
+    "max_drifts": 2,                      # 连续漂移多少次后重新标定
+    "max_failures": 3,                    # OCR 连续失败多少次后立即复查
+    "min_threshold": 40,
+    "max_threshold": 230,
+}
+
+
+def separability(hist: np.ndarray, threshold: int) -> float:
+    """threshold 分出的两类的类间方差占总方差的比例（0-1），越大越接近理想的双峰"""
+    levels = np.arange(256, dtype=np.float64)
+    total = hist.sum()
+    if total <= 0:
+        return 0.0
+    mean = (hist * levels).sum() / total
+    variance = (hist * (levels - mean) ** 2).sum() / total
+    w0 = hist[:threshold + 1].sum() / total
+    if variance <= 0 or w0 <= 0 or w0 >= 1:
+        return 0.0
+    m0 = (hist[:threshold + 1] * levels[:threshold + 1]).sum() / (w0 * total)
+    m1 = (mean - w0 * m0) / (1 - w0)
+    return float(w0 * (1 - w0) * (m0 - m1) ** 2 / variance)
+
+
+class ThresholdCalibrator:
+    """单个控制器的二值化阈值标定与复查
+
+    调用顺序：每帧预处理之后 `observe(原始截图, 裁剪区域)`，OCR 之后 `record_ocr(是否识别出题目)`。
+    两者可以在不同线程中调用（流水线运行器）。
+    """
+
+    def __init__(self, controller: AndroidControllerBase, threshold: int = 200, method: str = "otsu",
+                 cache_path: Optional[str] = "threshold_cache.json", frames: int = 3, sample_step: int = 4,
+                 min_separability: float = 0.6, check_every: int = 50, drift: int = 24, max_drifts: int = 2,
+                 max_failures: int = 3, min_threshold: int = 40, max_threshold: int = 230):
+        if method not in ("otsu", "valley"):
+            raise ValueError(f"未知的阈值算法: {method}")
+        self.controller = controller
+        self.threshold = threshold
+        self.invert = False
+        self.method = method
+        self.cache_path = cache_path
+        self.frames = frames
+        self.sample_step = sample_step
+        self.min_separability = min_separability
+        self.check_every = check_every
+        self.drift = drift
+        self.max_drifts = max_drifts
+        self.max_failures = max_failures
+        self.min_threshold = min_threshold
+        self.max_threshold = max_threshold
+        self.key: Optional[str] = None
+        self.calibrating = True
+        self.calibrations = 0
+        self.recalibrations = 0
+        self.checks = 0
+        self._samples: List[Tuple[int, bool]] = []
+        self._frame_count = 0
+        self._drifts = 0
+        self._failures = 0
+        self._check_next = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, controller: AndroidControllerBase, threshold_config: Optional[dict] = None,
+                    threshold: int = 200) -> "ThresholdCalibrator":
+        """根据 `threshold_calibration` 配置创建标定器，threshold 为配置中的 bw_threshold"""
+        cfg = {**DEFAULT_THRESHOLD_CONFIG, **(threshold_config or {})}
+        return cls(
+            controller,
+            threshold=int(threshold),
+            method=str(cfg["method"]),
+            cache_path=cfg["cache_path"],
+            frames=int(cfg["frames"]),
+            sample_step=int(cfg["sample_step"]),
+            min_separability=float(cfg["min_separability"]),
+            check_every=int(cfg["check_every"]),
+            drift=int(cfg["drift"]),
+            max_drifts=int(cfg["max_drifts"]),
+            max_failures=int(cfg["max_failures"]),
+            min_threshold=int(cfg["min_threshold"]),
+            max_threshold=int(cfg["max_threshold"]),
+        )
+
+    @staticmethod
+    def supports(controller: AndroidControllerBase) -> bool:
+        """控制器能否提供原始截图并设置阈值与反色"""
+        cls = type(controller)
+        return all(getattr(cls, name) is not getattr(AndroidControllerBase, name)
+                   for name in ("capture_raw", "preprocess", "set_bw_threshold", "set_bw_invert"))
+
+    def measure(self, img: Image.Image) -> Optional[Tuple[int, bool]]:
+        """
+        计算一帧（裁剪后区域）的阈值
+
+        Returns:
+            (阈值, 是否反色)，画面不是明显的双峰（空白过渡画面等）时返回 None
+        """
+        hist = gray_histogram(img, self.sample_step)
+        otsu = otsu_threshold(hist)
+        if separability(hist, otsu) < self.min_separability:
+            return None
+        threshold = otsu
+        if self.method == "valley":
+            valley = valley_threshold(hist)
+            threshold = otsu if valley is None else valley
+        threshold = min(self.max_threshold, max(self.min_threshold, threshold))
+        # 亮像素不足一半视为深色背景
+        invert = bool(hist[threshold + 1:].sum() < hist.sum() / 2)
+        return threshold, invert
+
+    def observe(self, raw: Image.Image, box: Tuple[int, int, int, int]):
+        """
+        预处理之后调用：分辨率变化时查缓存；标定中或到了复查间隔时抽样本帧
+
+        Args:
+            raw: 原始截图，也可以是缓冲池中的 (高, 宽, 通道) 数组（只在需要抽样时转换）
+            box: 本帧的裁剪区域 (左, 上, 右, 下)
+        """
+        key = device_key(self.controller, image_size(raw))
+        if key != self.key:
+            self._switch(key)
+        with self._lock:
+            self._frame_count += 1
+            due = (self.calibrating or self._check_next
+                   or (self.check_every and self._frame_count % self.check_every == 0))
+            self._check_next = False
+        if not due:
+            return
+        if isinstance(raw, np.ndarray):
+            left, top, right, bottom = box
+            cropped = as_image(raw[top:bottom, left:right])
+        else:
+            cropped = raw.crop(box)
+        measured = self.measure(cropped)
+        if measured is None:
+            return
+
+        with self._lock:
+            if self.calibrating:
+                self._samples.append(measured)
+                if len(self._samples) < self.frames:
+                    return
+                threshold = int(statistics.median_low(t for t, _ in self._samples))
+                invert = sum(inv for _, inv in self._samples) * 2 > len(self._samples)
+                self._samples = []
+                self.calibrations += 1
+            else:
+                self.checks += 1
+                threshold, invert = measured
+                if abs(threshold - self.threshold) <= self.drift and invert == self.invert:
+                    self._drifts = 0
+                    return
+                self._drifts += 1
+                if self._drifts >= self.max_drifts:
+                    logger.warning("二值化阈值漂移，重新标定",
+                                   extra=fields(device=self.key, current=self.threshold, measured=threshold))
+                    self._drifts = 0
+                    self.recalibrations += 1
+                    self.calibrating = True
+                return
+        self._apply(threshold, invert, source="calibrated")
+        save_entry(self.cache_path, key, {"threshold": threshold, "invert": invert,
+                                          "calibrated_at": round(time.time())})
+
+    def record_ocr(self, found_question: bool):
+        """OCR 之后调用：连续失败时下一帧立即复查阈值"""
+        with self._lock:
+            if found_question:
+                self._failures = 0
+                return
+            self._failures += 1
+            if self._failures >= self.max_failures and not self.calibrating:
+                self._failures = 0
+                self._check_next = True
+
+    def _switch(self, key: str):
+        """切换到新的设备/分辨率：命中缓存时直接应用，否则开始标定"""
+        entry = load_entries(self.cache_path).get(key)
+        cached = isinstance(entry, dict) and "threshold" in entry
+        with self._lock:
+            self.key = key
+            self._samples = []
+            self._drifts = 0
+            self.calibrating = not cached
+        if cached:
+            self._apply(int(entry["threshold"]), bool(entry.get("invert", False)), source="cache")
+        else:
+            logger.info("开始标定二值化阈值", extra=fields(device=key))
+
+    def _apply(self, threshold: int, invert: bool, source: str):
+        with self._lock:
+            self.threshold = threshold
+            self.invert = invert
+            self.calibrating = False
+        self.controller.set_bw_threshold(threshold)
+        self.controller.set_bw_invert(invert)
+        logger.info("二值化阈值: %s", "已标定" if source == "calibrated" else "使用缓存",
+                    extra=fields(device=self.key, threshold=threshold, invert=invert))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "device": self.key,
+                "threshold": self.threshold,
+                "invert": self.invert,
+                "calibrating": self.calibrating,
+                "calibrations": self.calibrations,
+                "recalibrations": self.recalibrations,
+                "checks": self.checks,
+            }
@@ -0,0 +1,63 @@
+"""
+答案库：确认答错后删除未验证记录
+"""
+import re
+
+from src.core.base import AnswerGeneratorBase
+from src.generators.cached_generator import CachedAnswerGenerator
+from src.utils.answer_store import AnswerStore
+
+
+class _FixedGenerator(AnswerGeneratorBase):
+    def __init__(self, option: int):
+        self.option = option
+        self.calls = 0
+
+    def get_answer(self, question_body: str) -> str:
+        self.calls += 1
+        return f"<Answer>{self.option}"
+
+    def extract_option_number(self, answer: str) -> int:
+        return int(re.search(r"\d+", answer).group())
+
+
+def test_discard_matches_normalized_answer():
+    store = AnswerStore(":memory:")
+    store.put("题目A", ["甲 ", "乙", "丙"], "乙 ")
+    assert store.discard("题目A", ["甲", "乙", "丙"], "乙")
+    assert store.lookup("题目A", ["甲", "乙", "丙"]) is None
+
+
+def test_discard_matches_question_only_fallback():
+    store = AnswerStore(":memory:")
+    store.put("题目B", ["甲", "乙", "丙"], "乙")
+    # 同一题干换了一个选项集合，仅按题干命中
+    options = ["乙", "丁", "戊"]
+    assert store.lookup("题目B", options) == 1
+    assert store.discard("题目B", options, "乙")
+    assert store.lookup("题目B", options) is None
+    assert len(store) == 0
+
+
+def test_discard_keeps_verified_and_other_answers():
+    store = AnswerStore(":memory:")
+    store.put("题目C", ["甲", "乙"], "甲", source="verified", verified=True)
+    store.put("题目C", ["甲", "乙", "丙"], "丙")
+    assert not store.discard("题目C", ["甲", "乙"], "甲")
+    assert not store.discard("题目C", ["甲", "乙", "丙"], "乙")
+    assert len(store) == 2
+
+
+def test_record_incorrect_drops_fallback_hit():
+    store = AnswerStore(":memory:")
+    store.put("题目D", ["甲", "乙", "丙"], "乙 ")
+    llm = _FixedGenerator(2)
+    generator = CachedAnswerGenerator(llm, store)
+    body = "<Question>题目D\n<Option>1. 乙\n<Option>2. 丁\n<Option>3. 戊"
+    assert generator.extract_option_number(generator.get_answer(body)) == 1
+    assert llm.calls == 0
+
+    generator.record_incorrect(body, 1)
+    assert generator.extract_option_number(generator.get_answer(body)) == 2
+    assert llm.calls == 1
+    generator.close()
@@ -0,0 +1,30 @@
+"""
+集成生成器：成员名必须唯一
+"""
+import pytest
+
+from src.core.base import AnswerGeneratorBase
+from src.generators.ensemble_generator import EnsembleGenerator
+
+
+class _FixedGenerator(AnswerGeneratorBase):
+    def get_answer(self, question_body: str) -> str:
+        return "<Answer>1"
+
+    def extract_option_number(self, answer: str) -> int:
+        return 1
+
+
+def test_duplicate_member_names_rejected():
+    with pytest.raises(ValueError, match="重复"):
+        EnsembleGenerator([("deepseek-chat", _FixedGenerator()), ("deepseek-chat", _FixedGenerator())])
+
+
+def test_distinct_names_all_vote():
+    ensemble = EnsembleGenerator([("a", _FixedGenerator()), ("b", _FixedGenerator())], deadline=1.0)
+    for i in range(3):
+        assert ensemble.get_answer(f"<Question>题目{i}\n<Option>1. 甲\n<Option>2. 乙") == "<Answer>1"
+    stats = ensemble.get_stats()
+    assert stats["ensemble:a"]["skipped_busy"] == 0
+    assert stats["ensemble:b"]["skipped_busy"] == 0
+    ensemble.close()
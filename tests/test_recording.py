@@ -0,0 +1,40 @@
+"""
+录制目录：同一目录第二次录制接在已有录制之后
+"""
+import os
+
+from PIL import Image
+
+from src.utils.recording import MANIFEST_NAME, SessionRecorder, load_manifest
+
+
+def _record(directory, colors, interval=0.5):
+    recorder = SessionRecorder(str(directory))
+    for i, color in enumerate(colors):
+        recorder.frame(Image.new("RGB", (4, 4), color), t=i * interval)
+    recorder.tap(1, 2)
+    recorder.close()
+
+
+def test_second_session_continues_frames_and_timeline(tmp_path):
+    _record(tmp_path, ["red", "green"])
+    _record(tmp_path, ["blue", "white"])
+
+    frames, taps = load_manifest(str(tmp_path))
+    assert [f["file"] for f in frames] == [f"frame_{i:05d}.png" for i in range(1, 5)]
+    times = [f["t"] for f in frames]
+    assert times == sorted(times) and times[2] > times[1]
+    assert len(taps) == 2
+    # 第一段的帧没有被覆盖
+    with Image.open(os.path.join(tmp_path, "frame_00001.png")) as img:
+        assert img.getpixel((0, 0)) == (255, 0, 0)
+
+
+def test_resume_after_truncated_manifest(tmp_path):
+    _record(tmp_path, ["red"])
+    with open(os.path.join(tmp_path, MANIFEST_NAME), "a", encoding="utf-8") as f:
+        f.write('{"type": "frame", "t": 9')
+    _record(tmp_path, ["blue"])
+
+    frames, _ = load_manifest(str(tmp_path))
+    assert [f["file"] for f in frames] == ["frame_00001.png", "frame_00002.png"]
@@ -0,0 +1,35 @@
+"""
+回放控制器：截图阶段与作答结果检测并发取帧时，每帧只返回一次
+"""
+import threading
+
+from PIL import Image
+
+from src.controllers.replay_controller import ReplayController, ReplayFinished
+from src.utils.recording import SessionRecorder
+
+
+def test_concurrent_capture_returns_each_frame_once(tmp_path):
+    recorder = SessionRecorder(str(tmp_path), "raw")
+    for i in range(200):
+        recorder.frame(Image.new("RGB", (2, 1), (i, 0, 0)), t=i * 0.01)
+    recorder.close()
+
+    controller = ReplayController(str(tmp_path), timing="step")
+    seen, lock = [], threading.Lock()
+
+    def capture():
+        while True:
+            try:
+                img = controller.capture_raw()
+            except ReplayFinished:
+                return
+            with lock:
+                seen.append(img.getpixel((0, 0))[0])
+
+    threads = [threading.Thread(target=capture) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(seen) == list(range(200))
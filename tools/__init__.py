@@ -0,0 +1,4 @@
+"""
+命令行工具集合
+使用 `python -m tools.<工具名>` 运行
+"""
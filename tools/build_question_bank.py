@@ -0,0 +1,68 @@
+"""
+只读题库生成工具
+把本地答案库（SQLite）或 JSONL 题库编译为 mmap 只读题库文件（src.utils.question_bank），
+供同一台机器上的多个 QuizBot 实例共享；在配置 answer_store.bank 中指定生成的文件。
+
+JSONL 每行 {"question", "options", "answer", "verified"?}，与 tools.synth_screens 的题库格式相同：
+answer 为整数时是从 1 开始的选项编号，为字符串时是选项文本；没有答案的行跳过，
+verified 缺省为 true（人工整理的题库）。
+
+用法:
+    python -m tools.build_question_bank --from answers.db --out question_bank.qbk
+    python -m tools.build_question_bank --from questions.jsonl --from answers.db --out question_bank.qbk
+"""
+import argparse
+import json
+import time
+from typing import Iterator
+
+from src.utils.answer_store import AnswerStore
+from src.utils.question_bank import QuestionBank
+
+
+def read_jsonl(path: str) -> Iterator[dict]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            options = list(item["options"])
+            answer = item.get("answer")
+            if isinstance(answer, int) and not isinstance(answer, bool):
+                answer = options[answer - 1] if 1 <= answer <= len(options) else None
+            if not answer:
+                continue
+            yield {"question": item["question"], "options": options, "answer": answer,
+                   "verified": item.get("verified", True)}
+
+
+def read_sqlite(path: str) -> Iterator[dict]:
+    store = AnswerStore(path)
+    try:
+        yield from store.iter_records()
+    finally:
+        store.close()
+
+
+def read_source(path: str) -> Iterator[dict]:
+    return read_jsonl(path) if path.endswith((".jsonl", ".json")) else read_sqlite(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="把答案库或 JSONL 题库编译为只读题库文件")
+    parser.add_argument("--from", dest="sources", action="append", required=True,
+                        help="答案库 .db 或 JSONL 题库，可重复；同一题以已验证、较新的记录为准")
+    parser.add_argument("--out", default="question_bank.qbk", help="输出文件")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    records = (record for path in args.sources for record in read_source(path))
+    count = QuestionBank.build(records, args.out)
+    with QuestionBank(args.out) as bank:
+        print(f"已写入 {args.out}: {count} 条记录，{bank.slots} 个槽位，"
+              f"耗时 {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
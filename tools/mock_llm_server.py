@@ -0,0 +1,322 @@
+"""
+本地 OpenAI 兼容模拟服务器
+提供 /v1/chat/completions（流式与非流式）与 /v1/models，
+支持可配置的延迟分布、错误率以及脚本化答案，用于离线测试与基准
+
+多题合并请求（题目以 <Question 编号> 开头）逐题作答，返回 "<Answer 编号>..." 多行；
+每多一道题增加 --per-question 秒的生成时间。--concurrency 限制同时处理的请求数，
+模拟服务商的并发配额，超出的请求排队等待。
+
+用法:
+    python -m tools.mock_llm_server --port 8000 --latency lognormal:0.6,0.3 --error-rate 0.05
+    python -m tools.mock_llm_server --concurrency 4 --per-question 0.05
+    # 然后将 llm.base_url 设置为 http://127.0.0.1:8000/v1
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+
+_OPTION_RE = re.compile(r"<Option>(\d+)\.\s*(.*)")
+_QUESTION_RE = re.compile(r"<Question (\d+)>")
+
+
+class LatencySampler:
+    """延迟分布采样器
+
+    规格字符串格式 `类型:参数1,参数2`：
+        fixed:0.5             固定 0.5 秒
+        uniform:0.2,0.8       均匀分布
+        normal:0.5,0.1        正态分布（均值, 标准差），截断到 0
+        lognormal:0.5,0.3     对数正态（中位数, sigma）
+    """
+
+    def __init__(self, spec: str = "fixed:0"):
+        self.spec = spec
+        kind, _, params = spec.partition(":")
+        self.kind = kind
+        self.params = [float(p) for p in params.split(",") if p]
+        if kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"未知的延迟分布: {spec}")
+        self._rng = random.Random()
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        p = self.params
+        with self._lock:
+            if self.kind == "fixed":
+                value = p[0] if p else 0.0
+            elif self.kind == "uniform":
+                value = self._rng.uniform(p[0], p[1])
+            elif self.kind == "normal":
+                value = self._rng.gauss(p[0], p[1])
+            else:
+                value = p[0] * self._rng.lognormvariate(0, p[1])
+        return max(0.0, value)
+
+
+class EndpointProfile:
+    """单个模型的行为：延迟分布与错误率"""
+
+    def __init__(self, latency: str = "fixed:0", error_rate: float = 0.0,
+                 error_status: int = 500, accuracy: float = 1.0, per_question: float = 0.0):
+        self.latency = LatencySampler(latency)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.accuracy = accuracy
+        self.per_question = per_question  # 多题请求中每多一道题增加的生成时间（秒）
+
+
+class MockLLMServer:
+    """OpenAI 兼容模拟服务器，在后台线程中运行"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 default_profile: Optional[EndpointProfile] = None,
+                 model_profiles: Optional[Dict[str, EndpointProfile]] = None,
+                 script: Optional[Dict[str, str]] = None, token_delay: float = 0.01,
+                 concurrency: Optional[int] = None):
+        """
+        Args:
+            host: 监听地址
+            port: 监听端口，0 表示自动分配
+            default_profile: 未单独配置的模型使用的行为
+            model_profiles: 按模型名配置的行为，可模拟快慢不同的多个模型
+            script: 脚本化答案 {题目子串: 答案文本}，命中时直接返回
+            token_delay: 流式响应中每个分片之间的间隔（秒）
+            concurrency: 同时处理的请求数上限，None 表示不限
+        """
+        self.default_profile = default_profile or EndpointProfile()
+        self.model_profiles = model_profiles or {}
+        self.script = script or {}
+        self.token_delay = token_delay
+        self.requests = 0
+        self.errors = 0
+        self.questions = 0      # 请求中的题目总数，多题请求按题数计
+        self.prompt_chars = 0   # 所有请求消息的字符数之和，近似输入 token 量
+        self._slots = threading.BoundedSemaphore(concurrency) if concurrency else None
+        self._rng = random.Random()
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> str:
+        """启动服务器，返回 base_url"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-llm", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def serve_forever(self):
+        """在当前线程中运行服务器（命令行模式）"""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def stop(self):
+        """停止 start() 启动的后台服务器"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def profile_for(self, model: str) -> EndpointProfile:
+        return self.model_profiles.get(model, self.default_profile)
+
+    def answer_for(self, messages: List[dict], profile: EndpointProfile) -> str:
+        """按脚本或题目选项生成答案文本
+
+        未命中脚本时视第一个选项为正确答案，按 profile.accuracy 的概率答对；
+        多题请求逐题作答，每题一行 "<Answer 编号>..."。
+        """
+        prompt = messages[-1].get("content", "") if messages else ""
+        parts = _QUESTION_RE.split(prompt)
+        if len(parts) > 1:
+            # split 结果为 [前缀, 编号1, 题目1, 编号2, 题目2, ...]
+            return "\n".join(
+                self._answer_one(body, profile).replace("<Answer>", f"<Answer {number}>", 1)
+                for number, body in zip(parts[1::2], parts[2::2])
+            )
+        return self._answer_one(prompt, profile)
+
+    def _answer_one(self, prompt: str, profile: EndpointProfile) -> str:
+        for needle, answer in self.script.items():
+            if needle in prompt:
+                return answer
+        options = _OPTION_RE.findall(prompt)
+        if not options:
+            return "<Answer>1"
+        with self._lock:
+            correct = self._rng.random() < profile.accuracy
+            idx = 0 if correct else self._rng.randrange(len(options))
+        number, text = options[idx]
+        return f"<Answer>{number}. {text}"
+
+    def _record_prompt(self, messages: List[dict]) -> int:
+        """统计题数与输入字符数，返回本请求的题数"""
+        prompt = messages[-1].get("content", "") if messages else ""
+        count = max(1, len(_QUESTION_RE.findall(prompt)))
+        with self._lock:
+            self.questions += count
+            self.prompt_chars += sum(len(m.get("content") or "") for m in messages)
+        return count
+
+    def _should_fail(self, profile: EndpointProfile) -> bool:
+        with self._lock:
+            self.requests += 1
+            failed = self._rng.random() < profile.error_rate
+            self.errors += failed
+        return failed
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # 头部与正文分两次写出，保活连接上 Nagle 算法与对端延迟确认叠加会给每个响应多出约 40ms
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, payload: dict):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_HEAD(self):
+                # 连接预热/保活请求
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_GET(self):
+                if self.path.rstrip("/").endswith("/models"):
+                    models = sorted(server.model_profiles) or ["mock"]
+                    self._send_json(200, {"object": "list", "data": [
+                        {"id": m, "object": "model", "created": 0, "owned_by": "mock"} for m in models
+                    ]})
+                else:
+                    self._send_json(404, {"error": {"message": "not found"}})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": "not found"}})
+                    return
+
+                model = request.get("model", "mock")
+                profile = server.profile_for(model)
+                count = server._record_prompt(request.get("messages", []))
+                if server._slots is not None:
+                    server._slots.acquire()
+                try:
+                    time.sleep(profile.latency.sample() + profile.per_question * (count - 1))
+                finally:
+                    if server._slots is not None:
+                        server._slots.release()
+                if server._should_fail(profile):
+                    self._send_json(profile.error_status, {"error": {
+                        "message": "mock injected error", "type": "server_error"}})
+                    return
+
+                answer = server.answer_for(request.get("messages", []), profile)
+                completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+                if request.get("stream"):
+                    self._stream(completion_id, model, answer)
+                else:
+                    self._send_json(200, {
+                        "id": completion_id,
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant", "content": answer}}],
+                        "usage": {"prompt_tokens": 0, "completion_tokens": len(answer),
+                                  "total_tokens": len(answer)},
+                    })
+
+            def _stream(self, completion_id: str, model: str, answer: str):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                pieces = [answer[i:i + 4] for i in range(0, len(answer), 4)]
+                for i, piece in enumerate(pieces + [None]):
+                    chunk = {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [{"index": 0,
+                                     "delta": {"content": piece} if piece is not None else {},
+                                     "finish_reason": None if piece is not None else "stop"}],
+                    }
+                    self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    if piece is not None and i < len(pieces) - 1:
+                        time.sleep(server.token_delay)
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地 OpenAI 兼容模拟服务器")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", default="lognormal:0.6,0.3", help="延迟分布，如 fixed:0.5 / lognormal:0.6,0.3")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="注入错误的概率")
+    parser.add_argument("--error-status", type=int, default=500, help="注入错误的 HTTP 状态码")
+    parser.add_argument("--per-question", type=float, default=0.0, help="多题请求中每多一道题增加的延迟（秒）")
+    parser.add_argument("--concurrency", type=int, help="同时处理的请求数上限，模拟服务商并发配额")
+    parser.add_argument("--script", help="脚本化答案 JSON 文件 {题目子串: 答案}")
+    parser.add_argument("--model", action="append", default=[],
+                        help="按模型配置行为 名称=延迟分布[@错误率]，可重复，如 slow=fixed:2@0.1")
+    args = parser.parse_args()
+
+    script = None
+    if args.script:
+        with open(args.script, "r", encoding="utf-8") as f:
+            script = json.load(f)
+    model_profiles = {}
+    for item in args.model:
+        name, _, spec = item.partition("=")
+        latency, _, error_rate = spec.partition("@")
+        model_profiles[name] = EndpointProfile(latency, float(error_rate or 0), args.error_status)
+
+    server = MockLLMServer(
+        args.host, args.port,
+        default_profile=EndpointProfile(args.latency, args.error_rate, args.error_status,
+                                        per_question=args.per_question),
+        model_profiles=model_profiles,
+        script=script,
+        concurrency=args.concurrency,
+    )
+    print(f"模拟 LLM 服务器已启动: {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"共处理 {server.requests} 个请求（{server.questions} 道题），注入错误 {server.errors} 次")
+
+
+if __name__ == "__main__":
+    main()
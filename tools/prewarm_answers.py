@@ -0,0 +1,236 @@
+"""
+答案库离线预热工具
+读取已知题目列表（JSONL 或 CSV），逐题交给配置中的答案生成器作答，把答案写入本地答案库
+（source="prewarm"），线上运行时这些题直接命中答案库，几乎不再实时调用 LLM。
+
+    - 并发：--concurrency 个工作线程同时请求；配置开启 llm.broker 时并发的题目合并为多题请求
+    - 限速：令牌桶，--rate 为每秒请求数，--burst 为允许的突发数
+    - 断点续跑：每题的处理结果追加写入检查点文件，重新运行时跳过已完成的行；
+      请求失败的行不记为完成，下次重试。答案库中已有答案的题同样跳过
+
+输入格式:
+    JSONL  每行 {"question": "...", "options": ["...", ...]}，与 tools.synth_screens 的题库格式相同
+    CSV    表头含 question 列与若干 option 开头的列（option1, option2, ...），按列顺序为选项，
+           空单元格忽略；或者一个 options 列，选项之间用 | 分隔
+
+用法:
+    python -m tools.prewarm_answers --input questions.jsonl
+    python -m tools.prewarm_answers --input questions.csv --concurrency 8 --rate 5 --store answers.db
+"""
+import argparse
+import csv
+import json
+import os
+import queue
+import threading
+import time
+from typing import Iterator, List, Optional, Set, Tuple
+
+from src.core import config as cfg_loader
+from src.core import registry
+from src.core.base import AnswerGeneratorBase
+from src.utils.answer_store import AnswerStore
+
+
+class TokenBucket:
+    """令牌桶限速器，线程安全"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Args:
+            rate: 每秒补充的令牌数，<= 0 表示不限速
+            burst: 桶容量，即允许连续发出的请求数
+        """
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, stop: Optional[threading.Event] = None) -> bool:
+        """取一个令牌，必要时等待；stop 被设置时放弃并返回 False"""
+        if self.rate <= 0:
+            return True
+        while stop is None or not stop.is_set():
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(min(wait, 0.5))
+        return False
+
+
+def read_questions(path: str) -> Iterator[Tuple[int, str, List[str]]]:
+    """逐条产出 (行号, 题干, 选项)；行号从 1 开始，作为检查点中的标识"""
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if path.endswith(".csv"):
+            reader = csv.DictReader(f)
+            option_columns = [c for c in reader.fieldnames or [] if c.lower().startswith("option")
+                              and c.lower() != "options"]
+            for line, row in enumerate(reader, 2):
+                if option_columns:
+                    options = [row[c].strip() for c in option_columns if (row[c] or "").strip()]
+                else:
+                    options = [o.strip() for o in (row.get("options") or "").split("|") if o.strip()]
+                yield line, row["question"].strip(), options
+        else:
+            for line, text in enumerate(f, 1):
+                text = text.strip()
+                if text:
+                    item = json.loads(text)
+                    yield line, item["question"], list(item["options"])
+
+
+def format_question_body(question: str, options: List[str]) -> str:
+    """与提取器输出相同的格式化题目"""
+    return f"<Question>{question}" + "".join(f"\n<Option>{i}. {o}" for i, o in enumerate(options, 1))
+
+
+def load_checkpoint(path: str) -> Set[int]:
+    """已完成的行号"""
+    done = set()
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for text in f:
+                try:
+                    done.add(json.loads(text)["line"])
+                except (ValueError, KeyError):
+                    # 上次中断时写了一半的行
+                    continue
+    return done
+
+
+def create_generator(config) -> AnswerGeneratorBase:
+    """按配置创建答案生成器，与 QuizBot 相同（不包装答案库）"""
+    llm_cfg = config.get("llm", {})
+    if llm_cfg.get("ensemble", {}).get("enabled"):
+        generator = registry.generators.get("ensemble").from_config(llm_cfg)
+    else:
+        generator = registry.generators.get(llm_cfg.get("backend", "openai"))(
+            model=llm_cfg.get("model", "gpt-4o"),
+            api_key=llm_cfg.get("api_key"),
+            base_url=llm_cfg.get("base_url"),
+            http_config=llm_cfg.get("http"),
+            fallback_model=llm_cfg.get("fallback_model"),
+            policy_config=llm_cfg.get("policy"),
+        )
+    if llm_cfg.get("broker", {}).get("enabled") \
+            and type(generator).get_answers is not AnswerGeneratorBase.get_answers:
+        from src.generators.answer_broker import AnswerBroker
+        generator = AnswerBroker.from_config(generator, llm_cfg.get("broker"))
+    return generator
+
+
+class Prewarmer:
+    """把题目列表并发、限速地交给生成器作答并写入答案库"""
+
+    def __init__(self, generator: AnswerGeneratorBase, store: AnswerStore, checkpoint: str,
+                 concurrency: int = 4, rate: float = 2.0, burst: int = 4):
+        self.generator = generator
+        self.store = store
+        self.checkpoint = checkpoint
+        self.concurrency = concurrency
+        self.bucket = TokenBucket(rate, burst)
+        self.counts = {"answered": 0, "cached": 0, "skipped": 0, "invalid": 0, "failed": 0}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._queue: queue.Queue = queue.Queue(maxsize=concurrency * 2)
+
+    def _record(self, line: int, status: str, out):
+        """记录一题的处理结果；失败的题不写检查点，下次重试"""
+        with self._lock:
+            self.counts[status] += 1
+            if status != "failed":
+                out.write(json.dumps({"line": line, "status": status}) + "\n")
+                out.flush()
+
+    def _answer(self, line: int, question: str, options: List[str], out):
+        if self.store.lookup(question, options) is not None:
+            self._record(line, "cached", out)
+            return
+        if not self.bucket.acquire(self._stop):
+            return
+        try:
+            answer = self.generator.get_answer(format_question_body(question, options))
+        except Exception as e:
+            print(f"第 {line} 行请求失败: {e}")
+            self._record(line, "failed", out)
+            return
+        option_number = self.generator.extract_option_number(answer)
+        if 1 <= option_number <= len(options):
+            self.store.put(question, options, options[option_number - 1], source="prewarm")
+            self._record(line, "answered", out)
+        else:
+            # 回答中没有有效选项，重试多半仍然如此，记为完成
+            self._record(line, "invalid", out)
+
+    def _worker(self, out):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if not self._stop.is_set():
+                self._answer(*item, out)
+
+    def run(self, questions: Iterator[Tuple[int, str, List[str]]], progress_every: int = 100) -> dict:
+        done = load_checkpoint(self.checkpoint)
+        start = time.perf_counter()
+        with open(self.checkpoint, "a", encoding="utf-8") as out:
+            workers = [threading.Thread(target=self._worker, args=(out,), name=f"prewarm-{i}", daemon=True)
+                       for i in range(self.concurrency)]
+            for worker in workers:
+                worker.start()
+            submitted = 0
+            try:
+                for line, question, options in questions:
+                    if line in done or not question or len(options) < 2:
+                        with self._lock:
+                            self.counts["skipped"] += 1
+                        continue
+                    self._queue.put((line, question, options))
+                    submitted += 1
+                    if submitted % progress_every == 0:
+                        with self._lock:
+                            print(f"已提交 {submitted} 题，{self.counts}")
+            except KeyboardInterrupt:
+                print("中断：等待进行中的请求完成，进度已保存到检查点")
+                self._stop.set()
+            finally:
+                for _ in workers:
+                    self._queue.put(None)
+                for worker in workers:
+                    worker.join()
+        return {**self.counts, "elapsed_s": round(time.perf_counter() - start, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线预热答案库：批量作答已知题目列表")
+    parser.add_argument("--input", required=True, help="题目列表，JSONL 或 CSV")
+    parser.add_argument("--config", help="配置文件，默认 config.yaml；LLM 与答案库路径取自其中")
+    parser.add_argument("--store", help="答案库路径，默认取配置 answer_store.path")
+    parser.add_argument("--checkpoint", help="检查点文件，默认 <input>.progress")
+    parser.add_argument("--concurrency", type=int, default=4, help="同时在途的请求数")
+    parser.add_argument("--rate", type=float, default=2.0, help="每秒最多发出的请求数，0 表示不限")
+    parser.add_argument("--burst", type=int, default=4, help="令牌桶容量（允许的突发请求数）")
+    args = parser.parse_args()
+
+    config = cfg_loader.load_config(args.config)
+    store_path = args.store or config.get("answer_store", {}).get("path") or "answers.db"
+    generator = create_generator(config)
+    store = AnswerStore(store_path)
+    prewarmer = Prewarmer(generator, store, args.checkpoint or args.input + ".progress",
+                          concurrency=args.concurrency, rate=args.rate, burst=args.burst)
+    try:
+        result = prewarmer.run(read_questions(args.input))
+    finally:
+        generator.close()
+        store.close()
+    print(json.dumps({**result, "store": store_path}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
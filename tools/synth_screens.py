@@ -0,0 +1,340 @@
+"""
+合成答题画面生成器
+用 PIL 按 B 站答题页的版式渲染题目画面：题干长度不一、2-4 个选项按钮、
+不同分辨率与 DPI、可选噪声，并输出题干/选项的真实文本与边界框
+
+输出目录与录制目录格式相同（manifest.jsonl + 帧文件），可直接交给 ReplayController；
+每个帧事件额外带有 "truth" 字段:
+    {"question": "...", "options": ["...", ...], "answer": 2 或 null,
+     "boxes": [{"role": "question"|"option"|"marker", "text": "...", "bbox": [[x, y] * 4]}],
+     "buttons": [[x1, y1, x2, y2], ...]}     # 选项按钮区域，点击落在其中即为点中
+坐标均为整张截图坐标。--non-question 大于 0 时还会穿插过渡画面（加载动画、切题时的空白）
+与结果页，其标注只有 {"screen": "transition"|"result", "resolution": [宽, 高]}。
+
+用法:
+    python -m tools.synth_screens --out synth/run1 --count 2000 --seed 1
+    python -m tools.synth_screens --out synth/noisy --count 500 --noise 12 --format raw
+    python -m tools.synth_screens --out synth/bank --bank questions.jsonl --font C:/Windows/Fonts/msyh.ttc
+    python -m tools.synth_screens --out synth/mixed --count 500 --non-question 0.3
+"""
+import argparse
+import json
+import os
+import random
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+from src.utils.recording import SessionRecorder
+
+
+# (宽, 高) - 常见手机与模拟器分辨率
+RESOLUTIONS = [(720, 1280), (1080, 1920), (1080, 2400), (1440, 2560), (1440, 3200)]
+
+# 常见系统上的中文字体，按顺序尝试
+FONT_CANDIDATES = [
+    "C:/Windows/Fonts/msyh.ttc",
+    "C:/Windows/Fonts/simhei.ttf",
+    "/System/Library/Fonts/PingFang.ttc",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
+    "/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf",
+]
+
+# 内置题库：(题干, 选项, 正确选项序号)
+BUILTIN_BANK = [
+    ("以下哪部作品的作者是曹雪芹", ["《红楼梦》", "《水浒传》", "《西游记》", "《三国演义》"], 1),
+    ("光在真空中的传播速度约为每秒多少千米", ["30万", "3万", "300万", "3000"], 1),
+    ("《进击的巨人》中调查兵团的团长最后是谁", ["韩吉", "埃尔文", "利威尔", "阿明"], 1),
+    ("下列哪个不是B站的UP主分区", ["动画", "鬼畜", "音乐", "股票"], 4),
+    ("圆周率的前三位小数是", ["141", "142", "159", "314"], 1),
+    ("“举头望明月”的下一句是", ["低头思故乡", "疑是地上霜", "床前明月光"], 1),
+    ("世界上面积最大的国家是", ["俄罗斯", "加拿大"], 1),
+    ("《千与千寻》的导演是", ["宫崎骏", "新海诚", "细田守", "押井守"], 1),
+    ("水的化学式是", ["H2O", "CO2", "O2"], 1),
+    ("下列哪种乐器属于弦乐器", ["小提琴", "长笛", "小号", "定音鼓"], 1),
+    ("弹幕文化最早起源于哪个国家的视频网站", ["日本", "中国", "美国", "韩国"], 1),
+    ("下列哪一项是正确的视频投稿规范", ["标注转载来源", "搬运不注明出处", "标题党", "恶意刷屏"], 1),
+]
+
+# 用于改变题干长度的修饰
+STEM_PREFIXES = ["", "", "请问", "根据常识判断，", "下列说法中，关于这道题目，"]
+STEM_SUFFIXES = ["?", "？", "（单选）", "? 请选择一个正确答案"]
+
+
+def find_font(path: Optional[str] = None) -> Optional[str]:
+    """返回可用的中文字体路径，找不到时返回 None"""
+    for candidate in ([path] if path else []) + FONT_CANDIDATES:
+        if candidate and os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def load_bank(path: Optional[str]) -> List[Tuple[str, List[str], Optional[int]]]:
+    """读取 JSONL 题库（每行 {"question", "options", "answer"?}），未提供时使用内置题库"""
+    if not path:
+        return BUILTIN_BANK
+    bank = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                item = json.loads(line)
+                bank.append((item["question"], list(item["options"]), item.get("answer")))
+    return bank
+
+
+def _wrap(draw: ImageDraw.ImageDraw, text: str, font, max_width: int) -> List[str]:
+    """按像素宽度逐字折行（中文无空格分词）"""
+    lines, current = [], ""
+    for ch in text:
+        if current and draw.textlength(current + ch, font=font) > max_width:
+            lines.append(current)
+            current = ch
+        else:
+            current += ch
+    if current:
+        lines.append(current)
+    return lines
+
+
+def _quad(box) -> List[List[int]]:
+    x1, y1, x2, y2 = (int(v) for v in box)
+    return [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
+
+
+class ScreenSynthesizer:
+    """答题画面渲染器"""
+
+    def __init__(self, font_path: Optional[str] = None, seed: Optional[int] = None,
+                 bank: Optional[List] = None, noise: float = 0.0, option_markers: float = 0.3):
+        """
+        Args:
+            font_path: 字体路径，None 时自动查找系统中文字体
+            seed: 随机种子，相同种子生成相同的画面序列
+            bank: 题库，默认内置题库
+            noise: 高斯噪声标准差（0-255 灰度），0 表示无噪声
+            option_markers: 选项按钮左侧绘制 A/B/C/D 标记的概率
+        """
+        self.font_path = find_font(font_path)
+        if self.font_path is None:
+            print("警告: 未找到中文字体，汉字将无法正确渲染；请用 --font 指定字体文件")
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.default_rng(seed)
+        self.bank = bank or BUILTIN_BANK
+        self.noise = noise
+        self.option_markers = option_markers
+        self._fonts: Dict[int, ImageFont.ImageFont] = {}
+
+    def _font(self, size: int):
+        font = self._fonts.get(size)
+        if font is None:
+            if self.font_path:
+                font = ImageFont.truetype(self.font_path, size)
+            else:
+                font = ImageFont.load_default(size)
+            self._fonts[size] = font
+        return font
+
+    def _question(self) -> Tuple[str, List[str], Optional[int]]:
+        """从题库抽题，随机改变题干长度、选项数量与顺序"""
+        stem, options, answer = self.rng.choice(self.bank)
+        stem = self.rng.choice(STEM_PREFIXES) + stem + self.rng.choice(STEM_SUFFIXES)
+        indexed = list(enumerate(options, 1))
+        # 2-4 个选项，保留正确选项
+        count = self.rng.randint(min(2, len(indexed)), min(4, len(indexed)))
+        keep = [item for item in indexed if item[0] == answer]
+        others = [item for item in indexed if item[0] != answer]
+        self.rng.shuffle(others)
+        chosen = keep + others[:count - len(keep)]
+        self.rng.shuffle(chosen)
+        new_answer = next((i for i, (orig, _) in enumerate(chosen, 1) if orig == answer), None)
+        return stem, [text for _, text in chosen], new_answer
+
+    def _canvas(self, width: int, height: int) -> Tuple[Image.Image, ImageDraw.ImageDraw, float]:
+        """背景与顶部导航栏，答题页、过渡画面与结果页共用"""
+        scale = width / 1080          # 以 1080 宽为基准的 DPI 缩放
+        bg = tuple(self.rng.randint(244, 255) for _ in range(3))
+        img = Image.new("RGB", (width, height), bg)
+        draw = ImageDraw.Draw(img)
+        header_h = int(height * 0.08)
+        draw.rectangle((0, 0, width, header_h), fill=(251, 114, 153))
+        draw.text((int(40 * scale), int(header_h * 0.3)), "答题", font=self._font(int(44 * scale)), fill="white")
+        return img, draw, scale
+
+    def render_transition(self, size: Optional[Tuple[int, int]] = None) -> Tuple[Image.Image, dict]:
+        """渲染过渡画面：加载动画，或切题时只剩导航栏的空白页"""
+        width, height = size or self.rng.choice(RESOLUTIONS)
+        img, draw, scale = self._canvas(width, height)
+        if self.rng.random() < 0.6:
+            radius = int(self.rng.uniform(30, 50) * scale)
+            cx, cy = width // 2, int(height * self.rng.uniform(0.35, 0.55))
+            start = self.rng.randint(0, 359)
+            draw.arc((cx - radius, cy - radius, cx + radius, cy + radius), start, start + 270,
+                     fill=(251, 114, 153), width=max(2, int(8 * scale)))
+            if self.rng.random() < 0.5:
+                font = self._font(int(32 * scale))
+                text = "加载中..."
+                tw = draw.textlength(text, font=font)
+                draw.text(((width - tw) // 2, cy + radius + int(30 * scale)), text, font=font, fill=(150, 150, 150))
+        return self._degrade(img), {"screen": "transition", "resolution": [width, height]}
+
+    def render_result(self, size: Optional[Tuple[int, int]] = None) -> Tuple[Image.Image, dict]:
+        """渲染结果页：答题结果标题、得分与一个按钮"""
+        width, height = size or self.rng.choice(RESOLUTIONS)
+        img, draw, scale = self._canvas(width, height)
+        title = self.rng.choice(["回答正确", "回答错误", "答题结束", "恭喜你通过答题"])
+        title_font = self._font(int(self.rng.uniform(64, 80) * scale))
+        tw = draw.textlength(title, font=title_font)
+        y = int(height * self.rng.uniform(0.28, 0.36))
+        draw.text(((width - tw) // 2, y), title, font=title_font, fill=(33, 33, 33))
+        score = f"得分 {self.rng.randint(0, 100)}"
+        score_font = self._font(int(48 * scale))
+        sw = draw.textlength(score, font=score_font)
+        y += int(160 * scale)
+        draw.text(((width - sw) // 2, y), score, font=score_font, fill=(90, 90, 90))
+        if self.rng.random() < 0.5:
+            y += int(140 * scale)
+            bw, bh = int(420 * scale), int(110 * scale)
+            draw.rounded_rectangle(((width - bw) // 2, y, (width + bw) // 2, y + bh), radius=bh // 2,
+                                   fill=(251, 114, 153))
+        return self._degrade(img), {"screen": "result", "resolution": [width, height]}
+
+    def render(self, size: Optional[Tuple[int, int]] = None) -> Tuple[Image.Image, dict]:
+        """
+        渲染一帧答题画面
+
+        Args:
+            size: (宽, 高)，None 时从 RESOLUTIONS 随机选择
+
+        Returns:
+            (RGB 图像, 真实标注)
+        """
+        width, height = size or self.rng.choice(RESOLUTIONS)
+        stem, options, answer = self._question()
+
+        # 顶部导航栏与题号（位于默认裁剪区域之外）
+        img, draw, scale = self._canvas(width, height)
+        progress_font = self._font(int(36 * scale))
+        draw.text((int(60 * scale), int(height * 0.15)), f"{self.rng.randint(1, 100)}/100",
+                  font=progress_font, fill=(120, 120, 120))
+
+        # 题干：最多 3 行，行距小于 _filter_and_classify 的 50 像素阈值
+        margin = int(70 * scale)
+        q_size = int(self.rng.uniform(44, 52) * scale)
+        q_font = self._font(q_size)
+        lines = _wrap(draw, stem, q_font, width - 2 * margin)
+        while len(lines) > 3:
+            q_size = int(q_size * 0.9)
+            q_font = self._font(q_size)
+            lines = _wrap(draw, stem, q_font, width - 2 * margin)
+        line_step = int(q_size * 1.45)
+
+        boxes = []
+        y = int(height * 0.23)
+        for line in lines:
+            draw.text((margin, y), line, font=q_font, fill=(33, 33, 33))
+            boxes.append({"role": "question", "text": line, "bbox": _quad(draw.textbbox((margin, y), line, font=q_font))})
+            y += line_step
+
+        # 选项按钮：按钮底色在二值化后为白色，文字为黑色
+        area_bottom = int(height * 0.68)
+        gap = max(int(110 * scale), 60)
+        button_h = int(120 * scale)
+        spacing = int(36 * scale)
+        needed = gap + len(options) * button_h + (len(options) - 1) * spacing
+        if y + needed > area_bottom:
+            spacing = max(int(10 * scale), (area_bottom - y - gap - len(options) * button_h) // max(1, len(options) - 1))
+        y += gap - (line_step - q_size)
+
+        o_font = self._font(int(self.rng.uniform(40, 46) * scale))
+        button_fill = tuple(self.rng.randint(228, 240) for _ in range(3))
+        buttons = []
+        for idx, option in enumerate(options):
+            x1, x2 = margin, width - margin
+            draw.rounded_rectangle((x1, y, x2, y + button_h), radius=int(button_h * 0.5),
+                                   fill=button_fill, outline=(215, 215, 215), width=max(1, int(2 * scale)))
+            buttons.append([x1, y, x2, y + button_h])
+            text_box = draw.textbbox((0, 0), option, font=o_font)
+            tx = (x1 + x2 - (text_box[2] - text_box[0])) // 2
+            ty = y + (button_h - (text_box[3] - text_box[1])) // 2 - text_box[1]
+            draw.text((tx, ty), option, font=o_font, fill=(33, 33, 33))
+            boxes.append({"role": "option", "text": option, "bbox": _quad(draw.textbbox((tx, ty), option, font=o_font))})
+            if self.rng.random() < self.option_markers:
+                marker = "ABCD"[idx]
+                mx = x1 + int(50 * scale)
+                draw.text((mx, ty), marker, font=o_font, fill=(90, 90, 90))
+                boxes.append({"role": "marker", "text": marker, "bbox": _quad(draw.textbbox((mx, ty), marker, font=o_font))})
+            y += button_h + spacing
+
+        img = self._degrade(img)
+        truth = {"screen": "question", "question": "".join(lines), "options": options, "answer": answer,
+                 "resolution": [width, height], "boxes": boxes, "buttons": buttons}
+        return img, truth
+
+    def _degrade(self, img: Image.Image) -> Image.Image:
+        """模拟截图缩放与压缩带来的模糊和噪声"""
+        if self.rng.random() < 0.3:
+            img = img.filter(ImageFilter.GaussianBlur(self.rng.uniform(0.3, 0.8)))
+        if self.noise > 0:
+            # 亮度噪声，三个通道共用，float32 生成以控制大分辨率下的开销
+            arr = np.asarray(img, dtype=np.float32)
+            arr += self.np_rng.standard_normal((img.height, img.width, 1), dtype=np.float32) * self.noise
+            img = Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8))
+        return img
+
+
+def generate(out_dir: str, count: int, synthesizer: ScreenSynthesizer, frame_format: str = "png",
+             interval: float = 2.0, size: Optional[Tuple[int, int]] = None, non_question: float = 0.0) -> int:
+    """
+    生成 count 帧到 out_dir，格式与 SessionRecorder 录制目录相同
+
+    Args:
+        interval: 帧之间的时间间隔（秒），ReplayController realtime 模式按此节奏回放
+        size: 固定分辨率，None 时每帧随机
+        non_question: 过渡画面与结果页（各占一半）的比例
+
+    Returns:
+        生成的帧数
+    """
+    recorder = SessionRecorder(out_dir, frame_format)
+    try:
+        for i in range(count):
+            if synthesizer.rng.random() < non_question:
+                render = synthesizer.rng.choice([synthesizer.render_transition, synthesizer.render_result])
+            else:
+                render = synthesizer.render
+            img, truth = render(size)
+            recorder.frame(img, t=i * interval, truth=truth)
+    finally:
+        recorder.close()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="合成答题画面生成器")
+    parser.add_argument("--out", required=True, help="输出目录")
+    parser.add_argument("--count", type=int, default=100, help="生成帧数")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子")
+    parser.add_argument("--font", help="中文字体文件路径")
+    parser.add_argument("--bank", help="JSONL 题库，默认使用内置题库")
+    parser.add_argument("--noise", type=float, default=0.0, help="高斯噪声标准差（灰度级）")
+    parser.add_argument("--markers", type=float, default=0.3, help="选项左侧绘制 A/B/C/D 标记的概率")
+    parser.add_argument("--size", help="固定分辨率，例如 1080x2400；默认每帧随机")
+    parser.add_argument("--format", choices=("png", "raw"), default="png", help="帧文件格式")
+    parser.add_argument("--interval", type=float, default=2.0, help="帧时间间隔（秒）")
+    parser.add_argument("--non-question", type=float, default=0.0, help="过渡画面与结果页所占比例")
+    args = parser.parse_args()
+
+    size = tuple(int(v) for v in args.size.lower().split("x")) if args.size else None
+    synthesizer = ScreenSynthesizer(font_path=args.font, seed=args.seed,
+                                    bank=load_bank(args.bank), noise=args.noise,
+                                    option_markers=args.markers)
+    generate(args.out, args.count, synthesizer, args.format, args.interval, size, args.non_question)
+    print(f"已生成 {args.count} 帧到 {args.out}")
+
+
+if __name__ == "__main__":
+    main()